@@ -0,0 +1,231 @@
+"""
+This module contains the class definitions for AccountService, a
+service layer hosting many bank accounts at once, alongside its
+supporting AccountShard and ServiceMetrics classes.
+"""
+
+import threading
+import time
+import zlib
+from bank_account import BankAccount
+from bank_account import BankAccountCreator
+from bank_account import TransactionBatchResult
+from budget import BudgetManager
+from transaction import Transaction
+from user import UserType
+
+
+class AccountShard:
+    """
+    A shard of the accounts hosted by an AccountService. Each shard has
+    its own lock, so transactions on accounts in different shards never
+    wait for each other. It has:
+    - a dictionary of bank accounts (referenced via account numbers)
+    - a lock guarding those accounts
+    - the number of transactions recorded through this shard
+    - the total and the longest time spent waiting for the lock.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty AccountShard.
+        """
+        self.accounts = {}
+        self.lock = threading.Lock()
+        self.transaction_count = 0
+        self.lock_wait = 0
+        self.max_lock_wait = 0
+
+    def acquire(self) -> None:
+        """
+        Acquires the lock of this shard, timing how long it waited.
+        :return: None
+        """
+        start = time.perf_counter()
+        self.lock.acquire()
+        wait = time.perf_counter() - start
+        self.lock_wait += wait
+        self.max_lock_wait = max(self.max_lock_wait, wait)
+
+    def release(self) -> None:
+        """
+        Releases the lock of this shard.
+        :return: None
+        """
+        self.lock.release()
+
+
+class ServiceMetrics:
+    """
+    A snapshot of the throughput and lock contention of an
+    AccountService, used to size its shards. It has:
+    - the number of accounts and shards
+    - the number of transactions recorded and the seconds elapsed since
+    the service started
+    - the total and the longest lock wait in seconds
+    - the number of transactions recorded per shard.
+    """
+
+    def __init__(self, shards: list, elapsed: float):
+        """
+        Initializes a ServiceMetrics from the shards of a service.
+        :param shards: a list of AccountShard
+        :param elapsed: a float, the seconds elapsed since the service
+                        started
+        """
+        self.account_count = sum(len(shard.accounts) for shard in shards)
+        self.shard_count = len(shards)
+        self.shard_transactions = [shard.transaction_count
+                                   for shard in shards]
+        self.transaction_count = sum(self.shard_transactions)
+        self.elapsed = elapsed
+        self.lock_wait = sum(shard.lock_wait for shard in shards)
+        self.max_lock_wait = max(shard.max_lock_wait for shard in shards)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Returns the number of transactions recorded per second.
+        :return: a float
+        """
+        return self.transaction_count / self.elapsed if self.elapsed else 0
+
+    @property
+    def average_lock_wait(self) -> float:
+        """
+        Returns the average seconds a transaction waited for its shard
+        lock.
+        :return: a float
+        """
+        if self.transaction_count == 0:
+            return 0
+        return self.lock_wait / self.transaction_count
+
+    def __str__(self):
+        return f'*** Account Service Metrics ***\n' \
+               f'• Accounts: {self.account_count} in {self.shard_count} ' \
+               f'shards\n' \
+               f'• Transactions: {self.transaction_count} in ' \
+               f'{self.elapsed:.2f}s ({self.throughput:.0f}/s)\n' \
+               f'• Average lock wait: ' \
+               f'{self.average_lock_wait * 1e6:.1f}µs\n' \
+               f'• Longest lock wait: {self.max_lock_wait * 1e3:.2f}ms'
+
+
+class AccountService:
+    """
+    The AccountService hosts many bank accounts and routes transactions
+    to them by account number. Accounts are spread across shards by a
+    stable hash of their account number; threads recording transactions
+    on accounts of different shards run without contending for a lock.
+
+    Notifications are not printed here. They are returned to the caller
+    in a TransactionBatchResult, since many threads share the console.
+    """
+
+    def __init__(self, shard_count: int = 64):
+        """
+        Initializes an AccountService.
+        :param shard_count: an int, the number of shards
+        """
+        if shard_count <= 0:
+            raise ValueError('shard_count must be > 0')
+        self._shards = [AccountShard() for _ in range(shard_count)]
+        self._started = time.perf_counter()
+
+    def _get_shard(self, bank_account_no: str) -> AccountShard:
+        """
+        Returns the shard hosting the given account number.
+        :param bank_account_no: a string
+        :return: an AccountShard
+        """
+        index = zlib.crc32(bank_account_no.encode()) % len(self._shards)
+        return self._shards[index]
+
+    def add_account(self, bank_account: BankAccount) -> None:
+        """
+        Hosts an existing bank account.
+        :param bank_account: a BankAccount
+        :return: None
+        """
+        shard = self._get_shard(bank_account.bank_account_no)
+        shard.acquire()
+        try:
+            if bank_account.bank_account_no in shard.accounts:
+                raise ValueError(f'Bank account '
+                                 f'{bank_account.bank_account_no} already '
+                                 f'exists')
+            shard.accounts[bank_account.bank_account_no] = bank_account
+        finally:
+            shard.release()
+
+    def open_account(self, user_type: UserType, bank_account_no: str,
+                     bank_name: str, bank_balance: float,
+                     budget_manager: BudgetManager) -> BankAccount:
+        """
+        Creates a bank account for the given user type with
+        BankAccountCreator, hosts it and returns it.
+        :param user_type: a UserType
+        :param bank_account_no: a string
+        :param bank_name: a string
+        :param bank_balance: a float
+        :param budget_manager: a BudgetManager
+        :return: a BankAccount
+        """
+        bank_account = BankAccountCreator.build_bank_account(
+            user_type, bank_account_no, bank_name, bank_balance,
+            budget_manager)
+        self.add_account(bank_account)
+        return bank_account
+
+    def get_account(self, bank_account_no: str) -> BankAccount:
+        """
+        Finds and returns a hosted bank account.
+        :param bank_account_no: a string
+        :return: a BankAccount, or None if it is not hosted here
+        """
+        return self._get_shard(bank_account_no).accounts.get(bank_account_no)
+
+    def record_transaction(self, bank_account_no: str,
+                           transaction: Transaction) \
+            -> TransactionBatchResult:
+        """
+        Records a transaction to the given bank account.
+        :param bank_account_no: a string
+        :param transaction: a Transaction
+        :return: a TransactionBatchResult
+        """
+        return self.record_transactions(bank_account_no, (transaction,))
+
+    def record_transactions(self, bank_account_no: str, transactions) \
+            -> TransactionBatchResult:
+        """
+        Records a batch of transactions to the given bank account while
+        holding the lock of its shard.
+        :param bank_account_no: a string
+        :param transactions: an iterable of Transaction
+        :return: a TransactionBatchResult
+        """
+        shard = self._get_shard(bank_account_no)
+        shard.acquire()
+        try:
+            bank_account = shard.accounts.get(bank_account_no)
+            if bank_account is None:
+                raise KeyError(f'Bank account {bank_account_no} not found')
+            result = bank_account.record_transactions(transactions)
+            shard.transaction_count += result.recorded + len(result.rejected)
+            return result
+        finally:
+            shard.release()
+
+    def get_metrics(self) -> ServiceMetrics:
+        """
+        Returns the throughput and lock wait metrics of this service
+        since it started.
+        :return: a ServiceMetrics
+        """
+        return ServiceMetrics(self._shards,
+                              time.perf_counter() - self._started)
+
+    def __len__(self):
+        return sum(len(shard.accounts) for shard in self._shards)
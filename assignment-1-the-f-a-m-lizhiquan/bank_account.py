@@ -4,13 +4,24 @@ alongside BankAccountCreator as a supporting class to create an
 appropriate bank account for a given user type.
 """
 
+import io
 from abc import ABC
 from abc import abstractmethod
+from datetime import datetime
+from datetime import timedelta
 from transaction import Transaction
 from budget import Budget
 from budget import BudgetManager
 from budget import BudgetCategory
 from budget import BudgetCreator
+from ledger import TransactionLedger
+from notifications import NotificationEvent
+from notifications import NotificationKind
+from policy import AccountPolicy
+from policy import PolicyAction
+from policy import PolicyRule
+from policy import POLICIES
+from statement import StatementRenderer
 from user import UserType
 
 
@@ -22,7 +33,7 @@ class BankAccount(ABC):
     - a bank name
     - a bank balance
     - a budget manager to manage budgets
-    - a list of transactions
+    - a ledger of transactions, indexed by budget category
     - a locked state to determine whether this account is locked.
     """
 
@@ -38,9 +49,12 @@ class BankAccount(ABC):
         self.bank_account_no = bank_account_no
         self.bank_name = bank_name
         self.bank_balance = bank_balance
-        self.transactions = []
+        self.transactions = TransactionLedger()
         self.budget_manager = budget_manager
         self._locked = False
+        self._batch_result = None
+        self.journal = None
+        self.dispatcher = None
 
     def record_transaction(self, transaction: Transaction) -> bool:
         """
@@ -51,38 +65,156 @@ class BankAccount(ABC):
         :param transaction: a Transaction, the transaction to record
         :return: a bool, True if record successfully, False otherwise
         """
-        if self._locked:
-            print('Failed to record transaction! Your account has been locked!'
-                  )
+        budget = self.budget_manager.get_budget(transaction.budget_category)
+        rejection = self._get_rejection_reason(transaction, budget)
+        if rejection is not None:
+            self._report(rejection, NotificationKind.FAILURE, transaction)
             return False
 
-        if transaction.amount > self.bank_balance:
-            print('Failed to record transaction! Not enough balance!')
-            return False
+        self._apply_transaction(transaction, budget)
+        return True
 
-        budget = self.budget_manager.get_budget(transaction.budget_category)
-        if budget.locked:
-            print('Failed to record transaction! This budget has been locked!')
-            return False
+    def record_transactions(self, transactions) -> 'TransactionBatchResult':
+        """
+        Records a batch of transactions, e.g. streamed from a CSV or
+        JSONL file, in the given order. Each transaction goes through
+        the same checks, warnings and locks as record_transaction, but
+        nothing is printed: rejections and notifications are collected
+        into the returned TransactionBatchResult instead, and budgets
+        that need a review are listed once rather than printing their
+        transactions after every warning.
+        :param transactions: an iterable of Transaction
+        :return: a TransactionBatchResult
+        """
+        result = TransactionBatchResult()
+        self._batch_result = result
+        try:
+            for transaction in transactions:
+                budget = self.budget_manager.get_budget(
+                    transaction.budget_category)
+                rejection = self._get_rejection_reason(transaction, budget)
+                if rejection is not None:
+                    result.rejected.append((transaction, rejection))
+                    continue
 
+                result.add_spending(transaction)
+                self._apply_transaction(transaction, budget)
+        finally:
+            self._batch_result = None
+        return result
+
+    def _apply_transaction(self, transaction: Transaction,
+                           budget: Budget) -> None:
+        """
+        Adds an accepted transaction to the ledger, charges it to the
+        balance and its budget, then warns and locks if needed.
+        :param transaction: a Transaction, the transaction to apply
+        :param budget: a Budget, the budget of the transaction
+        :return: None
+        """
         self.transactions.append(transaction)
         self.bank_balance -= transaction.amount
         budget.amount_spent += transaction.amount
         self._warn_and_lock_if_needed(transaction)
-        return True
+        if self.journal is not None:
+            self.journal.append(transaction, self)
 
+    def _get_rejection_reason(self, transaction: Transaction,
+                              budget: Budget):
+        """
+        Returns the reason why a transaction cannot be recorded, or None
+        if it can be recorded.
+        :param transaction: a Transaction, the transaction to check
+        :param budget: a Budget, the budget of the transaction
+        :return: a string, or None if the transaction can be recorded
+        """
+        if self._locked:
+            return 'Failed to record transaction! Your account has been ' \
+                   'locked!'
+        if transaction.amount > self.bank_balance:
+            return 'Failed to record transaction! Not enough balance!'
+        if budget.locked:
+            return 'Failed to record transaction! This budget has been ' \
+                   'locked!'
+        return None
+
+    def _report(self, message: str, kind: NotificationKind,
+                transaction: Transaction = None) -> None:
+        """
+        Issues a message to the user. It is collected into the current
+        batch result while a batch is being recorded, published to the
+        notification dispatcher if this account has one, and printed
+        otherwise.
+        :param message: a string
+        :param kind: a NotificationKind
+        :param transaction: a Transaction, the transaction that caused
+                            the message, or None
+        :return: None
+        """
+        if self._batch_result is None and self.dispatcher is None:
+            print(message)
+            return
+        event = NotificationEvent(self.bank_account_no, kind, message,
+                                  transaction=transaction)
+        if self._batch_result is not None:
+            self._batch_result.notifications.append(event)
+        else:
+            self.dispatcher.publish(event)
+
+    @property
     @abstractmethod
+    def policy(self) -> AccountPolicy:
+        """
+        Returns the policy that decides when a warning or notification
+        is issued to the user, and when a budget or this bank account is
+        locked. The exact policy would vary bank account to bank
+        account.
+        :return: an AccountPolicy
+        """
+        pass
+
     def _warn_and_lock_if_needed(self, transaction: Transaction) -> None:
         """
-        Contains the logic to check if a warning or notification should
-        be issued to the user. It also locks a budget or this bank
-        account if needed. The exact algorithm would vary bank account
-        to bank account.
+        Looks up the policy rule for the threshold the budget of the
+        transaction has crossed, as kept by the BudgetManager, and takes
+        its actions: issuing a warning or notification to the user, and
+        locking the budget or this bank account.
         :param transaction: a Transaction, the newly recorded
                             transaction
         :return: None
         """
-        pass
+        budget = self.budget_manager.get_budget(transaction.budget_category)
+        rule = self.policy.get_crossed_rule(
+            self.budget_manager.get_crossed_threshold(budget.category))
+        if rule is not None:
+            self.apply_policy_rule(budget, rule, transaction)
+
+    def apply_policy_rule(self, budget: Budget, rule: PolicyRule,
+                          transaction: Transaction = None) -> None:
+        """
+        Takes the actions of a policy rule on a budget, in order.
+        :param budget: a Budget
+        :param rule: a PolicyRule
+        :param transaction: a Transaction, the transaction that led to
+                            the rule, or None
+        :return: None
+        """
+        for action in rule.actions:
+            if action == PolicyAction.WARN:
+                self._warn_nearing_exceed_budget(budget, rule.warn_percent,
+                                                 transaction)
+            elif action == PolicyAction.NOTIFY:
+                self._notify_exceeded_budget(budget, transaction)
+            elif action == PolicyAction.LOCK_BUDGET:
+                self._lock_budget(budget, transaction)
+            elif action == PolicyAction.REVIEW:
+                self.print_transactions_for_review(budget)
+            elif action == PolicyAction.LOCK_ACCOUNT:
+                if self.budget_manager.no_locked_budgets \
+                        >= self.policy.locked_budgets_limit:
+                    self._locked = True
+                    self._report('YOUR BANK ACCOUNT HAS BEEN LOCKED!',
+                                 NotificationKind.LOCK, transaction)
 
     def print_transactions_for_review(self, budget: Budget) -> None:
         """
@@ -90,14 +222,40 @@ class BankAccount(ABC):
         :param budget: a Budget
         :return: None
         """
+        if self._batch_result is not None:
+            self._batch_result.add_review(budget)
+            return
+        if self.dispatcher is not None:
+            self._publish_review(budget)
+            return
         print(f'Please review the following transactions in the {budget.name} '
               f'budget:')
         transactions = self.get_transactions_by_budget(budget.category)
         for transaction in transactions:
             print(transaction)
 
+    def _publish_review(self, budget: Budget) -> None:
+        """
+        Publishes a review of the transactions in the given budget to
+        the notification dispatcher. The transactions are listed when
+        the event is delivered, up to the ones recorded by now.
+        :param budget: a Budget
+        :return: None
+        """
+        ledger = self.transactions
+        category = budget.category
+        count = ledger.count_by_category(category)
+        self.dispatcher.publish(NotificationEvent(
+            self.bank_account_no,
+            NotificationKind.REVIEW,
+            f'Please review the following transactions in the {budget.name} '
+            f'budget:',
+            lambda: ledger.get_by_category(category)[:count],
+        ))
+
     def _warn_nearing_exceed_budget(self, budget: Budget,
-                                    exceeded_percent: int) -> None:
+                                    exceeded_percent: int,
+                                    transaction: Transaction = None) -> None:
         """
         Issues a warning to the user that they are about to exceed this
         budget.
@@ -105,28 +263,38 @@ class BankAccount(ABC):
                        exceed
         :param exceeded_percent: an int, the percent that they have
                                  already exceeded
+        :param transaction: a Transaction, the cause of the warning, or
+                            None
         :return: None
         """
-        print(f'[WARNING] You are about to exceed the {budget.name} budget! '
-              f'You went over {exceeded_percent}% of the total '
-              f'${budget.total_amount}.')
+        self._report(f'[WARNING] You are about to exceed the {budget.name} '
+                     f'budget! You went over {exceeded_percent}% of the total '
+                     f'${budget.total_amount}.', NotificationKind.WARNING,
+                     transaction)
 
-    def _notify_exceeded_budget(self, budget: Budget) -> None:
+    def _notify_exceeded_budget(self, budget: Budget,
+                                transaction: Transaction = None) -> None:
         """
         Notifies the user that they've just exceeded this budget.
         :param budget: a Budget, the budget that they've just exceeded
+        :param transaction: a Transaction, the cause of the notification,
+                            or None
         :return: None
         """
-        print(f'[NOTIFICATION] You have exceeded the {budget.name} budget.')
+        self._report(f'[NOTIFICATION] You have exceeded the {budget.name} '
+                     f'budget.', NotificationKind.NOTIFICATION, transaction)
 
-    def _lock_budget(self, budget: Budget) -> None:
+    def _lock_budget(self, budget: Budget,
+                     transaction: Transaction = None) -> None:
         """
         Locks a budget.
         :param budget: a Budget, the budget to be locked
+        :param transaction: a Transaction, the cause of the lock, or None
         :return: None
         """
         budget.lock()
-        print(f'Your {budget.name} budget has now been locked!')
+        self._report(f'Your {budget.name} budget has now been locked!',
+                     NotificationKind.LOCK, transaction)
 
     def get_transactions_by_budget(self, category: BudgetCategory) -> list:
         """
@@ -135,9 +303,38 @@ class BankAccount(ABC):
         :return: a list of Transaction, the transactions in that
                  category
         """
-        return [transaction
-                for transaction in self.transactions
-                if transaction.budget_category == category]
+        return self.transactions.get_by_category(category)
+
+    def get_amount_spent(self, category: BudgetCategory,
+                         start: datetime = None, end: datetime = None) \
+            -> float:
+        """
+        Returns the total amount spent in the given budget category from
+        start (inclusive) to end (exclusive). Either bound may be
+        omitted.
+        :param category: a BudgetCategory
+        :param start: a datetime, or None
+        :param end: a datetime, or None
+        :return: a float
+        """
+        return self.transactions.get_amount_spent(category, start, end)
+
+    def get_rolling_amount_spent(self, category: BudgetCategory,
+                                 window: timedelta,
+                                 until: datetime = None) -> float:
+        """
+        Returns the total amount spent in the given budget category
+        during the window of time ending at `until`, e.g. the last 7
+        days.
+        :param category: a BudgetCategory
+        :param window: a timedelta, the length of the window
+        :param until: a datetime, the end of the window (exclusive),
+                      defaults to now
+        :return: a float
+        """
+        if until is None:
+            until = datetime.now()
+        return self.get_amount_spent(category, until - window, until)
 
     def get_budgets(self) -> list:
         """
@@ -146,19 +343,84 @@ class BankAccount(ABC):
         """
         return self.budget_manager.get_budgets()
 
+    def to_dict(self) -> dict:
+        """
+        Returns the state of this bank account (without its
+        transactions) as a dictionary of plain values, e.g. to be saved
+        as JSON.
+        :return: a dictionary
+        """
+        return {
+            'bank_account_no': self.bank_account_no,
+            'bank_name': self.bank_name,
+            'bank_balance': self.bank_balance,
+            'locked': self._locked,
+            'budgets': [budget.to_dict() for budget in self.get_budgets()],
+        }
+
+    @property
+    def locked(self) -> bool:
+        """
+        Read only property of the _locked attribute, to determine if
+        this bank account is locked.
+        :return: a bool
+        """
+        return self._locked
+
     def __str__(self):
-        transactions_info = ''
-        for transaction in self.transactions:
-            transactions_info += f'{transaction}\n'
-        if len(transactions_info) == 0:
-            transactions_info = "You haven't made any transaction yet.\n"
-        return f'*** Bank Account Details ***\n' \
-               f'• Bank account number: {self.bank_account_no}\n' \
-               f'• Bank name: {self.bank_name}\n' \
-               f'• Status: {"Locked" if self._locked else "Available"}\n' \
-               f'• Transactions:\n' \
-               f'{transactions_info}' \
-               f'• Closing balance: ${self.bank_balance}'
+        statement = io.StringIO()
+        StatementRenderer(self).render(statement)
+        return statement.getvalue()
+
+
+class TransactionBatchResult:
+    """
+    The outcome of recording a batch of transactions. It has:
+    - the number of transactions recorded
+    - a list of (transaction, reason) pairs for rejected transactions
+    - a list of NotificationEvent, the warnings, notifications and lock
+    messages in the order they were issued, each with the transaction
+    that caused it
+    - a dictionary of amount spent in this batch (referenced via budget
+    categories)
+    - a list of budget categories whose transactions should be reviewed.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty TransactionBatchResult.
+        """
+        self.recorded = 0
+        self.rejected = []
+        self.notifications = []
+        self.amount_spent = {}
+        self.budgets_to_review = []
+
+    def add_spending(self, transaction: Transaction) -> None:
+        """
+        Counts a recorded transaction and adds its amount to the spend
+        of its budget category.
+        :param transaction: a Transaction, the recorded transaction
+        :return: None
+        """
+        self.recorded += 1
+        category = transaction.budget_category
+        self.amount_spent[category] = \
+            self.amount_spent.get(category, 0) + transaction.amount
+
+    def add_review(self, budget: Budget) -> None:
+        """
+        Flags a budget for review, once per batch.
+        :param budget: a Budget
+        :return: None
+        """
+        if budget.category not in self.budgets_to_review:
+            self.budgets_to_review.append(budget.category)
+
+    def __str__(self):
+        return f'Recorded {self.recorded} transaction(s), rejected ' \
+               f'{len(self.rejected)}, issued {len(self.notifications)} ' \
+               f'notification(s).'
 
 
 class AngelBankAccount(BankAccount):
@@ -167,26 +429,17 @@ class AngelBankAccount(BankAccount):
     represents a user who's parents are not worried at all.
     """
 
-    def _warn_and_lock_if_needed(self, transaction: Transaction) -> None:
+    @property
+    def policy(self) -> AccountPolicy:
         """
-        Issues a warning or locks budget/bank account when these
-        conditions are met:
+        Returns the Angel policy:
         - Never gets locked out of a budget category. They can continue
         spending money even if they exceed the budget in question.
         - Gets politely notified if they exceed a budget category.
         - Gets a warning if they exceed more than 90% of a budget.
-        :param transaction: a Transaction, the newly recorded
-                            transaction
-        :return: None
+        :return: an AccountPolicy
         """
-        budget = self.budget_manager.get_budget(transaction.budget_category)
-        exceeded_ratio = budget.exceeded_ratio
-        if exceeded_ratio > 1:
-            self._notify_exceeded_budget(budget)
-            self.print_transactions_for_review(budget)
-        elif exceeded_ratio > 0.9:
-            self._warn_nearing_exceed_budget(budget, 90)
-            self.print_transactions_for_review(budget)
+        return POLICIES[UserType.ANGEL]
 
 
 class TroublemakerBankAccount(BankAccount):
@@ -196,31 +449,19 @@ class TroublemakerBankAccount(BankAccount):
     incidents and their parents are concerned but not worried.
     """
 
-    def _warn_and_lock_if_needed(self, transaction: Transaction) -> None:
+    @property
+    def policy(self) -> AccountPolicy:
         """
-        Issues a warning or locks budget/bank account when these
-        conditions are met:
+        Returns the Troublemaker policy:
         - Gets a warning if they exceed more than 75% of a budget
         category.
         - Gets politely notified if they exceed a budget category.
         - Gets locked out of conducting transactions in a budget
         category if they exceed it by 120% of the amount assigned to the
         budget in question.
-        :param transaction: a Transaction, the newly recorded
-                            transaction
-        :return: None
+        :return: an AccountPolicy
         """
-        budget = self.budget_manager.get_budget(transaction.budget_category)
-        exceeded_ratio = budget.exceeded_ratio
-        if exceeded_ratio > 1.2:
-            self._lock_budget(budget)
-            self.print_transactions_for_review(budget)
-        elif exceeded_ratio > 1:
-            self._notify_exceeded_budget(budget)
-            self.print_transactions_for_review(budget)
-        elif exceeded_ratio > 0.75:
-            self._warn_nearing_exceed_budget(budget, 75)
-            self.print_transactions_for_review(budget)
+        return POLICIES[UserType.TROUBLEMAKER]
 
 
 class RebelBankAccount(BankAccount):
@@ -231,10 +472,10 @@ class RebelBankAccount(BankAccount):
     children are quite worried about them.
     """
 
-    def _warn_and_lock_if_needed(self, transaction: Transaction) -> None:
+    @property
+    def policy(self) -> AccountPolicy:
         """
-        Issues a warning or locks budget/bank account when these
-        conditions are met:
+        Returns the Rebel policy:
         - They get a warning for every transaction after exceeding 50%
         of a budget.
         - Gets ruthlessly notified if they exceed a budget category.
@@ -243,22 +484,9 @@ class RebelBankAccount(BankAccount):
         budget in question.
         - If they exceed their budget in 2 or more categories then they
         get locked out of their account completely.
-        :param transaction: a Transaction, the newly recorded
-                            transaction
-        :return: None
+        :return: an AccountPolicy
         """
-        budget = self.budget_manager.get_budget(transaction.budget_category)
-        exceeded_ratio = budget.exceeded_ratio
-        if exceeded_ratio > 1:
-            self._notify_exceeded_budget(budget)
-            self._lock_budget(budget)
-            self.print_transactions_for_review(budget)
-            if self.budget_manager.no_locked_budgets >= 2:
-                self._locked = True
-                print('YOUR BANK ACCOUNT HAS BEEN LOCKED!')
-        elif exceeded_ratio > 0.5:
-            self._warn_nearing_exceed_budget(budget, 50)
-            self.print_transactions_for_review(budget)
+        return POLICIES[UserType.REBEL]
 
 
 class BankAccountCreator:
@@ -285,6 +513,51 @@ class BankAccountCreator:
         budget_manager = BudgetCreator.load_test_budget_manager()
         return TroublemakerBankAccount('123123', 'HSBC', 1000, budget_manager)
 
+    @classmethod
+    def load_bank_account(cls, user_type: UserType, data: dict) \
+            -> BankAccount:
+        """
+        Initializes a Bank Account based on the given user type from a
+        dictionary returned by BankAccount.to_dict, without prompting
+        the user.
+        :param user_type: a UserType
+        :param data: a dictionary
+        :return: a BankAccount
+        """
+        budget_manager = BudgetManager()
+        for budget_data in data['budgets']:
+            budget_manager.add_budget(Budget.from_dict(budget_data))
+        bank_account = cls.build_bank_account(
+            user_type,
+            data['bank_account_no'],
+            data['bank_name'],
+            data['bank_balance'],
+            budget_manager,
+        )
+        bank_account._locked = data['locked']
+        return bank_account
+
+    @classmethod
+    def build_bank_account(cls, user_type: UserType, bank_account_no: str,
+                           bank_name: str, bank_balance: float,
+                           budget_manager: BudgetManager) -> BankAccount:
+        """
+        Initializes a Bank Account based on the given user type from the
+        given details, without prompting the user.
+        :param user_type: a UserType
+        :param bank_account_no: a string
+        :param bank_name: a string
+        :param bank_balance: a float
+        :param budget_manager: a BudgetManager
+        :return: a BankAccount
+        """
+        return cls._user_type_mapper[user_type](
+            bank_account_no,
+            bank_name,
+            bank_balance,
+            budget_manager,
+        )
+
     @classmethod
     def create_bank_account(cls, user_type: UserType) -> BankAccount:
         """
@@ -302,7 +575,8 @@ class BankAccountCreator:
                 print('Bank balance must be greater than or equal to 0! Please'
                       ' enter again!')
         budget_manager = BudgetCreator.create_budget_manager()
-        return cls._user_type_mapper[user_type](
+        return cls.build_bank_account(
+            user_type,
             bank_account_no,
             bank_name,
             bank_balance,
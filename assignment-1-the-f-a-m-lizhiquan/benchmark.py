@@ -0,0 +1,263 @@
+"""
+This module benchmarks the budgeting core of the F.A.M. with seeded
+synthetic workloads and writes the results as JSON. Run it as a script,
+e.g. `python benchmark.py --sizes 10000 100000 --output results.json`.
+
+The suites are:
+- record: record_transaction throughput for each type of bank account
+- lookup: category lookup latency versus history size
+- memory: memory used per transaction
+- statement: statement rendering time.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from datetime import timedelta
+from bank_account import AngelBankAccount
+from bank_account import TroublemakerBankAccount
+from bank_account import RebelBankAccount
+from budget import Budget
+from budget import BudgetCategory
+from budget import BudgetManager
+from budget import CATEGORIES
+from ledger import TransactionLedger
+from notifications import NotificationDispatcher
+from statement import StatementRenderer
+from transaction import Transaction
+
+ACCOUNT_TYPES = (AngelBankAccount, TroublemakerBankAccount,
+                 RebelBankAccount)
+
+SUITES = ('record', 'lookup', 'memory', 'statement')
+
+
+def generate_transactions(count: int, seed: int = 0):
+    """
+    Yields a seeded stream of synthetic transactions, one per minute.
+    :param count: an int, the number of transactions
+    :param seed: an int, the random seed
+    :return: a generator that yields Transaction
+    """
+    rng = random.Random(seed)
+    shops = [f'Shop {number}' for number in range(500)]
+    start = datetime(2026, 1, 1)
+    for minute in range(count):
+        yield Transaction(start + timedelta(minutes=minute),
+                          round(rng.uniform(1, 100), 2),
+                          rng.choice(CATEGORIES),
+                          rng.choice(shops))
+
+
+def create_account(account_type, count: int):
+    """
+    Creates a bank account whose budgets are sized so that a workload
+    of `count` transactions crosses their thresholds near its end,
+    rather than locking them early.
+    :param account_type: a BankAccount subclass
+    :param count: an int, the number of transactions to be recorded
+    :return: a BankAccount
+    """
+    budget_amount = count * 50.5 / len(CATEGORIES)
+    budget_manager = BudgetManager()
+    for category in BudgetCategory:
+        budget_manager.add_budget(Budget(category, budget_amount))
+    return account_type('000000', 'Benchmark Bank', count * 100.0,
+                        budget_manager)
+
+
+def benchmark_record(count: int, seed: int) -> list:
+    """
+    Measures record_transaction throughput for each type of bank
+    account. Notifications go to a dispatcher without sinks, so printing
+    is not measured.
+    :param count: an int, the number of transactions
+    :param seed: an int, the random seed
+    :return: a list of dictionaries of results
+    """
+    transactions = list(generate_transactions(count, seed))
+    results = []
+    for account_type in ACCOUNT_TYPES:
+        bank_account = create_account(account_type, count)
+        dispatcher = NotificationDispatcher(sinks=[])
+        dispatcher.start()
+        bank_account.dispatcher = dispatcher
+        start = time.perf_counter()
+        recorded = sum(bank_account.record_transaction(transaction)
+                       for transaction in transactions)
+        elapsed = time.perf_counter() - start
+        dispatcher.stop()
+        results.append({
+            'suite': 'record',
+            'account_type': account_type.__name__,
+            'transactions': count,
+            'recorded': recorded,
+            'notifications': dispatcher.published + dispatcher.dropped,
+            'seconds': elapsed,
+            'transactions_per_second': count / elapsed,
+        })
+    return results
+
+
+def benchmark_lookup(count: int, seed: int, repeat: int = 5) -> list:
+    """
+    Measures the latency of get_transactions_by_budget lookups on a
+    ledger holding `count` transactions.
+    :param count: an int, the number of transactions
+    :param seed: an int, the random seed
+    :param repeat: an int, the number of timed lookups per category
+    :return: a list of dictionaries of results
+    """
+    ledger = TransactionLedger()
+    for transaction in generate_transactions(count, seed):
+        ledger.append(transaction)
+    timings = []
+    for _ in range(repeat):
+        for category in BudgetCategory:
+            start = time.perf_counter()
+            ledger.get_by_category(category)
+            timings.append(time.perf_counter() - start)
+    return [{
+        'suite': 'lookup',
+        'transactions': count,
+        'median_seconds': statistics.median(timings),
+        'max_seconds': max(timings),
+        'median_seconds_per_match':
+            statistics.median(timings) / (count / len(CATEGORIES)),
+    }]
+
+
+def measure_object_memory(count: int = 10000, seed: int = 0) -> float:
+    """
+    Measures the bytes per transaction of a plain list of Transaction
+    objects, the layout the ledger replaces. A small sample is enough
+    since every object costs the same.
+    :param count: an int, the number of transactions in the sample
+    :param seed: an int, the random seed
+    :return: a float, the bytes per transaction
+    """
+    transactions = generate_transactions(count, seed)
+    tracemalloc.start()
+    sample = list(transactions)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sample
+    return traced / count
+
+
+def benchmark_memory(count: int, seed: int) -> list:
+    """
+    Measures the memory a TransactionLedger uses per transaction after
+    recording `count` transactions.
+    :param count: an int, the number of transactions
+    :param seed: an int, the random seed
+    :return: a list of dictionaries of results
+    """
+    ledger = TransactionLedger()
+    for transaction in generate_transactions(count, seed):
+        ledger.append(transaction)
+    return [{
+        'suite': 'memory',
+        'transactions': count,
+        'ledger_bytes': ledger.memory_usage,
+        'bytes_per_transaction': ledger.memory_usage / count,
+        'object_bytes_per_transaction': measure_object_memory(seed=seed),
+    }]
+
+
+def benchmark_statement(count: int, seed: int) -> list:
+    """
+    Measures the time to render the full statement of an account with
+    `count` transactions, and a single page of it.
+    :param count: an int, the number of transactions
+    :param seed: an int, the random seed
+    :return: a list of dictionaries of results
+    """
+    bank_account = create_account(AngelBankAccount, count)
+    bank_account.record_transactions(generate_transactions(count, seed))
+    renderer = StatementRenderer(bank_account)
+    with open(os.devnull, mode='w') as stream:
+        start = time.perf_counter()
+        renderer.render(stream)
+        full = time.perf_counter() - start
+        start = time.perf_counter()
+        renderer.render_page(stream, count // 40, 20)
+        page = time.perf_counter() - start
+    return [{
+        'suite': 'statement',
+        'transactions': count,
+        'full_seconds': full,
+        'page_seconds': page,
+    }]
+
+
+BENCHMARKS = {
+    'record': benchmark_record,
+    'lookup': benchmark_lookup,
+    'memory': benchmark_memory,
+    'statement': benchmark_statement,
+}
+"""
+A dictionary that maps a suite name to its benchmark function.
+"""
+
+
+def run(suites, sizes, seed: int) -> dict:
+    """
+    Runs the given suites for every size and returns the results with
+    details of the environment they ran in.
+    :param suites: an iterable of suite names
+    :param sizes: an iterable of int, the numbers of transactions
+    :param seed: an int, the random seed
+    :return: a dictionary
+    """
+    results = []
+    for suite in suites:
+        for size in sizes:
+            print(f'Running {suite} with {size} transactions...',
+                  file=sys.stderr)
+            results.extend(BENCHMARKS[suite](size, seed))
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': results,
+    }
+
+
+def main():
+    """
+    Parses the command line arguments, runs the benchmarks and writes
+    their results as JSON.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the budgeting core of the F.A.M.')
+    parser.add_argument('--suites', nargs='+', choices=SUITES,
+                        default=list(SUITES))
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10000, 100000],
+                        help='numbers of transactions')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='path to a JSON file, defaults '
+                                         'to the standard output')
+    args = parser.parse_args()
+    report = run(args.suites, args.sizes, args.seed)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, mode='w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
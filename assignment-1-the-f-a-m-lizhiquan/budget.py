@@ -4,6 +4,7 @@ and BudgetCreator as a supporting class for constructing a BudgetManager
 maintaining all the Budget objects.
 """
 
+from bisect import bisect_left
 from enum import Enum
 
 
@@ -17,6 +18,24 @@ class BudgetCategory(Enum):
     MISCELLANEOUS = 'Miscellaneous'
 
 
+CATEGORY_CODES = {category: code
+                  for code, category in enumerate(BudgetCategory)}
+"""
+A dictionary that maps a BudgetCategory enum to a small integer code,
+used to store categories compactly. CATEGORIES maps codes back.
+"""
+
+CATEGORIES = list(BudgetCategory)
+
+
+BUDGET_THRESHOLDS = (0.5, 0.75, 0.9, 1, 1.2)
+"""
+The exceeded ratios (50/75/90/100/120%) whose crossing a BudgetManager
+tracks for each budget, in ascending order. The thresholds of the
+account policies are among them.
+"""
+
+
 class Budget:
     """
     A class that represents a budget. A budget has:
@@ -24,17 +43,25 @@ class Budget:
     - a total amount
     - a amount spent
     - a state determines if this budget is locked.
+
+    The category is usually a BudgetCategory, but any custom category
+    name (a string) is supported as well. The exceeded ratio is kept up
+    to date whenever the amounts change, and the BudgetManager holding
+    this budget is told about every change.
     """
 
-    def __init__(self, category: BudgetCategory, total_amount: float):
+    def __init__(self, category, total_amount: float):
         """
         Initializes a Budget.
-        :param category: a BudgetCategory
+        :param category: a BudgetCategory, or a string for a custom
+                         category
         :param total_amount: a float
         """
         self.category = category
-        self.total_amount = total_amount
-        self.amount_spent = 0
+        self._manager = None
+        self._total_amount = total_amount
+        self._amount_spent = 0
+        self._exceeded_ratio = 0
         self._locked = False
 
     def __str__(self):
@@ -50,16 +77,93 @@ class Budget:
         Returns the name/category of the budget.
         :return: a string
         """
-        return str(self.category.value)
+        return str(getattr(self.category, 'value', self.category))
+
+    @property
+    def total_amount(self) -> float:
+        """
+        Returns the total amount allocated to this budget.
+        :return: a float
+        """
+        return self._total_amount
+
+    @total_amount.setter
+    def total_amount(self, total_amount: float) -> None:
+        """
+        Sets the total amount allocated to this budget.
+        :param total_amount: a float
+        :return: None
+        """
+        self._total_amount = total_amount
+        self._update(self._amount_spent)
+
+    @property
+    def amount_spent(self) -> float:
+        """
+        Returns the amount spent in this budget.
+        :return: a float
+        """
+        return self._amount_spent
+
+    @amount_spent.setter
+    def amount_spent(self, amount_spent: float) -> None:
+        """
+        Sets the amount spent in this budget.
+        :param amount_spent: a float
+        :return: None
+        """
+        self._update(amount_spent)
 
     @property
     def exceeded_ratio(self) -> float:
         """
-        A property that calculates the exceeded ratio (amount spent /
-        total amount) of this budget.
+        A property that returns the exceeded ratio (amount spent / total
+        amount) of this budget. It is recalculated when the amounts
+        change rather than on every access.
         :return: a float
         """
-        return self.amount_spent / self.total_amount
+        return self._exceeded_ratio
+
+    def to_dict(self) -> dict:
+        """
+        Returns the state of this budget as a dictionary of plain
+        values, e.g. to be saved as JSON.
+        :return: a dictionary
+        """
+        return {
+            'category': self.name,
+            'total_amount': self._total_amount,
+            'amount_spent': self._amount_spent,
+            'locked': self._locked,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Budget':
+        """
+        Creates a Budget from a dictionary returned by to_dict.
+        :param data: a dictionary
+        :return: a Budget
+        """
+        try:
+            category = BudgetCategory(data['category'])
+        except ValueError:
+            category = data['category']
+        budget = cls(category, data['total_amount'])
+        budget.amount_spent = data['amount_spent']
+        budget._locked = data['locked']
+        return budget
+
+    def _update(self, amount_spent: float) -> None:
+        """
+        Updates the amount spent and the exceeded ratio, then notifies
+        the BudgetManager holding this budget, if any.
+        :param amount_spent: a float, the new amount spent
+        :return: None
+        """
+        self._amount_spent = amount_spent
+        self._exceeded_ratio = amount_spent / self._total_amount
+        if self._manager is not None:
+            self._manager.on_budget_changed(self)
 
     @property
     def locked(self) -> bool:
@@ -75,13 +179,23 @@ class Budget:
         Locks this budget.
         :return: None
         """
+        if self._locked:
+            return
         self._locked = True
+        if self._manager is not None:
+            self._manager.on_budget_locked(self)
 
 
 class BudgetManager:
     """
     The BudgetManager maintains a dictionary of budgets (referenced via
     budget names).
+
+    It also keeps aggregates that are updated as its budgets change,
+    instead of being recounted on every access:
+    - the number of locked budgets
+    - the highest threshold in BUDGET_THRESHOLDS each budget has
+    crossed, which the account policies look their rule up by.
     """
 
     def __init__(self):
@@ -89,14 +203,47 @@ class BudgetManager:
         Initializes a BudgetManager.
         """
         self.budgets = {}
+        self._locked_count = 0
+        self._crossed = {}
 
     def add_budget(self, budget: Budget) -> None:
         """
-        Adds a budget to the dictionary.
+        Adds a budget to the dictionary. A budget already stored for the
+        same category is replaced.
         :param budget: a Budget
         :return: None
         """
+        replaced = self.budgets.get(budget.category)
+        if replaced is not None:
+            replaced._manager = None
+            if replaced.locked:
+                self._locked_count -= 1
+
         self.budgets[budget.category] = budget
+        budget._manager = self
+        if budget.locked:
+            self._locked_count += 1
+        self._crossed[budget.category] = bisect_left(BUDGET_THRESHOLDS,
+                                                     budget.exceeded_ratio)
+
+    def on_budget_changed(self, budget: Budget) -> None:
+        """
+        Updates the threshold a budget has crossed after its amounts
+        changed. A budget that drops back below a threshold can cross it
+        again later.
+        :param budget: a Budget, the budget that changed
+        :return: None
+        """
+        self._crossed[budget.category] = bisect_left(BUDGET_THRESHOLDS,
+                                                     budget.exceeded_ratio)
+
+    def on_budget_locked(self, budget: Budget) -> None:
+        """
+        Updates the number of locked budgets after a budget is locked.
+        :param budget: a Budget, the budget that was locked
+        :return: None
+        """
+        self._locked_count += 1
 
     def get_budget(self, category: BudgetCategory) -> Budget:
         """
@@ -113,17 +260,23 @@ class BudgetManager:
         """
         return list(self.budgets.values())
 
+    def get_crossed_threshold(self, category: BudgetCategory):
+        """
+        Returns the highest threshold the budget of the given category
+        has crossed, or None if it has not crossed any.
+        :param category: a BudgetCategory
+        :return: a float, or None
+        """
+        crossed = self._crossed.get(category, 0)
+        return BUDGET_THRESHOLDS[crossed - 1] if crossed > 0 else None
+
     @property
     def no_locked_budgets(self) -> int:
         """
-        Counts and returns the number of locked budgets.
+        Returns the number of locked budgets.
         :return: an int, the number of locked budgets
         """
-        count = 0
-        for budget in self.budgets.values():
-            if budget.locked:
-                count += 1
-        return count
+        return self._locked_count
 
 
 class BudgetCreator:
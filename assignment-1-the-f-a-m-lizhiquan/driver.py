@@ -2,9 +2,13 @@
 This module contains the Driver class which drives the FAM application.
 """
 
+import sys
 from datetime import datetime
+from datetime import timedelta
 from budget import BudgetCreator
 from bank_account import BankAccountCreator
+from journal import TransactionJournal
+from statement import StatementRenderer
 from transaction import Transaction
 from user import User
 from user import UserType
@@ -13,7 +17,8 @@ from user import UserType
 class Driver:
     """
     This Driver class is responsible for driving the FAM application. It
-    maintains a user, a bank account and handles user's menu selection.
+    maintains a user, a bank account, an optional transaction journal
+    and handles user's menu selection.
     """
 
     def __init__(self):
@@ -22,16 +27,31 @@ class Driver:
         """
         self.user = None
         self.bank_account = None
+        self.journal = None
 
-    def setup(self) -> None:
+    def setup(self, journal_path: str = None) -> None:
         """
-        Initializes user and bank account attributes from user inputs.
+        Initializes user and bank account attributes. If a journal path
+        is given and the journal has a snapshot, they are restored from
+        the journal without prompting. Otherwise they are initialized
+        from user inputs and the new account is journaled from now on.
+        :param journal_path: a string, path to the transaction journal
         :return: None
         """
+        if journal_path is not None:
+            self.journal = TransactionJournal(journal_path)
+            restored = self.journal.restore()
+            if restored is not None:
+                self.user, self.bank_account = restored
+                print(f'Welcome back, {self.user.name}!')
+                return
+
         self.user = self.create_user()
         self.bank_account = BankAccountCreator.create_bank_account(
             self.user.user_type
         )
+        if self.journal is not None:
+            self.journal.attach(self.user, self.bank_account)
 
     def load_test_data(self) -> None:
         """
@@ -119,6 +139,35 @@ class Driver:
             for transaction in transactions:
                 print(transaction)
 
+    @staticmethod
+    def read_date(prompt: str) -> datetime:
+        """
+        Prompts for a date in the YYYY-MM-DD format until a valid one is
+        entered, and returns it.
+        :param prompt: a string
+        :return: a datetime
+        """
+        while True:
+            try:
+                return datetime.strptime(input(prompt), '%Y-%m-%d')
+            except ValueError:
+                print('Invalid date! Please enter again!')
+
+    def show_spending_in_date_range(self) -> None:
+        """
+        Takes the user to a sub-menu where they select their budget
+        category and a date range, and prints the total amount spent in
+        that category between those dates (both included).
+        :return: None
+        """
+        category = BudgetCreator.execute_budgets_menu()
+        start = self.read_date('Enter start date (YYYY-MM-DD): ')
+        end = self.read_date('Enter end date (YYYY-MM-DD): ')
+        amount = self.bank_account.get_amount_spent(
+            category, start, end + timedelta(days=1))
+        print(f'You spent ${amount:.2f} on {category.value} from '
+              f'{start:%Y-%m-%d} to {end:%Y-%m-%d}.')
+
     def record_transaction(self) -> None:
         """
         Prompts user for transaction details and records it to the bank
@@ -128,13 +177,30 @@ class Driver:
         transaction = self.create_transaction()
         self.bank_account.record_transaction(transaction)
 
-    def show_bank_account_details(self) -> None:
+    def show_bank_account_details(self, page_size: int = 20) -> None:
         """
         Prints out the bank account details of the user and all
         transactions conducted to date alongside the closing balance.
+        Transactions are shown a page at a time; the user can stop after
+        any page.
+        :param page_size: an int, the number of transactions per page
         :return: None
         """
-        print(self.bank_account)
+        renderer = StatementRenderer(self.bank_account)
+        renderer.write_header(sys.stdout)
+        total = len(self.bank_account.transactions)
+        if total == 0:
+            print("You haven't made any transaction yet.")
+        offset = 0
+        while offset < total:
+            offset += renderer.write_transactions(sys.stdout, offset,
+                                                  page_size)
+            if offset < total and input(f'Shown {offset} of {total}. Press '
+                                        f'Enter for more or q to skip: '
+                                        ).strip().lower() == 'q':
+                break
+        renderer.write_footer(sys.stdout)
+        print()
 
     def execute_main_menu(self) -> None:
         """
@@ -145,15 +211,16 @@ class Driver:
         """
         print('Welcome to the Family Appointed Moderator!')
         choice = -1
-        while choice != 5:
+        while choice != 6:
             print()
             print('============== MENU ==============')
             print('  1. View Budgets')
             print('  2. Record a Transaction')
             print('  3. View Transactions by Budget')
             print('  4. View Bank Account Details')
-            print('  5. Exit')
-            choice = int(input('Enter a choice (1-5): '))
+            print('  5. View Spending in a Date Range')
+            print('  6. Exit')
+            choice = int(input('Enter a choice (1-6): '))
             if choice == 1:
                 self.show_budgets_status()
             elif choice == 2:
@@ -162,14 +229,19 @@ class Driver:
                 self.show_transactions_by_budget()
             elif choice == 4:
                 self.show_bank_account_details()
-            elif choice != 5:
+            elif choice == 5:
+                self.show_spending_in_date_range()
+            elif choice != 6:
                 print('Invalid choice! Please enter again!')
             print()
+        if self.journal is not None:
+            self.journal.write_snapshot(self.bank_account)
+            self.journal.close()
         print('Thanks for using The F.A.M!')
 
 
 if __name__ == '__main__':
     driver = Driver()
-    driver.setup()
+    driver.setup('fam_journal.bin')
     # driver.load_test_data()
     driver.execute_main_menu()
@@ -0,0 +1,324 @@
+"""
+This module contains the class definition for TransactionJournal, a
+persistent append-only binary journal of transactions with periodic
+snapshots of the account state.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Generator
+from transaction import Transaction
+from transaction import to_epoch_micros
+from transaction import from_epoch_micros
+from budget import CATEGORY_CODES
+from budget import CATEGORIES
+from user import User
+from bank_account import BankAccount
+from bank_account import BankAccountCreator
+
+
+class TransactionJournal:
+    """
+    The TransactionJournal persists the transactions of a bank account
+    in three files:
+    - the journal itself, a binary file of fixed-width records
+    (timestamp, amount, category code, shop id)
+    - a shops file, one JSON-encoded shop name per line, whose line
+    numbers are the shop ids used in the journal
+    - a categories file, one JSON-encoded custom category name per
+    line, whose codes follow the codes of the BudgetCategory values
+    - a snapshot file, a JSON document with the user and the bank
+    account state (balance, budgets, locks) after a number of records.
+
+    A snapshot is written every `snapshot_interval` records, so that on
+    restart only the records after the last snapshot are replayed. The
+    records before it are loaded into the ledger as they are.
+    """
+
+    RECORD = struct.Struct('<qdBI')
+    """
+    The layout of a record: microseconds since the epoch (int64), the
+    amount (float64), the category code (uint8) and the shop id (uint32).
+    """
+
+    MAX_CATEGORIES = 256
+
+    def __init__(self, file_path: str, snapshot_interval: int = 10000):
+        """
+        Initializes a TransactionJournal, loading the shop and category
+        names already stored next to the journal. A record or a name
+        left half written by a crash is discarded.
+        :param file_path: a string, path to the journal file
+        :param snapshot_interval: an int, the number of records between
+                                  two snapshots
+        """
+        self.file_path = file_path
+        self.shops_path = f'{file_path}.shops'
+        self.categories_path = f'{file_path}.categories'
+        self.snapshot_path = f'{file_path}.snapshot'
+        self.snapshot_interval = snapshot_interval
+        self._user = None
+        self._shop_names = []
+        self._shop_ids = {}
+        self._categories = list(CATEGORIES)
+        self._category_codes = dict(CATEGORY_CODES)
+        for name in self._read_names(self.shops_path):
+            self._intern_shop(name)
+        for name in self._read_names(self.categories_path):
+            self._intern_category(name)
+
+        size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        self.record_count = size // self.RECORD.size
+        if size % self.RECORD.size:
+            with open(file_path, 'r+b') as file:
+                file.truncate(self.record_count * self.RECORD.size)
+        self._file = open(file_path, 'ab')
+        self._shops_file = open(self.shops_path, 'a')
+        self._categories_file = open(self.categories_path, 'a')
+
+    @staticmethod
+    def _read_names(path: str) -> list:
+        """
+        Returns the names of a shops or categories file. A last line
+        left half written by a crash, i.e. without a newline or not
+        valid JSON, is dropped and truncated from the file.
+        :param path: a string
+        :return: a list of names
+        """
+        if not os.path.exists(path):
+            return []
+        names = []
+        with open(path, 'r+b') as file:
+            lines = file.readlines()
+            size = 0
+            for number, line in enumerate(lines, start=1):
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('missing newline')
+                    names.append(json.loads(line))
+                except ValueError:
+                    if number < len(lines):
+                        raise
+                    file.truncate(size)
+                    break
+                size += len(line)
+        return names
+
+    def _intern_shop(self, shop_name: str) -> int:
+        """
+        Returns the id of a shop name, adding it to the shop table if it
+        is new.
+        :param shop_name: a string
+        :return: an int
+        """
+        shop_id = self._shop_ids.get(shop_name)
+        if shop_id is None:
+            shop_id = len(self._shop_names)
+            self._shop_names.append(shop_name)
+            self._shop_ids[shop_name] = shop_id
+        return shop_id
+
+    def _intern_category(self, category) -> int:
+        """
+        Returns the code of a category, adding it to the category table
+        if it is a new custom category.
+        :param category: a BudgetCategory, or a custom category name
+        :return: an int
+        """
+        code = self._category_codes.get(category)
+        if code is None:
+            if len(self._categories) >= self.MAX_CATEGORIES:
+                raise ValueError(f'A journal supports at most '
+                                 f'{self.MAX_CATEGORIES} categories')
+            code = len(self._categories)
+            self._categories.append(category)
+            self._category_codes[category] = code
+        return code
+
+    def attach(self, user: User, bank_account: BankAccount) -> None:
+        """
+        Attaches this journal to a bank account so that every recorded
+        transaction is appended to it, and writes a first snapshot of
+        the account.
+        :param user: a User, the owner of the bank account
+        :param bank_account: a BankAccount
+        :return: None
+        """
+        self._user = user
+        bank_account.journal = self
+        self.write_snapshot(bank_account)
+
+    def append(self, transaction: Transaction,
+               bank_account: BankAccount = None) -> None:
+        """
+        Appends a transaction to the journal. If a bank account is given
+        and the snapshot interval is reached, a snapshot of its state is
+        written as well.
+        :param transaction: a Transaction
+        :param bank_account: a BankAccount, the account the transaction
+                             was recorded to
+        :return: None
+        """
+        shop_count = len(self._shop_names)
+        shop_id = self._intern_shop(transaction.shop_name)
+        if shop_id == shop_count:
+            # The shop must be on disk before a record refers to it.
+            self._shops_file.write(f'{json.dumps(transaction.shop_name)}\n')
+            self._shops_file.flush()
+        category_count = len(self._categories)
+        code = self._intern_category(transaction.budget_category)
+        if code == category_count:
+            # Custom categories are stored by name, like shops.
+            self._categories_file.write(
+                f'{json.dumps(transaction.budget_category)}\n')
+            self._categories_file.flush()
+
+        self._file.write(self.RECORD.pack(
+            to_epoch_micros(transaction.timestamp),
+            transaction.amount,
+            code,
+            shop_id,
+        ))
+        self.record_count += 1
+        if bank_account is not None \
+                and self.record_count % self.snapshot_interval == 0:
+            self.write_snapshot(bank_account)
+
+    def flush(self) -> None:
+        """
+        Flushes the buffered records to disk.
+        :return: None
+        """
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the journal.
+        :return: None
+        """
+        self._file.close()
+        self._shops_file.close()
+        self._categories_file.close()
+
+    def write_snapshot(self, bank_account: BankAccount) -> None:
+        """
+        Writes a snapshot of the bank account state covering every
+        record appended so far. The snapshot replaces the previous one
+        atomically.
+        :param bank_account: a BankAccount
+        :return: None
+        """
+        self.flush()
+        snapshot = {
+            'record_count': self.record_count,
+            'user': self._user.to_dict(),
+            'bank_account': bank_account.to_dict(),
+        }
+        temp_path = f'{self.snapshot_path}.tmp'
+        with open(temp_path, mode='w') as file:
+            json.dump(snapshot, file)
+        os.replace(temp_path, self.snapshot_path)
+
+    def read_snapshot(self):
+        """
+        Returns the last snapshot, or None if there is none.
+        :return: a dictionary, or None
+        """
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path) as file:
+            return json.load(file)
+
+    def read_transactions(self, start: int = 0, stop: int = None) \
+            -> Generator[Transaction, None, None]:
+        """
+        Memory-maps the journal and yields its transactions, from the
+        given record number up to another one.
+        :param start: an int, the first record to read
+        :param stop: an int, the record to stop before, or None to read
+                     up to the end
+        :return: a generator that yields Transaction
+        """
+        self.flush()
+        if stop is None or stop > self.record_count:
+            stop = self.record_count
+        end = stop * self.RECORD.size
+        if end <= start * self.RECORD.size:
+            return
+        with open(self.file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data, \
+                memoryview(data) as view, \
+                view[start * self.RECORD.size:end] as records:
+            for timestamp, amount, code, shop_id \
+                    in self.RECORD.iter_unpack(records):
+                yield Transaction(
+                    from_epoch_micros(timestamp),
+                    amount,
+                    self._categories[code],
+                    self._shop_names[shop_id],
+                )
+
+    def read_columns(self, stop: int = None) -> tuple:
+        """
+        Memory-maps the journal and reads its first records as columns,
+        one array per field, without creating a Transaction per record.
+        :param stop: an int, the record to stop before, or None to read
+                     up to the end
+        :return: a tuple of four arrays: the timestamps in microseconds
+                 since the epoch, the amounts, the category codes and
+                 the shop ids
+        """
+        self.flush()
+        if stop is None or stop > self.record_count:
+            stop = self.record_count
+        columns = tuple(array(typecode) for typecode in 'qdBI')
+        if stop <= 0:
+            return columns
+        with open(self.file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            records = data[:stop * self.RECORD.size]
+        offset = 0
+        for column in columns:
+            # Gathers the bytes of one field out of the fixed-width
+            # records, a byte position at a time.
+            width = column.itemsize
+            values = bytearray(stop * width)
+            for byte in range(width):
+                values[byte::width] = \
+                    records[offset + byte::self.RECORD.size]
+            column.frombytes(values)
+            if sys.byteorder == 'big':
+                column.byteswap()
+            offset += width
+        return columns
+
+    def restore(self):
+        """
+        Rebuilds the user and bank account from the last snapshot, loads
+        the records it covers into the ledger column by column, then
+        replays the records appended after it. Notifications issued
+        while replaying are not shown again. The journal is attached to
+        the restored bank account.
+        :return: a tuple of (User, BankAccount), or None if there is no
+                 snapshot to restore from
+        """
+        snapshot = self.read_snapshot()
+        if snapshot is None:
+            return None
+        user = User.from_dict(snapshot['user'])
+        bank_account = BankAccountCreator.load_bank_account(
+            user.user_type, snapshot['bank_account'])
+        # The snapshot already holds the balance and budgets these
+        # records were charged to, so they only go into the ledger.
+        bank_account.transactions.extend(
+            *self.read_columns(snapshot['record_count']),
+            self._categories, self._shop_names)
+        bank_account.record_transactions(
+            self.read_transactions(snapshot['record_count']))
+        self._user = user
+        bank_account.journal = self
+        return user, bank_account
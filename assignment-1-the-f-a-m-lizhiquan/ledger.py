@@ -0,0 +1,287 @@
+"""
+This module contains the class definition for TransactionLedger, an
+append-only store of transactions indexed by budget category, alongside
+SpendingIndex, which sums the spending of a category over time.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from heapq import merge
+from itertools import accumulate
+from itertools import compress
+from itertools import islice
+from operator import itemgetter
+from operator import le
+from transaction import Transaction
+from transaction import to_epoch_micros
+from transaction_log import TransactionLog
+from budget import BudgetCategory
+
+
+class SpendingIndex:
+    """
+    A SpendingIndex answers "how much was spent between two dates" for
+    one budget category in O(log n). It has:
+    - an array of timestamps in microseconds since the epoch, sorted
+    - an array of the amounts, in the same order
+    - an array of prefix sums, where prefix_sums[i] is the total amount
+    of the first i transactions in timestamp order.
+
+    Transactions added in time order, which is the usual case, are
+    appended in O(1). A transaction older than the latest one is set
+    aside instead, and the next query merges the transactions set aside
+    into the arrays and rebuilds the prefix sums in O(n), so adding n
+    transactions in any order costs O(n log n) overall.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty SpendingIndex.
+        """
+        self._timestamps = array('q')
+        self._amounts = array('d')
+        self._prefix_sums = array('d', [0])
+        self._pending = []
+
+    def add(self, timestamp: datetime, amount: float) -> None:
+        """
+        Adds the amount of a transaction made at the given time.
+        :param timestamp: a datetime
+        :param amount: a float
+        :return: None
+        """
+        micros = to_epoch_micros(timestamp)
+        timestamps = self._timestamps
+        if timestamps and micros < timestamps[-1]:
+            self._pending.append((micros, amount))
+            return
+        timestamps.append(micros)
+        self._amounts.append(amount)
+        self._prefix_sums.append(self._prefix_sums[-1] + amount)
+
+    def extend(self, timestamps: array, amounts: array) -> None:
+        """
+        Adds the amounts of many transactions at once. A run in time
+        order that follows the latest transaction is appended as a
+        whole; otherwise the transactions are set aside until the next
+        query.
+        :param timestamps: an array of int, in microseconds since the
+                           epoch
+        :param amounts: an array of float
+        :return: None
+        """
+        if not timestamps:
+            return
+        if self._timestamps and timestamps[0] < self._timestamps[-1] \
+                or not all(map(le, timestamps, islice(timestamps, 1, None))):
+            self._pending.extend(zip(timestamps, amounts))
+            return
+        self._timestamps.extend(timestamps)
+        self._amounts.extend(amounts)
+        self._prefix_sums.extend(islice(
+            accumulate(amounts, initial=self._prefix_sums[-1]), 1, None))
+
+    def _merge_pending(self) -> None:
+        """
+        Merges the transactions set aside into the sorted arrays and
+        rebuilds the prefix sums.
+        :return: None
+        """
+        self._pending.sort(key=itemgetter(0))
+        merged = list(merge(zip(self._timestamps, self._amounts),
+                            self._pending, key=itemgetter(0)))
+        self._pending = []
+        self._timestamps = array('q', map(itemgetter(0), merged))
+        self._amounts = array('d', map(itemgetter(1), merged))
+        self._prefix_sums = array('d', accumulate(self._amounts,
+                                                  initial=0))
+
+    def get_total(self, start: datetime = None, end: datetime = None) \
+            -> float:
+        """
+        Returns the total amount spent from start (inclusive) to end
+        (exclusive). Either bound may be omitted.
+        :param start: a datetime, or None
+        :param end: a datetime, or None
+        :return: a float
+        """
+        if self._pending:
+            self._merge_pending()
+        timestamps = self._timestamps
+        first = bisect_left(timestamps, to_epoch_micros(start)) \
+            if start is not None else 0
+        last = bisect_left(timestamps, to_epoch_micros(end)) \
+            if end is not None else len(timestamps)
+        if last <= first:
+            return 0
+        return self._prefix_sums[last] - self._prefix_sums[first]
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        Returns the number of bytes allocated for this index.
+        :return: an int
+        """
+        return sys.getsizeof(self._timestamps) \
+            + sys.getsizeof(self._amounts) \
+            + sys.getsizeof(self._prefix_sums) \
+            + sys.getsizeof(self._pending) \
+            + sum(sys.getsizeof(entry) for entry in self._pending)
+
+
+class TransactionLedger:
+    """
+    The TransactionLedger records transactions in the order they were
+    made, and also appends each transaction to a segment of its own
+    budget category. It has:
+    - a TransactionLog holding all transactions, in the order they were
+    recorded
+    - a dictionary of per-category segments (referenced via budget
+    categories), each an array of indexes into the log
+    - a dictionary of per-category SpendingIndex, to sum spending over
+    a period of time.
+
+    Recording a transaction only appends to the log and to one segment,
+    so it costs the same no matter how long the history is. Looking up a
+    category only touches the transactions in that category.
+    Transactions are read back as TransactionView objects.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty TransactionLedger.
+        """
+        self._log = TransactionLog()
+        self._segments = {}
+        self._spending = {}
+
+    def append(self, transaction: Transaction) -> None:
+        """
+        Records a transaction at the end of the ledger and at the end of
+        its category segment.
+        :param transaction: a Transaction
+        :return: None
+        """
+        index = self._log.append(transaction)
+        category = transaction.budget_category
+        self._get_segment(category).append(index)
+        self._spending[category].add(transaction.timestamp,
+                                     transaction.amount)
+
+    def extend(self, timestamps: array, amounts: array,
+               category_codes: array, shop_ids: array, categories: list,
+               shop_names: list) -> None:
+        """
+        Records many transactions given as columns, e.g. read from a
+        journal, without creating a Transaction per row. The category
+        segments and spending indexes are extended once per category.
+        :param timestamps: an array of int, in microseconds since the
+                           epoch
+        :param amounts: an array of float
+        :param category_codes: an array of int, indexes into categories
+        :param shop_ids: an array of int, indexes into shop_names
+        :param categories: a list of BudgetCategory or custom category
+                           names
+        :param shop_names: a list of str
+        :return: None
+        """
+        start = len(self._log)
+        self._log.extend(timestamps, amounts, category_codes, shop_ids,
+                         categories, shop_names)
+        codes = category_codes.tobytes()
+        for code in sorted(set(codes)):
+            # A byte per row, 1 in the rows of this category
+            selected = codes.translate(bytes(
+                other == code for other in range(256)))
+            category = categories[code]
+            self._get_segment(category).extend(compress(
+                range(start, start + len(selected)), selected))
+            self._spending[category].extend(
+                array('q', compress(timestamps, selected)),
+                array('d', compress(amounts, selected)))
+
+    def _get_segment(self, category) -> array:
+        """
+        Returns the segment of a category, creating it and its spending
+        index if needed.
+        :param category: a BudgetCategory, or a custom category name
+        :return: an array of int
+        """
+        segment = self._segments.get(category)
+        if segment is None:
+            segment = array('I')
+            self._segments[category] = segment
+            self._spending[category] = SpendingIndex()
+        return segment
+
+    def get_by_category(self, category: BudgetCategory) -> list:
+        """
+        Returns a list of transactions for the given budget category, in
+        the order they were recorded.
+        :param category: a BudgetCategory
+        :return: a list of Transaction
+        """
+        log = self._log
+        return [log[index] for index in self._segments.get(category, ())]
+
+    def count_by_category(self, category: BudgetCategory) -> int:
+        """
+        Returns the number of transactions recorded for the given budget
+        category.
+        :param category: a BudgetCategory
+        :return: an int
+        """
+        return len(self._segments.get(category, ()))
+
+    def get_amount_spent(self, category: BudgetCategory,
+                         start: datetime = None, end: datetime = None) \
+            -> float:
+        """
+        Returns the total amount spent in the given budget category from
+        start (inclusive) to end (exclusive). Either bound may be
+        omitted.
+        :param category: a BudgetCategory
+        :param start: a datetime, or None
+        :param end: a datetime, or None
+        :return: a float
+        """
+        spending = self._spending.get(category)
+        return spending.get_total(start, end) if spending is not None else 0
+
+    def find_time_range(self, start: datetime = None,
+                        end: datetime = None):
+        """
+        Returns the indexes of the transactions made from start
+        (inclusive) to end (exclusive), in the order they were recorded.
+        Either bound may be omitted.
+        :param start: a datetime, or None
+        :param end: a datetime, or None
+        :return: a sequence of indexes
+        """
+        return self._log.find_time_range(start, end)
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        Returns the number of bytes allocated for this ledger: its log,
+        its category segments and its spending indexes.
+        :return: an int
+        """
+        return self._log.memory_usage \
+            + sys.getsizeof(self._segments) \
+            + sum(sys.getsizeof(segment)
+                  for segment in self._segments.values()) \
+            + sys.getsizeof(self._spending) \
+            + sum(spending.memory_usage
+                  for spending in self._spending.values())
+
+    def __len__(self):
+        return len(self._log)
+
+    def __iter__(self):
+        return iter(self._log)
+
+    def __getitem__(self, index):
+        return self._log[index]
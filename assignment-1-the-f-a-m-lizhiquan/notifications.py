@@ -0,0 +1,203 @@
+"""
+This module contains the class definitions for NotificationEvent and
+NotificationDispatcher, which delivers the messages of bank accounts to
+pluggable sinks from a background thread, alongside PrintSink, the
+default sink.
+"""
+
+import queue
+import threading
+from enum import Enum
+
+
+class NotificationKind(Enum):
+    """
+    An enum represents the kinds of messages a bank account issues.
+    """
+    FAILURE = 'failure'
+    WARNING = 'warning'
+    NOTIFICATION = 'notification'
+    LOCK = 'lock'
+    REVIEW = 'review'
+
+
+CRITICAL_KINDS = (NotificationKind.FAILURE, NotificationKind.LOCK)
+"""
+The kinds of events a NotificationDispatcher never drops, because the
+user must learn that a transaction failed or a budget was locked.
+"""
+
+
+class NotificationEvent:
+    """
+    A message issued by a bank account. It has:
+    - the bank account number
+    - a NotificationKind
+    - the message text
+    - an optional callable returning extra lines (e.g. the transactions
+    to review), only called when the event is delivered
+    - the transaction that caused it, if any.
+    """
+
+    def __init__(self, bank_account_no: str, kind: NotificationKind,
+                 message: str, details=None, transaction=None):
+        """
+        Initializes a NotificationEvent.
+        :param bank_account_no: a string
+        :param kind: a NotificationKind
+        :param message: a string
+        :param details: a callable returning a list of string, or None
+        :param transaction: a Transaction, or None
+        """
+        self.bank_account_no = bank_account_no
+        self.kind = kind
+        self.message = message
+        self.details = details
+        self.transaction = transaction
+
+    @property
+    def key(self) -> tuple:
+        """
+        Returns what identifies duplicate events of the same account.
+        :return: a tuple
+        """
+        return self.bank_account_no, self.kind, self.message
+
+    def __str__(self):
+        return self.message
+
+
+class PrintSink:
+    """
+    A sink that prints each event and its details.
+    """
+
+    def __call__(self, events: list) -> None:
+        """
+        Prints a batch of events.
+        :param events: a list of NotificationEvent
+        :return: None
+        """
+        for event in events:
+            print(event)
+            if event.details is not None:
+                for line in event.details():
+                    print(line)
+
+
+class NotificationDispatcher:
+    """
+    The NotificationDispatcher accepts events on a bounded queue and
+    delivers them to its sinks from a background thread, so that
+    recording a transaction never waits for a slow sink. Events are
+    delivered in batches; within a batch, repeated events of the same
+    account (e.g. the same warning issued for every transaction) are
+    delivered once. When the queue is full, new routine events are
+    dropped and counted rather than blocking the publisher. Events of
+    CRITICAL_KINDS are queued regardless, so only they can take the
+    queue past its size. Events may be published from many threads.
+    """
+
+    def __init__(self, sinks: list = None, max_queue_size: int = 10000,
+                 batch_size: int = 256):
+        """
+        Initializes a NotificationDispatcher. Call start to begin
+        delivering events.
+        :param sinks: a list of callables taking a list of
+                      NotificationEvent, defaults to a PrintSink
+        :param max_queue_size: an int, the most routine events waiting
+                               for delivery
+        :param batch_size: an int, the most events delivered at once
+        """
+        self.sinks = sinks if sinks is not None else [PrintSink()]
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.published = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self.delivered = 0
+        self.sink_errors = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self) -> None:
+        """
+        Starts the background thread delivering events.
+        :return: None
+        """
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Delivers the events still waiting, then stops the background
+        thread.
+        :return: None
+        """
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def publish(self, event: NotificationEvent) -> bool:
+        """
+        Queues an event for delivery without waiting.
+        :param event: a NotificationEvent
+        :return: a bool, False if the queue was full and the event was
+                 dropped
+        """
+        with self._lock:
+            if event.kind not in CRITICAL_KINDS \
+                    and self._queue.qsize() >= self.max_queue_size:
+                self.dropped += 1
+                return False
+            self._queue.put_nowait(event)
+            self.published += 1
+        return True
+
+    def _run(self) -> None:
+        """
+        Takes batches of events off the queue and delivers them until a
+        stop is requested.
+        :return: None
+        """
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [event for event in batch if event is not None]
+            self._deliver(batch)
+
+    def _deliver(self, batch: list) -> None:
+        """
+        Removes duplicate events from a batch, keeping the latest one at
+        the place of the first, and hands it to every sink. A failing
+        sink does not stop the others.
+        :param batch: a list of NotificationEvent
+        :return: None
+        """
+        events = {}
+        for event in batch:
+            events[event.key] = event
+        with self._lock:
+            self.duplicates += len(batch) - len(events)
+        events = list(events.values())
+        if not events:
+            return
+        sink_errors = 0
+        for sink in self.sinks:
+            try:
+                sink(events)
+            except Exception:
+                sink_errors += 1
+        with self._lock:
+            self.sink_errors += sink_errors
+            self.delivered += len(events)
@@ -0,0 +1,164 @@
+"""
+This module contains the class definitions for the declarative account
+policies: PolicyAction, PolicyRule and AccountPolicy, alongside the
+POLICIES table that maps each UserType to its policy.
+"""
+
+from bisect import bisect_left
+from bisect import bisect_right
+from enum import Enum
+from budget import BUDGET_THRESHOLDS
+from user import UserType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class PolicyAction(Enum):
+    """
+    An enum represents the actions a policy rule can take on a budget.
+    """
+    WARN = 'warn'
+    NOTIFY = 'notify'
+    LOCK_BUDGET = 'lock budget'
+    REVIEW = 'review'
+    LOCK_ACCOUNT = 'lock account'
+
+
+class PolicyRule:
+    """
+    A PolicyRule applies when a budget's exceeded ratio goes over its
+    threshold. It has:
+    - a threshold, an exceeded ratio
+    - a tuple of PolicyAction, taken in order
+    - the percent shown in warnings, for rules that warn.
+    """
+
+    def __init__(self, threshold: float, actions: tuple,
+                 warn_percent: int = None):
+        """
+        Initializes a PolicyRule.
+        :param threshold: a float, the exceeded ratio the budget has to
+                          go over
+        :param actions: a tuple of PolicyAction
+        :param warn_percent: an int, the percent shown in warnings
+        """
+        if PolicyAction.WARN in actions and warn_percent is None:
+            raise ValueError('warn_percent is required to warn')
+        self.threshold = threshold
+        self.actions = actions
+        self.warn_percent = warn_percent
+
+
+class AccountPolicy:
+    """
+    An AccountPolicy is a table of PolicyRule, compiled once into a
+    sorted array of thresholds. The rule for an exceeded ratio is the
+    one with the highest threshold strictly below it, found by binary
+    search. The thresholds must be among BUDGET_THRESHOLDS, so the rule
+    of a budget is also compiled per threshold a BudgetManager tracks,
+    and looked up by the threshold the budget has crossed. It also has
+    the number of locked budgets after which a LOCK_ACCOUNT action locks
+    the whole account.
+    """
+
+    def __init__(self, rules: list, locked_budgets_limit: int = None):
+        """
+        Initializes and compiles an AccountPolicy.
+        :param rules: a list of PolicyRule, in any order
+        :param locked_budgets_limit: an int, the number of locked
+                                     budgets that locks the account
+        """
+        self.rules = sorted(rules, key=lambda rule: rule.threshold)
+        self.thresholds = [rule.threshold for rule in self.rules]
+        for threshold in self.thresholds:
+            if threshold not in BUDGET_THRESHOLDS:
+                raise ValueError(f'threshold must be one of '
+                                 f'{BUDGET_THRESHOLDS}')
+        self.locked_budgets_limit = locked_budgets_limit
+        self._crossed_rules = {}
+        for threshold in BUDGET_THRESHOLDS:
+            index = bisect_right(self.thresholds, threshold)
+            if index > 0:
+                self._crossed_rules[threshold] = self.rules[index - 1]
+        if numpy is not None:
+            self._threshold_array = numpy.array(self.thresholds,
+                                                dtype=numpy.float64)
+
+    def get_rule(self, exceeded_ratio: float):
+        """
+        Returns the rule that applies to a budget with the given
+        exceeded ratio.
+        :param exceeded_ratio: a float
+        :return: a PolicyRule, or None if no rule applies
+        """
+        index = bisect_left(self.thresholds, exceeded_ratio)
+        return self.rules[index - 1] if index > 0 else None
+
+    def get_crossed_rule(self, crossed_threshold):
+        """
+        Returns the rule that applies to a budget from the highest
+        threshold it has crossed, as tracked by its BudgetManager. It is
+        the rule get_rule returns for the budget's exceeded ratio.
+        :param crossed_threshold: a float of BUDGET_THRESHOLDS, or None
+                                  if the budget has crossed none
+        :return: a PolicyRule, or None if no rule applies
+        """
+        return self._crossed_rules.get(crossed_threshold)
+
+    def get_rule_indexes(self, exceeded_ratios) -> list:
+        """
+        Returns, for many exceeded ratios at once, the index of the rule
+        that applies to each of them plus one, or 0 when no rule
+        applies. NumPy is used when it is installed.
+        :param exceeded_ratios: a sequence of float
+        :return: a list of int
+        """
+        if numpy is not None:
+            ratios = numpy.asarray(exceeded_ratios, dtype=numpy.float64)
+            return numpy.searchsorted(self._threshold_array, ratios,
+                                      side='left').tolist()
+        return [bisect_left(self.thresholds, ratio)
+                for ratio in exceeded_ratios]
+
+    def evaluate_accounts(self, bank_accounts: list) -> list:
+        """
+        Evaluates this policy against every budget of many bank accounts
+        in one pass, e.g. to re-check all accounts after a policy
+        change. The matching rules are returned rather than applied.
+        :param bank_accounts: a list of BankAccount
+        :return: a list of (BankAccount, Budget, PolicyRule) tuples, for
+                 the budgets a rule applies to
+        """
+        pairs = [(bank_account, budget)
+                 for bank_account in bank_accounts
+                 for budget in bank_account.get_budgets()]
+        indexes = self.get_rule_indexes([budget.exceeded_ratio
+                                         for _, budget in pairs])
+        return [(bank_account, budget, self.rules[index - 1])
+                for (bank_account, budget), index in zip(pairs, indexes)
+                if index > 0]
+
+
+POLICIES = {
+    UserType.ANGEL: AccountPolicy([
+        PolicyRule(0.9, (PolicyAction.WARN, PolicyAction.REVIEW), 90),
+        PolicyRule(1, (PolicyAction.NOTIFY, PolicyAction.REVIEW)),
+    ]),
+    UserType.TROUBLEMAKER: AccountPolicy([
+        PolicyRule(0.75, (PolicyAction.WARN, PolicyAction.REVIEW), 75),
+        PolicyRule(1, (PolicyAction.NOTIFY, PolicyAction.REVIEW)),
+        PolicyRule(1.2, (PolicyAction.LOCK_BUDGET, PolicyAction.REVIEW)),
+    ]),
+    UserType.REBEL: AccountPolicy([
+        PolicyRule(0.5, (PolicyAction.WARN, PolicyAction.REVIEW), 50),
+        PolicyRule(1, (PolicyAction.NOTIFY, PolicyAction.LOCK_BUDGET,
+                       PolicyAction.REVIEW, PolicyAction.LOCK_ACCOUNT)),
+    ], locked_budgets_limit=2),
+}
+"""
+A dictionary that maps a UserType enum to the AccountPolicy of its bank
+account.
+"""
@@ -0,0 +1,117 @@
+"""
+This module contains the class definition for StatementRenderer, which
+writes bank account statements to a text stream.
+"""
+
+from datetime import datetime
+from typing import TextIO
+
+
+class StatementRenderer:
+    """
+    The StatementRenderer writes the statement of a bank account to any
+    text stream (a file, sys.stdout, an io.StringIO...). Transaction
+    lines are joined and written in chunks, so the full statement is
+    never held in memory. A statement can be limited to a page of
+    transactions and to a date range.
+    """
+
+    def __init__(self, bank_account, chunk_size: int = 256):
+        """
+        Initializes a StatementRenderer.
+        :param bank_account: a BankAccount, the account to render
+        :param chunk_size: an int, the number of transaction lines
+                           written at a time
+        """
+        self.bank_account = bank_account
+        self.chunk_size = chunk_size
+
+    def render(self, stream: TextIO, offset: int = 0, limit: int = None,
+               start: datetime = None, end: datetime = None) -> int:
+        """
+        Writes a full statement: the account details, the selected
+        transactions and the closing balance.
+        :param stream: a text stream to write to
+        :param offset: an int, the number of selected transactions to
+                       skip
+        :param limit: an int, the maximum number of transactions to
+                      write, or None for all of them
+        :param start: a datetime, only transactions from then on are
+                      selected, or None
+        :param end: a datetime, only transactions before then are
+                    selected, or None
+        :return: an int, the number of transactions written
+        """
+        self.write_header(stream)
+        count = self.write_transactions(stream, offset, limit, start, end)
+        if count == 0:
+            if len(self.bank_account.transactions) == 0:
+                stream.write("You haven't made any transaction yet.\n")
+            else:
+                stream.write('There is no transaction to show.\n')
+        self.write_footer(stream)
+        return count
+
+    def render_page(self, stream: TextIO, page: int, page_size: int,
+                    start: datetime = None, end: datetime = None) -> int:
+        """
+        Writes a full statement showing one page of transactions.
+        :param stream: a text stream to write to
+        :param page: an int, the page number starting from 0
+        :param page_size: an int, the number of transactions per page
+        :param start: a datetime, or None
+        :param end: a datetime, or None
+        :return: an int, the number of transactions written
+        """
+        return self.render(stream, page * page_size, page_size, start, end)
+
+    def write_header(self, stream: TextIO) -> None:
+        """
+        Writes the account details, up to the transactions heading.
+        :param stream: a text stream to write to
+        :return: None
+        """
+        bank_account = self.bank_account
+        stream.write(f'*** Bank Account Details ***\n'
+                     f'• Bank account number: '
+                     f'{bank_account.bank_account_no}\n'
+                     f'• Bank name: {bank_account.bank_name}\n'
+                     f'• Status: '
+                     f'{"Locked" if bank_account.locked else "Available"}\n'
+                     f'• Transactions:\n')
+
+    def write_transactions(self, stream: TextIO, offset: int = 0,
+                           limit: int = None, start: datetime = None,
+                           end: datetime = None) -> int:
+        """
+        Writes the selected transactions, one per line.
+        :param stream: a text stream to write to
+        :param offset: an int, the number of selected transactions to
+                       skip
+        :param limit: an int, the maximum number of transactions to
+                      write, or None for all of them
+        :param start: a datetime, or None
+        :param end: a datetime, or None
+        :return: an int, the number of transactions written
+        """
+        transactions = self.bank_account.transactions
+        indexes = transactions.find_time_range(start, end)
+        stop = offset + limit if limit is not None else None
+        count = 0
+        lines = []
+        for index in indexes[offset:stop]:
+            lines.append(f'{transactions[index]}\n')
+            if len(lines) == self.chunk_size:
+                stream.write(''.join(lines))
+                count += len(lines)
+                lines.clear()
+        stream.write(''.join(lines))
+        return count + len(lines)
+
+    def write_footer(self, stream: TextIO) -> None:
+        """
+        Writes the closing balance.
+        :param stream: a text stream to write to
+        :return: None
+        """
+        stream.write(f'• Closing balance: ${self.bank_account.bank_balance}')
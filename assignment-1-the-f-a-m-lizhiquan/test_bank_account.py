@@ -0,0 +1,92 @@
+"""
+Checks the notifications collected while recording a batch of
+transactions. Run it with `python -m unittest test_bank_account`.
+"""
+import random
+import unittest
+from datetime import datetime
+from bank_account import BankAccountCreator
+from budget import Budget
+from budget import BudgetCategory
+from budget import BudgetManager
+from notifications import NotificationKind
+from policy import POLICIES
+from policy import AccountPolicy
+from policy import PolicyAction
+from policy import PolicyRule
+from transaction import Transaction
+from user import UserType
+
+
+class TransactionBatchResultTest(unittest.TestCase):
+    """
+    Records transactions that cross the thresholds of a budget.
+    """
+
+    def record(self, user_type: UserType, amounts: list):
+        """
+        Records a batch of Eating Out transactions against a budget of
+        100.
+        :param user_type: a UserType
+        :param amounts: a list of float
+        :return: a tuple of the transactions and the
+                 TransactionBatchResult
+        """
+        budget_manager = BudgetManager()
+        budget_manager.add_budget(Budget(BudgetCategory.EATING_OUT, 100))
+        bank_account = BankAccountCreator.build_bank_account(
+            user_type, '1', 'Bank', 1000, budget_manager)
+        transactions = [Transaction(datetime(2026, 1, 1, hour), amount,
+                                    BudgetCategory.EATING_OUT, 'Subway')
+                        for hour, amount in enumerate(amounts)]
+        return transactions, bank_account.record_transactions(transactions)
+
+    def test_angel(self):
+        transactions, result = self.record(UserType.ANGEL, [50, 45, 10])
+        self.assertEqual(
+            [(event.kind, event.transaction)
+             for event in result.notifications],
+            [(NotificationKind.WARNING, transactions[1]),
+             (NotificationKind.NOTIFICATION, transactions[2])])
+        self.assertIn('Eating Out', result.notifications[0].message)
+
+    def test_rebel(self):
+        transactions, result = self.record(UserType.REBEL, [60, 50, 5])
+        self.assertEqual(
+            [(event.kind, event.transaction)
+             for event in result.notifications],
+            [(NotificationKind.WARNING, transactions[0]),
+             (NotificationKind.NOTIFICATION, transactions[1]),
+             (NotificationKind.LOCK, transactions[1])])
+        self.assertEqual([transaction for transaction, _ in result.rejected],
+                         [transactions[2]])
+
+
+class AccountPolicyTest(unittest.TestCase):
+    """
+    Looks policy rules up by the threshold a budget has crossed.
+    """
+
+    def test_crossed_rule(self):
+        rng = random.Random(1)
+        amounts = [rng.randrange(0, 150) for _ in range(200)]
+        amounts += [50, 75, 90, 100, 120]
+        for policy in POLICIES.values():
+            budget_manager = BudgetManager()
+            budget = Budget(BudgetCategory.EATING_OUT, 100)
+            budget_manager.add_budget(budget)
+            for amount in amounts:
+                budget.amount_spent = amount
+                self.assertIs(
+                    policy.get_crossed_rule(
+                        budget_manager.get_crossed_threshold(
+                            budget.category)),
+                    policy.get_rule(budget.exceeded_ratio))
+
+    def test_unknown_threshold(self):
+        with self.assertRaises(ValueError):
+            AccountPolicy([PolicyRule(0.8, (PolicyAction.NOTIFY,))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Checks that a TransactionJournal is restored after a crash, including a
+crash in the middle of a write. Run it with
+`python -m unittest test_journal`.
+"""
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from datetime import timedelta
+from bank_account import BankAccountCreator
+from budget import Budget
+from budget import BudgetCategory
+from budget import BudgetManager
+from journal import TransactionJournal
+from transaction import Transaction
+from user import User
+from user import UserType
+
+START = datetime(2026, 1, 1)
+
+
+def make_transactions(count: int, offset: int = 0) -> list:
+    """
+    Returns small transactions spread over a few shops and categories.
+    :param count: an int
+    :param offset: an int, the number of the first transaction
+    :return: a list of Transaction
+    """
+    categories = list(BudgetCategory)
+    return [Transaction(START + timedelta(minutes=number), 1 + number % 7,
+                        categories[number % len(categories)],
+                        f'Shop {number % 5}')
+            for number in range(offset, offset + count)]
+
+
+def get_fields(transactions) -> list:
+    """
+    Returns the fields of transactions, for comparing them.
+    :param transactions: an iterable of Transaction
+    :return: a list of tuples
+    """
+    return [(transaction.timestamp, transaction.amount,
+             transaction.budget_category, transaction.shop_name)
+            for transaction in transactions]
+
+
+class TransactionJournalTest(unittest.TestCase):
+    """
+    Journals an account, reopens the journal and compares the restored
+    account with the original one.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'journal')
+        budget_manager = BudgetManager()
+        for category in BudgetCategory:
+            budget_manager.add_budget(Budget(category, 100000))
+        self.user = User('Ada', 30, UserType.ANGEL)
+        self.bank_account = BankAccountCreator.build_bank_account(
+            UserType.ANGEL, '1', 'Bank', 1000000, budget_manager)
+        self.journal = TransactionJournal(self.path, snapshot_interval=40)
+        self.journal.attach(self.user, self.bank_account)
+
+    def tearDown(self):
+        self.journal.close()
+        self.directory.cleanup()
+
+    def reopen(self) -> TransactionJournal:
+        self.journal.close()
+        self.journal = TransactionJournal(self.path, snapshot_interval=40)
+        return self.journal
+
+    def assert_restored(self, bank_account) -> None:
+        """
+        Checks that a restored bank account has the transactions and
+        spending of the original one.
+        :param bank_account: a BankAccount
+        :return: None
+        """
+        self.assertEqual(get_fields(bank_account.transactions),
+                         get_fields(self.bank_account.transactions))
+        self.assertEqual(bank_account.to_dict(), self.bank_account.to_dict())
+        for category in BudgetCategory:
+            self.assertAlmostEqual(
+                bank_account.get_amount_spent(category, START),
+                self.bank_account.get_amount_spent(category, START))
+
+    def test_restore(self):
+        self.bank_account.record_transactions(make_transactions(100))
+        _, bank_account = self.reopen().restore()
+        self.assert_restored(bank_account)
+
+    def test_torn_names(self):
+        self.bank_account.record_transactions(make_transactions(10))
+        shops_path = self.journal.shops_path
+        with open(shops_path) as file:
+            expected = file.read()
+        for torn in ('"Shop', '"Shop 9"'):
+            with open(shops_path, mode='a') as file:
+                file.write(torn)
+            _, bank_account = self.reopen().restore()
+            self.assert_restored(bank_account)
+            with open(shops_path) as file:
+                self.assertEqual(file.read(), expected)
+
+        self.bank_account = bank_account
+        bank_account.record_transactions(make_transactions(10, 10))
+        _, bank_account = self.reopen().restore()
+        self.assert_restored(bank_account)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Checks the spending totals of a TransactionLedger fed transactions out
+of time order. Run it with `python -m unittest test_ledger`.
+"""
+import random
+import unittest
+from array import array
+from datetime import datetime
+from datetime import timedelta
+from budget import BudgetCategory
+from ledger import SpendingIndex
+from ledger import TransactionLedger
+from test_journal import get_fields
+from transaction import Transaction
+from transaction import to_epoch_micros
+
+START = datetime(2026, 1, 1)
+
+
+class SpendingIndexTest(unittest.TestCase):
+    """
+    Compares the totals of shuffled transactions with a plain sum.
+    """
+
+    def setUp(self):
+        self.random = random.Random(1)
+        self.transactions = []
+        for _ in range(2000):
+            minutes = self.random.randrange(60 * 24 * 30)
+            self.transactions.append(Transaction(
+                START + timedelta(minutes=minutes),
+                self.random.randrange(1, 10000) / 100,
+                self.random.choice(list(BudgetCategory)), 'Shop'))
+        self.random.shuffle(self.transactions)
+
+    def get_expected(self, category: BudgetCategory, start: datetime,
+                     end: datetime) -> float:
+        return sum(transaction.amount for transaction in self.transactions
+                   if transaction.budget_category == category
+                   and start <= transaction.timestamp < end)
+
+    def assert_totals(self, ledger: TransactionLedger, count: int) -> None:
+        """
+        Checks the totals of random ranges against a plain sum.
+        :param ledger: a TransactionLedger
+        :param count: an int, the number of ranges checked
+        :return: None
+        """
+        for _ in range(count):
+            start, end = sorted(
+                START + timedelta(minutes=self.random.randrange(
+                    60 * 24 * 31)) for _ in range(2))
+            category = self.random.choice(list(BudgetCategory))
+            self.assertAlmostEqual(
+                ledger.get_amount_spent(category, start, end),
+                self.get_expected(category, start, end), places=6)
+
+    def test_shuffled(self):
+        ledger = TransactionLedger()
+        for transaction in self.transactions:
+            ledger.append(transaction)
+        self.assert_totals(ledger, 200)
+
+    def test_queries_between_inserts(self):
+        ledger = TransactionLedger()
+        transactions = self.transactions
+        for index, transaction in enumerate(transactions):
+            ledger.append(transaction)
+            if index % 250 == 0:
+                self.transactions = transactions[:index + 1]
+                self.assert_totals(ledger, 20)
+
+    def test_extend(self):
+        ledger = TransactionLedger()
+        expected = TransactionLedger()
+        first = Transaction(START, 1, 'Custom', 'Other shop')
+        ledger.append(first)
+        expected.append(first)
+        for transaction in self.transactions:
+            expected.append(transaction)
+
+        categories = list(reversed(BudgetCategory))
+        shop_names = ['Shop']
+        ledger.extend(
+            array('q', (to_epoch_micros(transaction.timestamp)
+                        for transaction in self.transactions)),
+            array('d', (transaction.amount
+                        for transaction in self.transactions)),
+            array('B', (categories.index(transaction.budget_category)
+                        for transaction in self.transactions)),
+            array('I', [0] * len(self.transactions)),
+            categories, shop_names)
+        self.assertEqual(get_fields(ledger), get_fields(expected))
+        for category in BudgetCategory:
+            self.assertEqual(ledger.count_by_category(category),
+                             expected.count_by_category(category))
+        self.transactions.append(first)
+        self.assert_totals(ledger, 200)
+
+    def test_bounds(self):
+        index = SpendingIndex()
+        for day in (3, 1, 2, 1):
+            index.add(START + timedelta(days=day), day)
+        self.assertEqual(index.get_total(), 7)
+        self.assertEqual(index.get_total(START + timedelta(days=1),
+                                         START + timedelta(days=2)), 2)
+        self.assertEqual(index.get_total(START + timedelta(days=2)), 5)
+        self.assertEqual(index.get_total(end=START), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Checks that transactions exported with a timezone, e.g. a 'Z' suffix,
+are read and recorded. Run it with `python -m unittest test_transaction`.
+"""
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from bank_account import BankAccountCreator
+from budget import Budget
+from budget import BudgetCategory
+from budget import BudgetManager
+from transaction import Transaction
+from transaction import TransactionReader
+from transaction import to_epoch_micros
+from user import UserType
+
+
+class TimezoneTest(unittest.TestCase):
+    """
+    Reads timestamps with and without a timezone.
+    """
+
+    def test_from_dict(self):
+        for text in ('2026-01-01T10:00:00Z', '2026-01-01T10:00:00+00:00',
+                     '2026-01-01T12:00:00+02:00', '2026-01-01T10:00:00'):
+            transaction = Transaction.from_dict({
+                'timestamp': text,
+                'amount': '12.5',
+                'budget_category': 'Eating Out',
+                'shop_name': 'Subway',
+            })
+            self.assertEqual(transaction.timestamp,
+                             datetime(2026, 1, 1, 10))
+
+    def test_to_epoch_micros(self):
+        timestamp = datetime.fromisoformat('2026-01-01T12:00:00+02:00')
+        self.assertEqual(to_epoch_micros(timestamp),
+                         to_epoch_micros(datetime(2026, 1, 1, 10)))
+
+    def test_record_jsonl(self):
+        budget_manager = BudgetManager()
+        budget_manager.add_budget(Budget(BudgetCategory.EATING_OUT, 500))
+        bank_account = BankAccountCreator.build_bank_account(
+            UserType.ANGEL, '1', 'Bank', 1000, budget_manager)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'transactions.jsonl')
+            with open(path, mode='w') as file:
+                for hour in (10, 11):
+                    file.write(json.dumps({
+                        'timestamp': f'2026-01-01T{hour}:00:00Z',
+                        'amount': 10,
+                        'budget_category': 'Eating Out',
+                        'shop_name': 'Subway',
+                    }) + '\n')
+            result = bank_account.record_transactions(
+                TransactionReader.read_jsonl(path))
+        self.assertEqual(result.rejected, [])
+        self.assertEqual(len(bank_account.transactions), 2)
+        self.assertEqual(bank_account.get_amount_spent(
+            BudgetCategory.EATING_OUT, datetime(2026, 1, 1, 10, 30)), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,57 @@
 """
-This module contains the class definition for Transaction.
+This module contains the class definition for Transaction alongside
+TransactionReader as a supporting class to stream transactions from
+CSV and JSONL files.
 """
 
+import csv
+import json
 from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Generator
 from budget import BudgetCategory
 
+EPOCH = datetime(1970, 1, 1)
+"""
+The origin of the integer timestamps used to store transactions
+compactly, as microseconds since this (naive) datetime.
+"""
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_naive_utc(timestamp: datetime) -> datetime:
+    """
+    Converts a datetime with a timezone, e.g. parsed from
+    '2026-01-01T10:00:00Z', to a naive datetime in UTC. A naive datetime
+    is returned as it is.
+    :param timestamp: a datetime
+    :return: a datetime
+    """
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_epoch_micros(timestamp: datetime) -> int:
+    """
+    Converts a datetime to microseconds since EPOCH. A datetime with a
+    timezone is converted to UTC first.
+    :param timestamp: a datetime
+    :return: an int
+    """
+    return (to_naive_utc(timestamp) - EPOCH) // _MICROSECOND
+
+
+def from_epoch_micros(micros: int) -> datetime:
+    """
+    Converts microseconds since EPOCH back to a datetime.
+    :param micros: an int
+    :return: a datetime
+    """
+    return EPOCH + timedelta(microseconds=micros)
+
 
 class Transaction:
     """
@@ -31,3 +78,53 @@ class Transaction:
         formatted_timestamp = self.timestamp.strftime("%Y-%m-%d %H:%M")
         return f'[{formatted_timestamp}]: A transaction of ${self.amount}' \
                f' was recorded at {self.shop_name}.'
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Transaction':
+        """
+        Creates a Transaction from a dictionary of strings, as read from
+        a CSV row or a JSON object. The timestamp is in ISO format, and
+        one with a timezone (e.g. a 'Z' suffix) is converted to naive
+        UTC. The budget category is the category name, e.g. "Eating
+        Out".
+        :param data: a dictionary with the keys 'timestamp', 'amount',
+                     'budget_category' and 'shop_name'
+        :return: a Transaction
+        """
+        return cls(to_naive_utc(datetime.fromisoformat(data['timestamp'])),
+                   float(data['amount']),
+                   BudgetCategory(data['budget_category']),
+                   data['shop_name'])
+
+
+class TransactionReader:
+    """
+    An utility class that streams transactions from files, one at a
+    time, so that large files can be fed to
+    BankAccount.record_transactions without loading them in memory.
+    """
+
+    @staticmethod
+    def read_csv(file_path: str) -> Generator[Transaction, None, None]:
+        """
+        Reads transactions from a CSV file with a header row of
+        timestamp, amount, budget_category and shop_name.
+        :param file_path: a string, path to the file
+        :return: a generator that yields Transaction
+        """
+        with open(file_path, newline='') as file:
+            for row in csv.DictReader(file):
+                yield Transaction.from_dict(row)
+
+    @staticmethod
+    def read_jsonl(file_path: str) -> Generator[Transaction, None, None]:
+        """
+        Reads transactions from a JSON Lines file, one JSON object per
+        line. Blank lines are skipped.
+        :param file_path: a string, path to the file
+        :return: a generator that yields Transaction
+        """
+        with open(file_path) as file:
+            for line in file:
+                if line.strip():
+                    yield Transaction.from_dict(json.loads(line))
@@ -0,0 +1,277 @@
+"""
+This module contains the class definitions for TransactionLog, a compact
+column-oriented store of transactions, and TransactionView, the
+lightweight Transaction it hands out on demand.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from itertools import islice
+from operator import le
+from budget import BudgetCategory
+from transaction import Transaction
+from transaction import to_epoch_micros
+from transaction import from_epoch_micros
+
+
+class TransactionLog:
+    """
+    The TransactionLog stores transactions as parallel arrays instead of
+    one Python object per transaction. It has:
+    - an array of timestamps, in microseconds since the epoch (int64)
+    - an array of amounts (float64)
+    - an array of category codes (uint8), indexing a category table
+    - an array of shop ids (uint32), indexing an interned shop name
+    table.
+
+    A transaction costs 21 bytes in the arrays, plus its shop name once
+    per distinct shop. Transactions are read back as TransactionView
+    objects created on demand.
+    """
+
+    MAX_CATEGORIES = 256
+
+    def __init__(self):
+        """
+        Initializes an empty TransactionLog. The category codes of the
+        BudgetCategory values match budget.CATEGORY_CODES; custom
+        categories get the next free codes.
+        """
+        self._timestamps = array('q')
+        self._amounts = array('d')
+        self._category_codes = array('B')
+        self._shop_ids = array('I')
+        self._categories = list(BudgetCategory)
+        self._category_lookup = {category: code for code, category
+                                 in enumerate(self._categories)}
+        self._shop_names = []
+        self._shop_lookup = {}
+        self._in_time_order = True
+
+    def append(self, transaction: Transaction) -> int:
+        """
+        Appends a transaction to the log and returns its index.
+        :param transaction: a Transaction
+        :return: an int, the index of the transaction in the log
+        """
+        timestamp = to_epoch_micros(transaction.timestamp)
+        if self._timestamps and timestamp < self._timestamps[-1]:
+            self._in_time_order = False
+        self._timestamps.append(timestamp)
+        self._amounts.append(transaction.amount)
+        self._category_codes.append(
+            self._get_category_code(transaction.budget_category))
+        self._shop_ids.append(self._get_shop_id(transaction.shop_name))
+        return len(self._amounts) - 1
+
+    def extend(self, timestamps: array, amounts: array,
+               category_codes: array, shop_ids: array, categories: list,
+               shop_names: list) -> None:
+        """
+        Appends many transactions given as columns. The codes and ids
+        index the given category and shop tables, and are translated to
+        the tables of this log when they differ.
+        :param timestamps: an array of int, in microseconds since the
+                           epoch
+        :param amounts: an array of float
+        :param category_codes: an array of int, indexes into categories
+        :param shop_ids: an array of int, indexes into shop_names
+        :param categories: a list of BudgetCategory or custom category
+                           names
+        :param shop_names: a list of str
+        :return: None
+        """
+        if not timestamps:
+            return
+        codes = bytes(self._get_category_code(category)
+                      for category in categories)
+        if codes != bytes(range(len(codes))):
+            category_codes = array('B', category_codes.tobytes().translate(
+                codes.ljust(256, b'\0')))
+        ids = [self._get_shop_id(shop_name) for shop_name in shop_names]
+        if ids != list(range(len(ids))):
+            shop_ids = array('I', map(ids.__getitem__, shop_ids))
+        if self._timestamps and timestamps[0] < self._timestamps[-1] \
+                or not all(map(le, timestamps, islice(timestamps, 1, None))):
+            self._in_time_order = False
+        self._timestamps.extend(timestamps)
+        self._amounts.extend(amounts)
+        self._category_codes.extend(category_codes)
+        self._shop_ids.extend(shop_ids)
+
+    def _get_category_code(self, category) -> int:
+        """
+        Returns the code of a category, assigning a new one if needed.
+        :param category: a BudgetCategory, or a custom category name
+        :return: an int
+        """
+        code = self._category_lookup.get(category)
+        if code is None:
+            if len(self._categories) >= self.MAX_CATEGORIES:
+                raise ValueError(f'A transaction log supports at most '
+                                 f'{self.MAX_CATEGORIES} categories')
+            code = len(self._categories)
+            self._categories.append(category)
+            self._category_lookup[category] = code
+        return code
+
+    def _get_shop_id(self, shop_name: str) -> int:
+        """
+        Returns the id of an interned shop name, interning it if needed.
+        :param shop_name: a string
+        :return: an int
+        """
+        shop_id = self._shop_lookup.get(shop_name)
+        if shop_id is None:
+            shop_id = len(self._shop_names)
+            self._shop_names.append(shop_name)
+            self._shop_lookup[shop_name] = shop_id
+        return shop_id
+
+    def get_timestamp(self, index: int) -> datetime:
+        """
+        Returns the timestamp of the transaction at the given index.
+        :param index: an int
+        :return: a datetime
+        """
+        return from_epoch_micros(self._timestamps[index])
+
+    def get_epoch_micros(self, index: int) -> int:
+        """
+        Returns the timestamp of the transaction at the given index, in
+        microseconds since the epoch.
+        :param index: an int
+        :return: an int
+        """
+        return self._timestamps[index]
+
+    def get_amount(self, index: int) -> float:
+        """
+        Returns the amount of the transaction at the given index.
+        :param index: an int
+        :return: a float
+        """
+        return self._amounts[index]
+
+    def get_category(self, index: int):
+        """
+        Returns the category of the transaction at the given index.
+        :param index: an int
+        :return: a BudgetCategory, or a custom category name
+        """
+        return self._categories[self._category_codes[index]]
+
+    def get_shop_name(self, index: int) -> str:
+        """
+        Returns the shop name of the transaction at the given index.
+        :param index: an int
+        :return: a string
+        """
+        return self._shop_names[self._shop_ids[index]]
+
+    def find_time_range(self, start: datetime = None,
+                        end: datetime = None) -> range:
+        """
+        Returns the range of indexes of the transactions made from start
+        (inclusive) to end (exclusive). Either bound may be omitted.
+        Transactions recorded in time order are found by binary search;
+        otherwise the whole log is scanned.
+        :param start: a datetime, or None
+        :param end: a datetime, or None
+        :return: a sequence of indexes, in the order they were recorded
+        """
+        low = to_epoch_micros(start) if start is not None else None
+        high = to_epoch_micros(end) if end is not None else None
+        timestamps = self._timestamps
+        if self._in_time_order:
+            first = bisect_left(timestamps, low) if low is not None else 0
+            last = bisect_left(timestamps, high) if high is not None \
+                else len(timestamps)
+            return range(first, max(first, last))
+        return [index for index, timestamp in enumerate(timestamps)
+                if (low is None or timestamp >= low)
+                and (high is None or timestamp < high)]
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        Returns the number of bytes allocated for this log: its arrays,
+        including spare capacity, and its category and shop tables.
+        :return: an int
+        """
+        size = sum(sys.getsizeof(column)
+                   for column in (self._timestamps, self._amounts,
+                                  self._category_codes, self._shop_ids))
+        size += sys.getsizeof(self._categories)
+        size += sys.getsizeof(self._category_lookup)
+        size += sys.getsizeof(self._shop_names)
+        size += sys.getsizeof(self._shop_lookup)
+        size += sum(sys.getsizeof(name) for name in self._shop_names)
+        return size
+
+    def __len__(self):
+        return len(self._amounts)
+
+    def __getitem__(self, index: int) -> 'TransactionView':
+        if index < 0:
+            index += len(self._amounts)
+        if not 0 <= index < len(self._amounts):
+            raise IndexError('transaction index out of range')
+        return TransactionView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self._amounts)):
+            yield TransactionView(self, index)
+
+
+class TransactionView(Transaction):
+    """
+    A read-only Transaction backed by a row of a TransactionLog. It only
+    holds a reference to the log and an index, and reads each field from
+    the log when it is accessed.
+    """
+
+    __slots__ = ('_log', '_index')
+
+    def __init__(self, log: TransactionLog, index: int):
+        """
+        Initializes a TransactionView.
+        :param log: a TransactionLog
+        :param index: an int, the index of the transaction in the log
+        """
+        self._log = log
+        self._index = index
+
+    @property
+    def timestamp(self) -> datetime:
+        """
+        Returns the timestamp of this transaction.
+        :return: a datetime
+        """
+        return self._log.get_timestamp(self._index)
+
+    @property
+    def amount(self) -> float:
+        """
+        Returns the amount of this transaction.
+        :return: a float
+        """
+        return self._log.get_amount(self._index)
+
+    @property
+    def budget_category(self):
+        """
+        Returns the budget category of this transaction.
+        :return: a BudgetCategory, or a custom category name
+        """
+        return self._log.get_category(self._index)
+
+    @property
+    def shop_name(self) -> str:
+        """
+        Returns the shop name of this transaction.
+        :return: a string
+        """
+        return self._log.get_shop_name(self._index)
@@ -30,3 +30,24 @@ class User:
         self.name = name
         self.age = age
         self.user_type = user_type
+
+    def to_dict(self) -> dict:
+        """
+        Returns this user as a dictionary of plain values, e.g. to be
+        saved as JSON.
+        :return: a dictionary
+        """
+        return {
+            'name': self.name,
+            'age': self.age,
+            'user_type': int(self.user_type),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'User':
+        """
+        Creates a User from a dictionary returned by to_dict.
+        :param data: a dictionary
+        :return: a User
+        """
+        return cls(data['name'], data['age'], UserType(data['user_type']))
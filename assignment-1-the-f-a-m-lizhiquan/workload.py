@@ -0,0 +1,347 @@
+"""
+This module contains the class definitions for WorkloadGenerator, which
+creates seeded synthetic users and transactions, and LoadDriver, which
+pushes those workloads through record_transaction in several processes
+and reports the throughput and latency. Run it as a script, e.g.
+`python workload.py --users 1000 --transactions 500 --processes 4`.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import statistics
+import time
+from array import array
+from datetime import datetime
+from datetime import timedelta
+from bank_account import BankAccount
+from bank_account import BankAccountCreator
+from budget import Budget
+from budget import BudgetCategory
+from budget import BudgetManager
+from notifications import NotificationKind
+from transaction import Transaction
+from user import User
+from user import UserType
+
+
+class WorkloadGenerator:
+    """
+    The WorkloadGenerator creates synthetic users, bank accounts and
+    transactions from a seed. Every user is generated from the seed and
+    its own index, so any process can rebuild the same user without the
+    workload being sent to it.
+    """
+
+    NAMES = ('Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley',
+             'Jamie', 'Avery', 'Quinn')
+
+    USER_TYPE_WEIGHTS = {
+        UserType.ANGEL: 5,
+        UserType.TROUBLEMAKER: 3,
+        UserType.REBEL: 2,
+    }
+    """
+    A dictionary that maps a UserType enum to how often it is picked.
+    """
+
+    SPENDING = {
+        BudgetCategory.GAMES_AND_ENTERTAINMENT: (
+            3.0, 0.7, ('Steam', 'Nintendo eShop', 'Cineplex', 'EB Games')),
+        BudgetCategory.CLOTHING_AND_ACCESSORIES: (
+            3.6, 0.6, ('H&M', 'Zara', 'Uniqlo', 'Foot Locker')),
+        BudgetCategory.EATING_OUT: (
+            2.4, 0.5, ('Tim Hortons', 'Subway', 'Starbucks', 'A&W')),
+        BudgetCategory.MISCELLANEOUS: (
+            2.2, 0.9, ('Amazon', 'Dollarama', 'London Drugs', 'Indigo')),
+    }
+    """
+    A dictionary that maps a BudgetCategory enum to the mean and
+    standard deviation of the log of its amounts, and its shop names.
+    """
+
+    CATEGORY_WEIGHTS = (2, 1, 4, 3)
+
+    def __init__(self, seed: int = 0, start: datetime = None):
+        """
+        Initializes a WorkloadGenerator.
+        :param seed: an int, the random seed
+        :param start: a datetime, the time of the first transactions,
+                      defaults to 2026-01-01
+        """
+        self.seed = seed
+        self.start = start if start is not None else datetime(2026, 1, 1)
+
+    def _get_random(self, index: int) -> random.Random:
+        """
+        Returns the random generator of the user at the given index.
+        :param index: an int
+        :return: a random.Random
+        """
+        return random.Random(f'{self.seed}-{index}')
+
+    def generate_user(self, index: int) -> User:
+        """
+        Generates the user at the given index.
+        :param index: an int
+        :return: a User
+        """
+        rng = self._get_random(index)
+        user_type = rng.choices(list(self.USER_TYPE_WEIGHTS),
+                                list(self.USER_TYPE_WEIGHTS.values()))[0]
+        return User(f'{rng.choice(self.NAMES)} {index}',
+                    rng.randint(8, 17), user_type)
+
+    def generate_bank_account(self, index: int, user: User) -> BankAccount:
+        """
+        Generates the bank account of the user at the given index. The
+        budgets of a category are sized around a month of its typical
+        spending.
+        :param index: an int
+        :param user: a User, the user generated for that index
+        :return: a BankAccount
+        """
+        rng = random.Random(f'{self.seed}-{index}-account')
+        budget_manager = BudgetManager()
+        for category, (mu, sigma, _) in self.SPENDING.items():
+            typical = math.exp(mu + sigma ** 2 / 2)
+            budget_manager.add_budget(
+                Budget(category, round(typical * rng.uniform(5, 20), 2)))
+        return BankAccountCreator.build_bank_account(
+            user.user_type, f'{index:08d}', 'Synthetic Bank',
+            round(rng.uniform(1000, 10000), 2), budget_manager)
+
+    def generate_transactions(self, index: int, count: int):
+        """
+        Yields the transactions of the user at the given index, a few
+        hours apart on average, with log-normally distributed amounts.
+        :param index: an int
+        :param count: an int, the number of transactions
+        :return: a generator that yields Transaction
+        """
+        rng = random.Random(f'{self.seed}-{index}-transactions')
+        categories = list(self.SPENDING)
+        timestamp = self.start
+        for _ in range(count):
+            timestamp += timedelta(minutes=rng.expovariate(1 / 180))
+            category = rng.choices(categories, self.CATEGORY_WEIGHTS)[0]
+            mu, sigma, shops = self.SPENDING[category]
+            yield Transaction(timestamp,
+                              round(rng.lognormvariate(mu, sigma), 2),
+                              category, rng.choice(shops))
+
+
+class NotificationCounter:
+    """
+    A stand-in for a NotificationDispatcher that only counts the events
+    published by a bank account, by kind.
+    """
+
+    def __init__(self):
+        """
+        Initializes a NotificationCounter.
+        """
+        self.counts = {kind: 0 for kind in NotificationKind}
+
+    def publish(self, event) -> bool:
+        """
+        Counts an event.
+        :param event: a NotificationEvent
+        :return: a bool, always True
+        """
+        self.counts[event.kind] += 1
+        return True
+
+
+class LoadReport:
+    """
+    The results of a load run. It has:
+    - the number of users, processes and transactions
+    - the wall clock seconds of the run
+    - the 50th and 99th percentile latency of record_transaction
+    - the number of transactions recorded and rejected
+    - the number of notifications by kind
+    - the number of locked budgets and locked bank accounts.
+    """
+
+    def __init__(self, users: int, processes: int, elapsed: float,
+                 partitions: list):
+        """
+        Initializes a LoadReport from the results of every partition.
+        :param users: an int, the number of users
+        :param processes: an int, the number of processes
+        :param elapsed: a float, the wall clock seconds of the run
+        :param partitions: a list of dictionaries returned by
+                           LoadDriver.run_partition
+        """
+        latencies = array('d')
+        for partition in partitions:
+            latencies.extend(partition['latencies'])
+        self.users = users
+        self.processes = processes
+        self.elapsed = elapsed
+        self.transactions = len(latencies)
+        if len(latencies) >= 2:
+            percentiles = statistics.quantiles(latencies, n=100)
+            self.p50 = percentiles[49]
+            self.p99 = percentiles[98]
+        else:
+            self.p50 = self.p99 = latencies[0] if latencies else 0
+        self.recorded = sum(partition['recorded'] for partition in partitions)
+        self.rejected = self.transactions - self.recorded
+        self.notifications = {
+            kind.value: sum(partition['notifications'][kind.value]
+                            for partition in partitions)
+            for kind in NotificationKind
+        }
+        self.locked_budgets = sum(partition['locked_budgets']
+                                  for partition in partitions)
+        self.locked_accounts = sum(partition['locked_accounts']
+                                   for partition in partitions)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Returns the number of transactions processed per second.
+        :return: a float
+        """
+        return self.transactions / self.elapsed if self.elapsed else 0
+
+    def to_dict(self) -> dict:
+        """
+        Returns this report as a dictionary of plain values, e.g. to be
+        saved as JSON.
+        :return: a dictionary
+        """
+        return {
+            'users': self.users,
+            'processes': self.processes,
+            'transactions': self.transactions,
+            'seconds': self.elapsed,
+            'transactions_per_second': self.throughput,
+            'p50_seconds': self.p50,
+            'p99_seconds': self.p99,
+            'recorded': self.recorded,
+            'rejected': self.rejected,
+            'notifications': self.notifications,
+            'locked_budgets': self.locked_budgets,
+            'locked_accounts': self.locked_accounts,
+        }
+
+    def __str__(self):
+        return f'*** Load Report ***\n' \
+               f'• Users: {self.users} on {self.processes} process(es)\n' \
+               f'• Transactions: {self.transactions} in ' \
+               f'{self.elapsed:.2f}s ({self.throughput:.0f}/s)\n' \
+               f'• Latency: p50 {self.p50 * 1e6:.1f}µs, ' \
+               f'p99 {self.p99 * 1e6:.1f}µs\n' \
+               f'• Recorded: {self.recorded}, rejected: {self.rejected}\n' \
+               f'• Notifications: {self.notifications}\n' \
+               f'• Locked budgets: {self.locked_budgets}, locked ' \
+               f'accounts: {self.locked_accounts}'
+
+
+class LoadDriver:
+    """
+    The LoadDriver splits the users of a workload across processes.
+    Each process rebuilds its users from the seed, records their
+    transactions one by one through record_transaction, and times every
+    call.
+    """
+
+    def __init__(self, seed: int = 0, users: int = 1000,
+                 transactions_per_user: int = 100, processes: int = None):
+        """
+        Initializes a LoadDriver.
+        :param seed: an int, the random seed
+        :param users: an int, the number of users
+        :param transactions_per_user: an int
+        :param processes: an int, the number of processes, defaults to
+                          the number of CPUs
+        """
+        if users <= 0:
+            raise ValueError('users must be > 0')
+        self.seed = seed
+        self.users = users
+        self.transactions_per_user = transactions_per_user
+        self.processes = processes or multiprocessing.cpu_count()
+
+    @staticmethod
+    def run_partition(seed: int, indexes: range,
+                      transactions_per_user: int) -> dict:
+        """
+        Records the workload of the users at the given indexes and
+        returns the measurements.
+        :param seed: an int, the random seed
+        :param indexes: a range of user indexes
+        :param transactions_per_user: an int
+        :return: a dictionary
+        """
+        generator = WorkloadGenerator(seed)
+        latencies = array('d')
+        recorded = 0
+        locked_budgets = 0
+        locked_accounts = 0
+        counter = NotificationCounter()
+        clock = time.perf_counter
+        for index in indexes:
+            user = generator.generate_user(index)
+            bank_account = generator.generate_bank_account(index, user)
+            bank_account.dispatcher = counter
+            for transaction in generator.generate_transactions(
+                    index, transactions_per_user):
+                start = clock()
+                recorded += bank_account.record_transaction(transaction)
+                latencies.append(clock() - start)
+            locked_budgets += bank_account.budget_manager.no_locked_budgets
+            locked_accounts += bank_account.locked
+        return {
+            'latencies': latencies,
+            'recorded': recorded,
+            'notifications': {kind.value: count
+                              for kind, count in counter.counts.items()},
+            'locked_budgets': locked_budgets,
+            'locked_accounts': locked_accounts,
+        }
+
+    def run(self) -> LoadReport:
+        """
+        Runs the workload in a pool of processes and returns the report.
+        :return: a LoadReport
+        """
+        size = math.ceil(self.users / self.processes)
+        partitions = [(self.seed, range(start, min(start + size, self.users)),
+                       self.transactions_per_user)
+                      for start in range(0, self.users, size)]
+        start = time.perf_counter()
+        with multiprocessing.Pool(self.processes) as pool:
+            results = pool.starmap(LoadDriver.run_partition, partitions)
+        elapsed = time.perf_counter() - start
+        return LoadReport(self.users, self.processes, elapsed, results)
+
+
+def main():
+    """
+    Parses the command line arguments, runs the load and prints its
+    report.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description='Pushes a synthetic workload through the F.A.M.')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--transactions', type=int, default=100,
+                        help='transactions per user')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    args = parser.parse_args()
+    report = LoadDriver(args.seed, args.users, args.transactions,
+                        args.processes).run()
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+This module benchmarks the supply chain with seeded synthetic order
+files and writes the results as JSON. Run it as a script, e.g.
+`python benchmark.py --sizes 1000 100000 --output results.json`.
+
+The suites are:
+- read: OrderProcessor.get_next_order throughput
+- items: item construction through the factories, with and without
+their prototype caches
+- store: Store.process_order throughput.
+
+Each suite runs in a fresh process, so its peak RSS is its own.
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from order_generator import OrderFileGenerator
+from order_processor import OrderProcessor
+from store import Store, STOCK_STATUSES
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SUITES = ('read', 'items', 'store')
+
+FORMATS = ('csv', 'xlsx')
+
+
+def get_peak_rss() -> int:
+    """
+    Returns the peak resident set size of this process.
+    :return: an int, in bytes, or None if it cannot be measured here
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def read_orders(path: str):
+    """
+    Yields the orders of a file, without printing the invalid rows.
+    :param path: a str
+    :return: a generator that yields Order
+    """
+    with open(os.devnull, mode='w') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            yield from OrderProcessor(path).get_next_order()
+
+
+def benchmark_read(path: str) -> dict:
+    """
+    Measures the time to read every order of a file.
+    :param path: a str
+    :return: a dictionary of results
+    """
+    start = time.perf_counter()
+    orders = sum(1 for _ in read_orders(path))
+    return {'orders': orders, 'seconds': time.perf_counter() - start}
+
+
+def benchmark_items(path: str) -> dict:
+    """
+    Measures the time to create an item for every order of a file,
+    first with factories that cache nothing, then with fresh factories
+    and their default cache. Only the item creation is timed.
+    :param path: a str
+    :return: a dictionary of results
+    """
+    store = Store()
+    results = {}
+    for label, cache_size in (('uncached', 0), ('cached', None)):
+        factories = {}
+        seconds = 0
+        items = 0
+        clock = time.perf_counter
+        for order in read_orders(path):
+            factory_class = type(order.factory)
+            if factory_class not in factories:
+                factories[factory_class] = factory_class() \
+                    if cache_size is None else factory_class(cache_size)
+            order.factory = factories[factory_class]
+            start = clock()
+            try:
+                store.create_item(order)
+                items += 1
+            except Exception:
+                pass
+            seconds += clock() - start
+        results[f'{label}_seconds'] = seconds
+        results[f'{label}_items'] = items
+        results[f'{label}_hits'] = sum(factory.hits
+                                       for factory in factories.values())
+    results['seconds'] = results['cached_seconds']
+    results['orders'] = results['cached_items']
+    return results
+
+
+def benchmark_store(path: str) -> dict:
+    """
+    Measures the time Store.process_order takes for every order of a
+    file. Only the processing is timed, not the reading.
+    :param path: a str
+    :return: a dictionary of results
+    """
+    store = Store()
+    seconds = 0
+    orders = 0
+    clock = time.perf_counter
+    with open(os.devnull, mode='w') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            for order in read_orders(path):
+                start = clock()
+                store.process_order(order)
+                seconds += clock() - start
+                orders += 1
+    return {'orders': orders, 'seconds': seconds,
+            'products': sum(len(store.get_products_by_status(status))
+                            for status in STOCK_STATUSES)}
+
+
+BENCHMARKS = {
+    'read': benchmark_read,
+    'items': benchmark_items,
+    'store': benchmark_store,
+}
+"""
+A dictionary that maps a suite name to its benchmark function.
+"""
+
+
+def run_suite(suite: str, path: str) -> dict:
+    """
+    Runs a suite on an order file and adds the peak RSS of the process.
+    :param suite: a str, a suite name
+    :param path: a str, the order file
+    :return: a dictionary of results
+    """
+    results = BENCHMARKS[suite](path)
+    results['peak_rss_bytes'] = get_peak_rss()
+    return results
+
+
+def get_order_file(directory: str, size: int, file_format: str,
+                   seed: int) -> str:
+    """
+    Returns the path to a synthetic order file, generating it unless a
+    previous run already did.
+    :param directory: a str, the directory of the order files
+    :param size: an int, the number of rows
+    :param file_format: a str, 'csv' or 'xlsx'
+    :param seed: an int, the random seed
+    :return: a str
+    """
+    path = os.path.join(directory, f'orders_{size}_{seed}.{file_format}')
+    if not os.path.exists(path):
+        print(f'Generating {path}...', file=sys.stderr)
+        OrderFileGenerator(seed).write(path, size)
+    return path
+
+
+def run(suites, sizes, formats, seed: int, directory: str) -> dict:
+    """
+    Runs the given suites for every size and format and returns the
+    results with details of the environment they ran in.
+    :param suites: an iterable of suite names
+    :param sizes: an iterable of int, the numbers of rows
+    :param formats: an iterable of str, the file formats
+    :param seed: an int, the random seed
+    :param directory: a str, the directory of the order files
+    :return: a dictionary
+    """
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        for file_format in formats:
+            path = get_order_file(directory, size, file_format, seed)
+            for suite in suites:
+                print(f'Running {suite} on {size} {file_format} rows...',
+                      file=sys.stderr)
+                with context.Pool(1) as pool:
+                    result = pool.apply(run_suite, (suite, path))
+                results.append({
+                    'suite': suite,
+                    'format': file_format,
+                    'rows': size,
+                    'rows_per_second': size / result['seconds']
+                    if result['seconds'] else None,
+                    **result,
+                })
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': results,
+    }
+
+
+def main():
+    """
+    Parses the command line arguments, runs the benchmarks and writes
+    their results as JSON.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the supply chain.')
+    parser.add_argument('--suites', nargs='+', choices=SUITES,
+                        default=list(SUITES))
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 100000],
+                        help='numbers of rows, up to millions')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS,
+                        default=list(FORMATS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--directory', help='where order files are '
+                                            'generated, defaults to a '
+                                            'temporary directory')
+    parser.add_argument('--output', help='path to a JSON file, defaults '
+                                         'to the standard output')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = args.directory or temporary_directory
+        os.makedirs(directory, exist_ok=True)
+        report = run(args.suites, args.sizes, args.formats, args.seed,
+                     directory)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, mode='w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,334 @@
+"""
+This module houses the events a Store logs, StockEvent, OrderEvent and
+FailureEvent, and the EventLog that buffers them and writes them to
+disk as JSON lines.
+"""
+import glob
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import Generator, TextIO
+
+
+class EventType(Enum):
+    """
+    The type of an event.
+    """
+    STOCK = "stock"
+    ORDER = "order"
+    FAILURE = "failure"
+
+
+class Event(ABC):
+    """
+    An interface for an event of the store. Its text is the line it has
+    in the Daily Transaction Report.
+    """
+
+    event_type = None
+
+    def __init__(self, timestamp: datetime = None):
+        """
+        Initializes an Event.
+        :param timestamp: a datetime, defaults to now
+        """
+        self.timestamp = timestamp if timestamp is not None \
+            else datetime.now()
+
+    @abstractmethod
+    def get_fields(self) -> dict:
+        """
+        Returns the fields of this event other than its type and
+        timestamp.
+        :return: a dictionary
+        """
+        pass
+
+    def to_dict(self) -> dict:
+        """
+        Returns this event as a dictionary of plain values.
+        :return: a dictionary
+        """
+        return {
+            'type': self.event_type.value,
+            'timestamp': self.timestamp.isoformat(),
+            **self.get_fields(),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'Event':
+        """
+        Creates an event from a dictionary returned by to_dict.
+        :param data: a dictionary
+        :return: an Event
+        """
+        data = dict(data)
+        event_class = EVENT_CLASSES[EventType(data.pop('type'))]
+        timestamp = datetime.fromisoformat(data.pop('timestamp'))
+        return event_class(timestamp=timestamp, **data)
+
+
+class StockEvent(Event):
+    """
+    Represents units of a product added to the inventory.
+    """
+
+    event_type = EventType.STOCK
+
+    def __init__(self, product_id: str, name: str, quantity: int,
+                 **kwargs):
+        """
+        Initializes a StockEvent.
+        :param product_id: a str
+        :param name: a str
+        :param quantity: an int, the number of units stocked
+        :param kwargs: Any additional keyword attributes for the base
+                       class.
+        """
+        super().__init__(**kwargs)
+        self.product_id = product_id
+        self.name = name
+        self.quantity = quantity
+
+    def get_fields(self) -> dict:
+        return {'product_id': self.product_id, 'name': self.name,
+                'quantity': self.quantity}
+
+    def __str__(self):
+        return f'Stock, Product ID {self.product_id}, ' \
+               f'Name "{self.name}", ' \
+               f'Quantity {self.quantity}'
+
+
+class OrderEvent(Event):
+    """
+    Represents an order fulfilled from the inventory.
+    """
+
+    event_type = EventType.ORDER
+
+    def __init__(self, order_number: int, item_type: str, product_id: str,
+                 name: str, quantity: int, **kwargs):
+        """
+        Initializes an OrderEvent.
+        :param order_number: an int
+        :param item_type: a str, the value of an ItemType
+        :param product_id: a str
+        :param name: a str
+        :param quantity: an int
+        :param kwargs: Any additional keyword attributes for the base
+                       class.
+        """
+        super().__init__(**kwargs)
+        self.order_number = order_number
+        self.item_type = item_type
+        self.product_id = product_id
+        self.name = name
+        self.quantity = quantity
+
+    def get_fields(self) -> dict:
+        return {'order_number': self.order_number,
+                'item_type': self.item_type,
+                'product_id': self.product_id, 'name': self.name,
+                'quantity': self.quantity}
+
+    def __str__(self):
+        return f'Order {self.order_number}, ' \
+               f'Item {self.item_type}, ' \
+               f'Product ID {self.product_id}, ' \
+               f'Name "{self.name}", ' \
+               f'Quantity {self.quantity}'
+
+
+class FailureEvent(Event):
+    """
+    Represents an order that could not be processed.
+    """
+
+    event_type = EventType.FAILURE
+
+    def __init__(self, order_number: int, error: str, **kwargs):
+        """
+        Initializes a FailureEvent.
+        :param order_number: an int
+        :param error: a str, the error message
+        :param kwargs: Any additional keyword attributes for the base
+                       class.
+        """
+        super().__init__(**kwargs)
+        self.order_number = order_number
+        self.error = error
+
+    def get_fields(self) -> dict:
+        return {'order_number': self.order_number, 'error': self.error}
+
+    def __str__(self):
+        return f'Order {self.order_number}, ' \
+               f'Could not process order data was ' \
+               f'corrupted, InvalidDataError - {self.error}'
+
+
+EVENT_CLASSES = {
+    EventType.STOCK: StockEvent,
+    EventType.ORDER: OrderEvent,
+    EventType.FAILURE: FailureEvent,
+}
+"""
+A dictionary that maps an EventType enum to its Event class.
+"""
+
+
+class EventLog:
+    """
+    The EventLog keeps the events of a store. Events are buffered and
+    written to disk as JSON lines every `buffer_size` events, to a file
+    per day named events_YYYYMMDD_NNN.jsonl. A new file is started when
+    the day changes or the current file reaches `max_bytes`, and a log
+    reopened the same day appends to that day's last file, so the events
+    written before a crash are still reported.
+
+    Without a directory, the events are only kept in memory.
+    """
+
+    def __init__(self, directory: str = None, buffer_size: int = 100,
+                 max_bytes: int = 10 * 1024 * 1024):
+        """
+        Initializes an EventLog.
+        :param directory: a str, the directory of the log files, or None
+                          to keep the events in memory
+        :param buffer_size: an int, the number of events written at a
+                            time
+        :param max_bytes: an int, the size after which a new file is
+                          started
+        """
+        self.directory = directory
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self._buffer = []
+        self._file = None
+        self._day = None
+        self._index = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, event: Event) -> None:
+        """
+        Adds an event to the log.
+        :param event: an Event
+        :return: None
+        """
+        self._buffer.append(event)
+        if self.directory is not None \
+                and len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def drain(self) -> list:
+        """
+        Removes and returns the events not written to disk yet.
+        :return: a list of Event
+        """
+        events = self._buffer
+        self._buffer = []
+        return events
+
+    def flush(self) -> None:
+        """
+        Writes the buffered events to disk.
+        :return: None
+        """
+        if self.directory is None:
+            return
+        for event in self.drain():
+            day = event.timestamp.strftime('%Y%m%d')
+            if day != self._day:
+                self._open(day)
+            self._file.write(f'{json.dumps(event.to_dict())}\n')
+            if self._file.tell() >= self.max_bytes:
+                self._open(day, self._index + 1)
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """
+        Writes the buffered events and closes the current file.
+        :return: None
+        """
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._day = None
+
+    def _get_paths(self, day: str) -> list:
+        """
+        Returns the files of a day, in the order they were written.
+        :param day: a str, formatted as YYYYMMDD
+        :return: a list of str
+        """
+        paths = glob.glob(os.path.join(self.directory,
+                                       f'events_{day}_*.jsonl'))
+        return sorted((path for path in paths
+                       if self._get_index(path) is not None),
+                      key=self._get_index)
+
+    @staticmethod
+    def _get_index(path: str):
+        """
+        Returns the number of a file in its day, parsed from its name.
+        :param path: a str, the path to an events_YYYYMMDD_N.jsonl file
+        :return: an int, or None if the name has no number
+        """
+        index = os.path.basename(path).rsplit('.', 1)[0].rsplit('_', 1)[-1]
+        return int(index) if index.isdigit() else None
+
+    def _open(self, day: str, index: int = None) -> None:
+        """
+        Opens the file events are appended to. By default, it is the
+        last file of the day.
+        :param day: a str, formatted as YYYYMMDD
+        :param index: an int, the number of the file in the day
+        :return: None
+        """
+        if self._file is not None:
+            self._file.close()
+        if index is None:
+            paths = self._get_paths(day)
+            index = max(map(self._get_index, paths), default=0)
+        self._day = day
+        self._index = index
+        self._file = open(os.path.join(
+            self.directory, f'events_{day}_{index:03d}.jsonl'), mode='a')
+
+    def read(self, day: datetime = None) -> Generator[Event, None, None]:
+        """
+        Yields the events of a day one at a time: those on disk, then
+        those still buffered.
+        :param day: a datetime, defaults to today; it is ignored for a
+                    log kept in memory
+        :return: a generator that yields Event
+        """
+        if self.directory is None:
+            yield from self._buffer
+            return
+        day = (day or datetime.now()).strftime('%Y%m%d')
+        if self._file is not None:
+            self._file.flush()
+        for path in self._get_paths(day):
+            with open(path) as file:
+                for line in file:
+                    yield Event.from_dict(json.loads(line))
+        for event in self._buffer:
+            if event.timestamp.strftime('%Y%m%d') == day:
+                yield event
+
+    def render(self, stream: TextIO, day: datetime = None) -> None:
+        """
+        Writes the events of a day to a text stream, one per line.
+        :param stream: a text stream to write to
+        :param day: a datetime, defaults to today
+        :return: None
+        """
+        for event in self.read(day):
+            stream.write(f'{event}\n')
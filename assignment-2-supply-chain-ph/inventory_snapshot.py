@@ -0,0 +1,80 @@
+"""
+This module houses the InventorySnapshot class that saves the inventory
+of a Store to an SQLite database and loads it back on restart.
+"""
+import pickle
+import sqlite3
+from datetime import datetime
+
+
+class InventorySnapshot:
+    """
+    Saves and loads the inventory of a store: the number of units of
+    each product and its sample product. A snapshot replaces the
+    previous one in a single transaction, so a crash while saving leaves
+    the previous snapshot intact. The order history does not need to be
+    saved, as the EventLog keeps it on disk.
+
+    - Attributes:
+        - path: str, the path to the database
+        - interval: int, the number of processed orders between two
+          snapshots
+    """
+
+    def __init__(self, path: str, interval: int = 1000):
+        """
+        Initializes an InventorySnapshot, creating its database if needed.
+        :param path: a str, the path to the database
+        :param interval: an int, the number of processed orders between
+                         two snapshots
+        """
+        self.path = path
+        self.interval = interval
+        with sqlite3.connect(self.path) as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS inventory ('
+                               'position INTEGER PRIMARY KEY, '
+                               'product_id TEXT NOT NULL UNIQUE, '
+                               'quantity INTEGER NOT NULL, '
+                               'sample BLOB NOT NULL)')
+            connection.execute('CREATE TABLE IF NOT EXISTS snapshot ('
+                               'saved_at TEXT NOT NULL)')
+        connection.close()
+
+    def save(self, inventory: dict, sample_products: dict) -> None:
+        """
+        Replaces the snapshot with the given inventory.
+        :param inventory: a dictionary that maps a product_id to its
+                          number of units
+        :param sample_products: a dictionary that maps a product_id to
+                                its sample Item
+        :return: None
+        """
+        rows = [(position, product_id, quantity,
+                 pickle.dumps(sample_products[product_id]))
+                for position, (product_id, quantity)
+                in enumerate(inventory.items())]
+        with sqlite3.connect(self.path) as connection:
+            connection.execute('DELETE FROM inventory')
+            connection.executemany('INSERT INTO inventory '
+                                   'VALUES (?, ?, ?, ?)', rows)
+            connection.execute('DELETE FROM snapshot')
+            connection.execute('INSERT INTO snapshot VALUES (?)',
+                               (datetime.now().isoformat(),))
+        connection.close()
+
+    def load(self) -> tuple:
+        """
+        Loads the inventory of the snapshot.
+        :return: a tuple of two dictionaries, the inventory and the
+                 sample products, both empty if no snapshot was saved
+        """
+        inventory = {}
+        sample_products = {}
+        with sqlite3.connect(self.path) as connection:
+            rows = connection.execute('SELECT product_id, quantity, sample '
+                                      'FROM inventory ORDER BY position')
+            for product_id, quantity, sample in rows:
+                inventory[product_id] = quantity
+                sample_products[product_id] = pickle.loads(sample)
+        connection.close()
+        return inventory, sample_products
@@ -1,8 +1,10 @@
 """
 Contains the Factory Classes related to the Item class.
 """
+import copy
 from abc import ABC, abstractmethod
-from items import Toy, StuffedAnimal, Candy
+from collections import OrderedDict
+from items import Item, ItemType, Toy, StuffedAnimal, Candy
 from items import SantaWorkshop, CandyCanes, Reindeer
 from items import RCSpider, PumpkinCaramelToffee, DancingSkeleton
 from items import RobotBunny, CremeEggs, EasterBunny
@@ -12,8 +14,68 @@ class ItemFactory(ABC):
     """
     An abstract base class that is responsible for creating Item
     instances.
+
+    Validated items are kept as prototypes in a least recently used
+    cache, keyed by their class and product details. Creating an item
+    with the same details again returns a shallow copy of its prototype
+    instead of validating them again. Details that fail validation are
+    not cached.
     """
 
+    item_classes = {}
+    """
+    A dictionary that maps an ItemType enum to the Item class the
+    factory creates for it.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        """
+        Initializes an ItemFactory.
+        :param cache_size: an int, the most prototypes kept
+        """
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._prototypes = OrderedDict()
+
+    @staticmethod
+    def _get_key(item_class: type, product_details: dict) -> tuple:
+        """
+        Returns the cache key of an item. Missing values are all NaN,
+        but not always the same NaN object, so they are keyed as None.
+        :param item_class: an Item class
+        :param product_details: a dictionary/pandas series of details
+        :return: a tuple
+        """
+        return item_class, tuple(sorted(
+            (name, None if value != value else value)
+            for name, value in product_details.items()))
+
+    def _create(self, item_class: type, product_details: dict) -> Item:
+        """
+        Creates an item, cloning its prototype if it was created before.
+        :param item_class: an Item class
+        :param product_details: a dictionary/pandas series of details
+        :return: an Item
+        """
+        try:
+            key = self._get_key(item_class, product_details)
+            prototype = self._prototypes.get(key)
+        except TypeError:
+            # Unhashable details are never cached
+            self.misses += 1
+            return item_class(**product_details)
+        if prototype is not None:
+            self.hits += 1
+            self._prototypes.move_to_end(key)
+            return copy.copy(prototype)
+        self.misses += 1
+        prototype = item_class(**product_details)
+        self._prototypes[key] = prototype
+        if len(self._prototypes) > self.cache_size:
+            self._prototypes.popitem(last=False)
+        return copy.copy(prototype)
+
     @abstractmethod
     def create_toy(self, product_details: dict) -> Toy:
         """
@@ -47,13 +109,19 @@ class ChristmasFactory(ItemFactory):
     This class is responsible for creating Christmas Item instances.
     """
 
+    item_classes = {
+        ItemType.TOY: SantaWorkshop,
+        ItemType.STUFFED_ANIMAL: Reindeer,
+        ItemType.CANDY: CandyCanes,
+    }
+
     def create_toy(self, product_details: dict) -> Toy:
         """
         Creates a SantaWorkshop Toy.
         :param product_details: a dictionary/pandas series of details
         :return: a Toy
         """
-        return SantaWorkshop(**product_details)
+        return self._create(SantaWorkshop, product_details)
 
     def create_candy(self, product_details: dict) -> Candy:
         """
@@ -61,7 +129,7 @@ class ChristmasFactory(ItemFactory):
         :param product_details: a dictionary/pandas series of details
         :return: a Candy
         """
-        return CandyCanes(**product_details)
+        return self._create(CandyCanes, product_details)
 
     def create_stuffed_animal(self, product_details: dict) -> StuffedAnimal:
         """
@@ -69,7 +137,7 @@ class ChristmasFactory(ItemFactory):
         :param product_details: a dictionary/pandas series of details
         :return: a StuffedAnimal
         """
-        return Reindeer(**product_details)
+        return self._create(Reindeer, product_details)
 
 
 class HalloweenFactory(ItemFactory):
@@ -77,13 +145,19 @@ class HalloweenFactory(ItemFactory):
     This class is responsible for creating Halloween Item instances.
     """
 
+    item_classes = {
+        ItemType.TOY: RCSpider,
+        ItemType.STUFFED_ANIMAL: DancingSkeleton,
+        ItemType.CANDY: PumpkinCaramelToffee,
+    }
+
     def create_toy(self, product_details: dict) -> Toy:
         """
         Creates a RCSpider Toy.
         :param product_details: a dictionary/pandas series of details
         :return: a Toy
         """
-        return RCSpider(**product_details)
+        return self._create(RCSpider, product_details)
 
     def create_candy(self, product_details: dict) -> Candy:
         """
@@ -91,7 +165,7 @@ class HalloweenFactory(ItemFactory):
         :param product_details: a dictionary/pandas series of details
         :return: a Candy
         """
-        return PumpkinCaramelToffee(**product_details)
+        return self._create(PumpkinCaramelToffee, product_details)
 
     def create_stuffed_animal(self, product_details: dict) -> StuffedAnimal:
         """
@@ -99,7 +173,7 @@ class HalloweenFactory(ItemFactory):
         :param product_details: a dictionary/pandas series of details
         :return: a StuffedAnimal
         """
-        return DancingSkeleton(**product_details)
+        return self._create(DancingSkeleton, product_details)
 
 
 class EasterFactory(ItemFactory):
@@ -107,13 +181,19 @@ class EasterFactory(ItemFactory):
     This class is responsible for creating Easter Item instances.
     """
 
+    item_classes = {
+        ItemType.TOY: RobotBunny,
+        ItemType.STUFFED_ANIMAL: EasterBunny,
+        ItemType.CANDY: CremeEggs,
+    }
+
     def create_toy(self, product_details: dict) -> Toy:
         """
         Creates a RobotBunny Toy.
         :param product_details: a dictionary/pandas series of details
         :return: a Toy
         """
-        return RobotBunny(**product_details)
+        return self._create(RobotBunny, product_details)
 
     def create_candy(self, product_details: dict) -> Candy:
         """
@@ -121,7 +201,7 @@ class EasterFactory(ItemFactory):
         :param product_details: a dictionary/pandas series of details
         :return: a Candy
         """
-        return CremeEggs(**product_details)
+        return self._create(CremeEggs, product_details)
 
     def create_stuffed_animal(self, product_details: dict) -> StuffedAnimal:
         """
@@ -129,4 +209,4 @@ class EasterFactory(ItemFactory):
         :param product_details: a dictionary/pandas series of details
         :return: a StuffedAnimal
         """
-        return EasterBunny(**product_details)
+        return self._create(EasterBunny, product_details)
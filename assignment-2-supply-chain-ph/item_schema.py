@@ -0,0 +1,242 @@
+"""
+Contains the ItemSchema class and the rules it is made of. A schema
+declares the checks of an Item class once, with its regular expressions
+and enum tables compiled up front, and runs them either on the values
+of one item or column-wise on a whole DataFrame of product details.
+"""
+import re
+import pandas
+from enum import Enum
+
+
+class Rule:
+    """
+    A check of one field. A rule converts a valid value, e.g. to an int
+    or an enum, and raises the same error as the Item constructors for
+    an invalid one.
+    """
+
+    def __init__(self, field: str):
+        """
+        Initializes a Rule.
+        :param field: a str, the name of the field checked
+        """
+        self.field = field
+
+    def convert(self, value):
+        """
+        Checks a value and returns it converted.
+        :param value: the value of the field
+        :return: the converted value
+        """
+        return value
+
+    def get_errors(self, column: pandas.Series) -> pandas.Series:
+        """
+        Checks a whole column. Each distinct value is only checked once.
+        :param column: a pandas.Series, the values of the field
+        :return: a pandas.Series of str, the error message of each row,
+                 or '' if the value is valid
+        """
+        messages = {}
+        for value in column.unique():
+            try:
+                self.convert(value)
+            except Exception as e:
+                messages[value] = str(e)
+        if not messages:
+            return pandas.Series('', index=column.index, dtype=object)
+        return column.map(messages).fillna('').astype(object)
+
+
+class StrRule(Rule):
+    """
+    Checks that a field is a non-empty str.
+    """
+
+    def convert(self, value) -> str:
+        if not isinstance(value, str):
+            raise TypeError(f'{self.field} must be a str')
+        if len(value) == 0:
+            raise ValueError(f'{self.field} must not be empty')
+        return value
+
+
+class IntRule(Rule):
+    """
+    Converts a field to an int and checks that it is greater than (or
+    equal to) a minimum.
+    """
+
+    def __init__(self, field: str, minimum: int, inclusive: bool = False):
+        """
+        Initializes an IntRule.
+        :param field: a str
+        :param minimum: an int
+        :param inclusive: a bool, whether the minimum itself is valid
+        """
+        super().__init__(field)
+        self.minimum = minimum
+        self.inclusive = inclusive
+
+    def convert(self, value) -> int:
+        number = int(value)
+        if self.inclusive and number < self.minimum:
+            raise ValueError(f'{self.field} must be >= {self.minimum}')
+        if not self.inclusive and number <= self.minimum:
+            raise ValueError(f'{self.field} must be > {self.minimum}')
+        return number
+
+
+class EnumRule(Rule):
+    """
+    Converts a field to a member of an enum through a table of its
+    values.
+    """
+
+    def __init__(self, field: str, enum: type):
+        """
+        Initializes an EnumRule.
+        :param field: a str
+        :param enum: an Enum class
+        """
+        super().__init__(field)
+        self.enum = enum
+        self.table = {member.value: member for member in enum}
+
+    def convert(self, value) -> Enum:
+        try:
+            return self.table[value]
+        except (KeyError, TypeError):
+            # Let the enum raise, so the message is the usual one
+            return self.enum(value)
+
+    def get_errors(self, column: pandas.Series) -> pandas.Series:
+        valid = column.isin(self.table)
+        if valid.all():
+            return pandas.Series('', index=column.index, dtype=object)
+        errors = super().get_errors(column[~valid])
+        return errors.reindex(column.index, fill_value='')
+
+
+class ChoiceRule(Rule):
+    """
+    Checks that a field has one given value.
+    """
+
+    def __init__(self, field: str, value, message: str):
+        """
+        Initializes a ChoiceRule.
+        :param field: a str
+        :param value: the only valid value
+        :param message: a str, the error message
+        """
+        super().__init__(field)
+        self.value = value
+        self.message = message
+
+    def convert(self, value):
+        if value != self.value:
+            raise ValueError(self.message)
+        return value
+
+    def get_errors(self, column: pandas.Series) -> pandas.Series:
+        valid = column == self.value
+        return pandas.Series(self.message, index=column.index,
+                             dtype=object).where(~valid, '')
+
+
+class PatternRule(Rule):
+    """
+    Checks that a field matches a regular expression, compiled once.
+    """
+
+    def __init__(self, field: str, pattern: str, message: str):
+        """
+        Initializes a PatternRule.
+        :param field: a str
+        :param pattern: a str, the regular expression
+        :param message: a str, the error message
+        """
+        super().__init__(field)
+        self.pattern = re.compile(pattern)
+        self.message = message
+
+    def convert(self, value) -> str:
+        if not self.pattern.search(value):
+            raise ValueError(self.message)
+        return value
+
+
+class ItemSchema:
+    """
+    The checks of an Item class, as a list of Rule run in order. Each
+    class in an Item hierarchy has a schema for the fields it adds, and
+    the rules of a whole hierarchy run in the order its constructors
+    run, parents first.
+    """
+
+    def __init__(self, rules: list):
+        """
+        Initializes an ItemSchema.
+        :param rules: a list of Rule
+        """
+        self.rules = rules
+
+    def validate(self, values: dict) -> dict:
+        """
+        Checks the values of one item, raising the error of the first
+        failing rule.
+        :param values: a dictionary of the fields of the item
+        :return: a dictionary of the converted fields of this schema
+        """
+        return {rule.field: rule.convert(values[rule.field])
+                for rule in self.rules}
+
+    @staticmethod
+    def get_schemas(item_class: type) -> list:
+        """
+        Returns the schemas of an Item class and of its parents, in the
+        order they run.
+        :param item_class: an Item class
+        :return: a list of ItemSchema
+        """
+        return [klass.__dict__['schema']
+                for klass in reversed(item_class.__mro__)
+                if isinstance(klass.__dict__.get('schema'), ItemSchema)]
+
+    @staticmethod
+    def get_fields(item_class: type) -> list:
+        """
+        Returns the fields an Item class is created from, in the order
+        they are checked.
+        :param item_class: an Item class
+        :return: a list of str
+        """
+        fields = {}
+        for schema in ItemSchema.get_schemas(item_class):
+            for rule in schema.rules:
+                fields[rule.field] = None
+        return list(fields)
+
+    @staticmethod
+    def validate_frame(item_class: type,
+                       df: pandas.DataFrame) -> pandas.Series:
+        """
+        Checks the product details of many items of an Item class at
+        once, column by column. Each row gets the message of the error
+        its constructor would raise first.
+        :param item_class: an Item class
+        :param df: a pandas.DataFrame with a column per field
+        :return: a pandas.Series of str, the error message of each row,
+                 or '' if the row is valid
+        """
+        errors = pandas.Series('', index=df.index, dtype=object)
+        for schema in ItemSchema.get_schemas(item_class):
+            for rule in schema.rules:
+                pending = errors == ''
+                if not pending.any():
+                    return errors
+                column = df.loc[pending, rule.field]
+                errors[pending] = rule.get_errors(column)
+        return errors
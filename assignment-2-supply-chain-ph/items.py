@@ -4,7 +4,9 @@ Contains the item class and its related subclasses.
 
 from abc import ABC
 from enum import Enum
-import re
+import pandas
+from item_schema import ItemSchema
+from item_schema import StrRule, IntRule, EnumRule, ChoiceRule, PatternRule
 
 
 class ItemType(Enum):
@@ -19,8 +21,17 @@ class ItemType(Enum):
 class Item(ABC):
     """
     An interface for an item.
+
+    Each class of item declares its checks in a `schema`, an ItemSchema
+    of the fields it adds, compiled once when the class is defined.
     """
 
+    schema = ItemSchema([
+        StrRule('product_id'),
+        StrRule('name'),
+        StrRule('description'),
+    ])
+
     def __init__(self, product_id: str, name: str, description: str, **kwargs):
         """
         Initializes an Item.
@@ -28,22 +39,24 @@ class Item(ABC):
         :param name: a str
         :param description: a str
         """
-        if not isinstance(product_id, str):
-            raise TypeError('product_id must be a str')
-        if len(product_id) == 0:
-            raise ValueError(f'product_id must not be empty')
-        if not isinstance(name, str):
-            raise TypeError('name must be a str')
-        if len(name) == 0:
-            raise ValueError(f'name must not be empty')
-        if not isinstance(description, str):
-            raise TypeError('description must be a str')
-        if len(description) == 0:
-            raise ValueError(f'description must not be empty')
+        Item.schema.validate({'product_id': product_id, 'name': name,
+                              'description': description})
         self.product_id = product_id
         self.name = name
         self.description = description
 
+    @classmethod
+    def validate_frame(cls, df: pandas.DataFrame) -> pandas.Series:
+        """
+        Checks the product details of many items of this class at once,
+        column by column, without creating them.
+        :param df: a pandas.DataFrame with a column per field
+        :return: a pandas.Series of str, the message of the error the
+                 constructor would raise for each row, or '' if the row
+                 is valid
+        """
+        return ItemSchema.validate_frame(cls, df)
+
 
 class BooleanType(Enum):
     """
@@ -58,6 +71,11 @@ class Toy(Item, ABC):
     Represents a Toy Item.
     """
 
+    schema = ItemSchema([
+        IntRule('min_age', 0, inclusive=True),
+        EnumRule('has_batteries', BooleanType),
+    ])
+
     def __init__(self, has_batteries: str, min_age: int, **kwargs):
         """
         Initializes a Toy.
@@ -68,10 +86,10 @@ class Toy(Item, ABC):
                        and 'product_id'.
         """
         super().__init__(**kwargs)
-        if int(min_age) < 0:
-            raise ValueError(f'min_age must be >= 0')
-        self.has_batteries = BooleanType(has_batteries) == BooleanType.TRUE
-        self.min_age = int(min_age)
+        values = Toy.schema.validate({'has_batteries': has_batteries,
+                                      'min_age': min_age})
+        self.has_batteries = values['has_batteries'] == BooleanType.TRUE
+        self.min_age = values['min_age']
 
 
 class SantaWorkshop(Toy):
@@ -79,6 +97,17 @@ class SantaWorkshop(Toy):
     A concrete Toy class that represents a Santa Workshop.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^C[0-9]{4}T$',
+                    "product_id must follow the format C####T "
+                    "where # is a number"),
+        ChoiceRule('has_batteries', BooleanType.FALSE.value,
+                   'has_batteries must be False'),
+        PatternRule('dimensions', '^[0-9]+,[0-9]+$',
+                    'dimensions must follow the format width,height'),
+        IntRule('num_rooms', 0),
+    ])
+
     def __init__(self, dimensions: str, num_rooms: int, **kwargs):
         """
         Initializes a SantaWorkshop.
@@ -89,17 +118,10 @@ class SantaWorkshop(Toy):
                        'description', and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^C[0-9]{4}T$', self.product_id):
-            raise ValueError("product_id must follow the format C####T "
-                             "where # is a number")
-        if self.has_batteries:
-            raise ValueError(f'has_batteries must be False')
-        if not re.search('^[0-9]+,[0-9]+$', dimensions):
-            raise ValueError("dimensions must follow the format width,height")
-        if int(num_rooms) <= 0:
-            raise ValueError(f'num_rooms must be > 0')
+        values = SantaWorkshop.schema.validate(
+            {**kwargs, 'dimensions': dimensions, 'num_rooms': num_rooms})
         self.dimensions = dimensions
-        self.num_rooms = int(num_rooms)
+        self.num_rooms = values['num_rooms']
 
 
 class SpiderType(Enum):
@@ -115,6 +137,18 @@ class RCSpider(Toy):
     A concrete Toy Class that represents a remote controlled spider.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^H[0-9]{4}T$',
+                    "product_id must follow the format H####T "
+                    "where # is a number"),
+        ChoiceRule('has_batteries', BooleanType.TRUE.value,
+                   'has_batteries must be True'),
+        IntRule('speed', 0),
+        IntRule('jump_height', 0),
+        EnumRule('has_glow', BooleanType),
+        EnumRule('spider_type', SpiderType),
+    ])
+
     def __init__(self, speed: int, jump_height: int, has_glow: str,
                  spider_type: str, **kwargs):
         """
@@ -129,19 +163,13 @@ class RCSpider(Toy):
                        'description', and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^H[0-9]{4}T$', self.product_id):
-            raise ValueError("product_id must follow the format H####T "
-                             "where # is a number")
-        if not self.has_batteries:
-            raise ValueError(f'has_batteries must be True')
-        if int(speed) <= 0:
-            raise ValueError(f'speed must be > 0')
-        if int(jump_height) <= 0:
-            raise ValueError(f'jump_height must be > 0')
-        self.speed = int(speed)
-        self.jump_height = int(jump_height)
-        self.has_glow = BooleanType(has_glow) == BooleanType.TRUE
-        self.spider_type = SpiderType(spider_type)
+        values = RCSpider.schema.validate(
+            {**kwargs, 'speed': speed, 'jump_height': jump_height,
+             'has_glow': has_glow, 'spider_type': spider_type})
+        self.speed = values['speed']
+        self.jump_height = values['jump_height']
+        self.has_glow = values['has_glow'] == BooleanType.TRUE
+        self.spider_type = values['spider_type']
 
 
 class RobotBunnyColour(Enum):
@@ -158,6 +186,16 @@ class RobotBunny(Toy):
     A concrete Toy class that represents a Robot Bunny.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^E[0-9]{4}T$',
+                    "product_id must follow the format E####T "
+                    "where # is a number"),
+        ChoiceRule('has_batteries', BooleanType.TRUE.value,
+                   'has_batteries must be True'),
+        IntRule('num_sound', 0),
+        EnumRule('colour', RobotBunnyColour),
+    ])
+
     def __init__(self, num_sound: int, colour: str, **kwargs):
         """
         Initializes a RobotBunny.
@@ -168,15 +206,10 @@ class RobotBunny(Toy):
                        'description', and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^E[0-9]{4}T$', self.product_id):
-            raise ValueError("product_id must follow the format E####T "
-                             "where # is a number")
-        if not self.has_batteries:
-            raise ValueError(f'has_batteries must be True')
-        if int(num_sound) <= 0:
-            raise ValueError(f'num_sound must be > 0')
-        self.num_sound = int(num_sound)
-        self.colour = RobotBunnyColour(colour)
+        values = RobotBunny.schema.validate(
+            {**kwargs, 'num_sound': num_sound, 'colour': colour})
+        self.num_sound = values['num_sound']
+        self.colour = values['colour']
 
 
 class Stuffing(Enum):
@@ -210,6 +243,12 @@ class StuffedAnimal(Item, ABC):
     Represents a Stuffed Animal Item.
     """
 
+    schema = ItemSchema([
+        EnumRule('stuffing', Stuffing),
+        EnumRule('size', Size),
+        EnumRule('fabric', Fabric),
+    ])
+
     def __init__(self, stuffing: str, fabric: str, size: str, **kwargs):
         """
         Initializes a StuffedAnimal.
@@ -223,9 +262,11 @@ class StuffedAnimal(Item, ABC):
                        and 'product_id'.
         """
         super().__init__(**kwargs)
-        self.stuffing = Stuffing(stuffing)
-        self.size = Size(size)
-        self.fabric = Fabric(fabric)
+        values = StuffedAnimal.schema.validate(
+            {'stuffing': stuffing, 'size': size, 'fabric': fabric})
+        self.stuffing = values['stuffing']
+        self.size = values['size']
+        self.fabric = values['fabric']
 
 
 class DancingSkeleton(StuffedAnimal):
@@ -233,6 +274,18 @@ class DancingSkeleton(StuffedAnimal):
     A concrete Stuffed Animal class that represents a Dancing Skeleton.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^H[0-9]{4}S$',
+                    "product_id must follow the format H####S "
+                    "where # is a number"),
+        ChoiceRule('stuffing', Stuffing.POLYESTER_FIBREFILL.value,
+                   f'stuffing must be "{Stuffing.POLYESTER_FIBREFILL.value}"'),
+        ChoiceRule('fabric', Fabric.ACRYLIC.value,
+                   f'fabric must be "{Fabric.ACRYLIC.value}"'),
+        ChoiceRule('has_glow', BooleanType.TRUE.value,
+                   f'has_glow must be "{BooleanType.TRUE.value}"'),
+    ])
+
     def __init__(self, has_glow: str, **kwargs):
         """
         Initializes a DancingSkeleton.
@@ -241,17 +294,9 @@ class DancingSkeleton(StuffedAnimal):
                        'description', and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^H[0-9]{4}S$', self.product_id):
-            raise ValueError("product_id must follow the format H####S "
-                             "where # is a number")
-        if self.stuffing != Stuffing.POLYESTER_FIBREFILL:
-            raise ValueError(f'stuffing must be '
-                             f'"{Stuffing.POLYESTER_FIBREFILL.value}"')
-        if self.fabric != Fabric.ACRYLIC:
-            raise ValueError(f'fabric must be "{Fabric.ACRYLIC.value}"')
-        if has_glow != BooleanType.TRUE.value:
-            raise ValueError(f'has_glow must be "{BooleanType.TRUE.value}"')
-        self.has_glow = BooleanType(has_glow) == BooleanType.TRUE
+        values = DancingSkeleton.schema.validate(
+            {**kwargs, 'has_glow': has_glow})
+        self.has_glow = values['has_glow'] == BooleanType.TRUE.value
 
 
 class Reindeer(StuffedAnimal):
@@ -259,6 +304,18 @@ class Reindeer(StuffedAnimal):
     A Concrete Stuffed Animal class that represents a Reindeer.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^C[0-9]{4}S$',
+                    "product_id must follow the format C####S "
+                    "where # is a number"),
+        ChoiceRule('stuffing', Stuffing.WOOL.value,
+                   f'stuffing must be "{Stuffing.WOOL.value}"'),
+        ChoiceRule('fabric', Fabric.COTTON.value,
+                   f'fabric must be "{Fabric.COTTON.value}"'),
+        ChoiceRule('has_glow', BooleanType.TRUE.value,
+                   f'has_glow must be "{BooleanType.TRUE.value}"'),
+    ])
+
     def __init__(self, has_glow: str, **kwargs):
         """
         Initializes a Reindeer.
@@ -267,16 +324,8 @@ class Reindeer(StuffedAnimal):
                        'description', and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^C[0-9]{4}S$', self.product_id):
-            raise ValueError("product_id must follow the format C####S "
-                             "where # is a number")
-        if self.stuffing != Stuffing.WOOL:
-            raise ValueError(f'stuffing must be "{Stuffing.WOOL.value}"')
-        if self.fabric != Fabric.COTTON:
-            raise ValueError(f'fabric must be "{Fabric.COTTON.value}"')
-        if has_glow != BooleanType.TRUE.value:
-            raise ValueError(f'has_glow must be "{BooleanType.TRUE.value}"')
-        self.has_glow = BooleanType(has_glow) == BooleanType.TRUE
+        values = Reindeer.schema.validate({**kwargs, 'has_glow': has_glow})
+        self.has_glow = values['has_glow'] == BooleanType.TRUE.value
 
 
 class EasterBunnyColour(Enum):
@@ -294,6 +343,17 @@ class EasterBunny(StuffedAnimal):
     A Concrete Stuffed Animal class that represents an Easter Bunny.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^E[0-9]{4}S$',
+                    "product_id must follow the format E####S "
+                    "where # is a number"),
+        ChoiceRule('stuffing', Stuffing.POLYESTER_FIBREFILL.value,
+                   f'stuffing must be "{Stuffing.POLYESTER_FIBREFILL.value}"'),
+        ChoiceRule('fabric', Fabric.LINEN.value,
+                   f'fabric must be "{Fabric.LINEN.value}"'),
+        EnumRule('colour', EasterBunnyColour),
+    ])
+
     def __init__(self, colour: str, **kwargs):
         """
         Initializes a Reindeer.
@@ -304,15 +364,8 @@ class EasterBunny(StuffedAnimal):
                        'description', and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^E[0-9]{4}S$', self.product_id):
-            raise ValueError("product_id must follow the format E####S "
-                             "where # is a number")
-        if self.stuffing != Stuffing.POLYESTER_FIBREFILL:
-            raise ValueError(f'stuffing must be '
-                             f'"{Stuffing.POLYESTER_FIBREFILL.value}"')
-        if self.fabric != Fabric.LINEN:
-            raise ValueError(f'fabric must be "{Fabric.LINEN.value}"')
-        self.colour = EasterBunnyColour(colour)
+        values = EasterBunny.schema.validate({**kwargs, 'colour': colour})
+        self.colour = values['colour']
 
 
 class Candy(Item, ABC):
@@ -320,6 +373,11 @@ class Candy(Item, ABC):
     Represents a Candy Item.
     """
 
+    schema = ItemSchema([
+        EnumRule('has_nuts', BooleanType),
+        EnumRule('has_lactose', BooleanType),
+    ])
+
     def __init__(self, has_nuts: str, has_lactose: str, **kwargs):
         """
         Initializes a Candy.
@@ -330,8 +388,10 @@ class Candy(Item, ABC):
                        and 'product_id'.
         """
         super().__init__(**kwargs)
-        self.has_nuts = BooleanType(has_nuts) == BooleanType.TRUE
-        self.has_lactose = BooleanType(has_lactose) == BooleanType.TRUE
+        values = Candy.schema.validate({'has_nuts': has_nuts,
+                                        'has_lactose': has_lactose})
+        self.has_nuts = values['has_nuts'] == BooleanType.TRUE
+        self.has_lactose = values['has_lactose'] == BooleanType.TRUE
 
 
 class ToffeeVariety(Enum):
@@ -344,6 +404,17 @@ class PumpkinCaramelToffee(Candy):
     A concrete Candy class that represents an Pumpkin Caramel Toffee.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^H[0-9]{4}C$',
+                    "product_id must follow the format H####C "
+                    "where # is a number"),
+        ChoiceRule('has_nuts', BooleanType.TRUE.value,
+                   'has_nuts must be True'),
+        ChoiceRule('has_lactose', BooleanType.TRUE.value,
+                   'has_lactose must be True'),
+        EnumRule('variety', ToffeeVariety),
+    ])
+
     def __init__(self, variety: str, **kwargs):
         """
         Initializes a PumpkinCaramelToffee.
@@ -353,14 +424,9 @@ class PumpkinCaramelToffee(Candy):
                        and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^H[0-9]{4}C$', self.product_id):
-            raise ValueError("product_id must follow the format H####C "
-                             "where # is a number")
-        if not self.has_nuts:
-            raise ValueError(f'has_nuts must be True')
-        if not self.has_lactose:
-            raise ValueError(f'has_lactose must be True')
-        self.variety = ToffeeVariety(variety)
+        values = PumpkinCaramelToffee.schema.validate(
+            {**kwargs, 'variety': variety})
+        self.variety = values['variety']
 
 
 class CandyCaneColour(Enum):
@@ -376,6 +442,17 @@ class CandyCanes(Candy):
     A Concrete Candy class that represents Candy Canes.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^C[0-9]{4}C$',
+                    "product_id must follow the format C####C "
+                    "where # is a number"),
+        ChoiceRule('has_nuts', BooleanType.FALSE.value,
+                   'has_nuts must be False'),
+        ChoiceRule('has_lactose', BooleanType.FALSE.value,
+                   'has_lactose must be False'),
+        EnumRule('colour', CandyCaneColour),
+    ])
+
     def __init__(self, colour: str, **kwargs):
         """
         Initializes a CandyCanes.
@@ -385,14 +462,8 @@ class CandyCanes(Candy):
                        and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^C[0-9]{4}C$', self.product_id):
-            raise ValueError("product_id must follow the format C####C "
-                             "where # is a number")
-        if self.has_nuts:
-            raise ValueError(f'has_nuts must be False')
-        if self.has_lactose:
-            raise ValueError(f'has_lactose must be False')
-        self.colour = CandyCaneColour(colour)
+        values = CandyCanes.schema.validate({**kwargs, 'colour': colour})
+        self.colour = values['colour']
 
 
 class CremeEggs(Candy):
@@ -400,6 +471,17 @@ class CremeEggs(Candy):
     A Concrete Candy class that represents Creme Eggs.
     """
 
+    schema = ItemSchema([
+        PatternRule('product_id', '^E[0-9]{4}C$',
+                    "product_id must follow the format E####C "
+                    "where # is a number"),
+        ChoiceRule('has_nuts', BooleanType.TRUE.value,
+                   'has_nuts must be True'),
+        ChoiceRule('has_lactose', BooleanType.TRUE.value,
+                   'has_lactose must be True'),
+        IntRule('pack_size', 0),
+    ])
+
     def __init__(self, pack_size: int, **kwargs):
         """
         Initializes a CremeEggs.
@@ -409,13 +491,6 @@ class CremeEggs(Candy):
                        and 'product_id'.
         """
         super().__init__(**kwargs)
-        if not re.search('^E[0-9]{4}C$', self.product_id):
-            raise ValueError("product_id must follow the format E####C "
-                             "where # is a number")
-        if not self.has_nuts:
-            raise ValueError(f'has_nuts must be True')
-        if not self.has_lactose:
-            raise ValueError(f'has_lactose must be True')
-        if int(pack_size) <= 0:
-            raise ValueError(f'pack_size must be > 0')
-        self.pack_size = int(pack_size)
+        values = CremeEggs.schema.validate(
+            {**kwargs, 'pack_size': pack_size})
+        self.pack_size = values['pack_size']
@@ -0,0 +1,103 @@
+"""
+This module houses the OrderCoalescer, an optional stage between the
+OrderProcessor and the Store that restocks once per product for a batch
+of orders.
+"""
+import itertools
+from item_factory import ItemFactory
+from order_processor import Order
+from store import Store
+
+
+class OrderCoalescer:
+    """
+    Takes orders in batches and adds up the demand of each product in a
+    batch. Products short of stock are restocked once, with enough
+    factory batches to cover all their orders, and the orders are then
+    fulfilled one by one in their original sequence.
+
+    A restock is validated with the product details of the first order
+    of its product, so only products whose orders in the batch all have
+    the same details, item type and factory are coalesced. The orders
+    of other products, and of products whose details are invalid, are
+    processed one at a time instead, so each of them fails or succeeds
+    as it would without coalescing.
+    """
+
+    def __init__(self, store: Store, batch_size: int = 10000):
+        """
+        Initializes an OrderCoalescer.
+        :param store: a Store, the store the orders are processed by
+        :param batch_size: an int, the number of orders coalesced at a
+                           time
+        """
+        self.store = store
+        self.batch_size = batch_size
+
+    def process_orders(self, orders) -> None:
+        """
+        Processes many orders, batch by batch.
+        :param orders: an iterable of Order
+        :return: None
+        """
+        orders = iter(orders)
+        while True:
+            batch = list(itertools.islice(orders, self.batch_size))
+            if not batch:
+                break
+            self.process_batch(batch)
+
+    def process_batch(self, orders: list) -> None:
+        """
+        Restocks every product of a batch that is short of stock and
+        whose orders all have the same details, then processes its
+        orders.
+        :param orders: a list of Order
+        :return: None
+        """
+        demands = {}
+        mixed = set()
+        for order in orders:
+            details = self._get_details(order)
+            first_order, first_details, quantity = demands.get(
+                order.product_id, (order, details, 0))
+            if details != first_details:
+                mixed.add(order.product_id)
+            demands[order.product_id] = first_order, first_details, \
+                quantity + order.quantity
+
+        for product_id, (order, _, quantity) in demands.items():
+            if product_id not in mixed:
+                self._restock(order, quantity)
+
+        # Orders of products that were not restocked restock on their
+        # own, reporting their failures
+        for order in orders:
+            self.store.process_order(order)
+
+    @staticmethod
+    def _get_details(order: Order) -> tuple:
+        """
+        Returns what the item of an order is created from: its factory
+        class, item type and product details.
+        :param order: an Order
+        :return: a tuple
+        """
+        return type(order.factory), ItemFactory._get_key(
+            order.item_type, order.product_details)
+
+    def _restock(self, order: Order, demand: int) -> None:
+        """
+        Restocks a product so that it has at least `demand` units. It
+        does nothing if the product details are invalid.
+        :param order: an Order, the first order of the product
+        :param demand: an int, the number of units the batch orders
+        :return: None
+        """
+        quantity = self.store.get_restock_quantity(order.product_id, demand)
+        if quantity <= 0:
+            return
+        try:
+            self.store.stock_inventory(order, quantity)
+        except Exception:
+            pass
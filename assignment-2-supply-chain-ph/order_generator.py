@@ -0,0 +1,217 @@
+"""
+This module houses the OrderFileGenerator class that writes seeded
+synthetic order files, in the layout of sample_orders.xlsx, for
+benchmarks. Run it as a script, e.g.
+`python order_generator.py orders.csv --rows 100000`.
+"""
+import argparse
+import csv
+import os
+import random
+import openpyxl
+from typing import Generator
+
+COLUMNS = ('order_number', 'holiday', 'item', 'name', 'quantity',
+           'product_id', 'description', 'has_batteries', 'min_age',
+           'dimensions', 'num_rooms', 'speed', 'jump_height', 'has_glow',
+           'spider_type', 'num_sound', 'colour', 'has_lactose', 'has_nuts',
+           'variety', 'pack_size', 'stuffing', 'size', 'fabric')
+"""
+The columns of an order file.
+"""
+
+
+class OrderFileGenerator:
+    """
+    The OrderFileGenerator creates order rows for the three holidays and
+    the three item types from a seed. Products are drawn from a fixed
+    pool per holiday and item type, so orders for the same product
+    repeat as in a real order file. A share of the rows is made invalid
+    on purpose, in one of the ways the OrderProcessor or the items
+    reject.
+    """
+
+    PREFIXES = {'Christmas': 'C', 'Halloween': 'H', 'Easter': 'E'}
+
+    SUFFIXES = {'Toy': 'T', 'StuffedAnimal': 'S', 'Candy': 'C'}
+
+    CORRUPTIONS = ('holiday', 'order_number', 'quantity', 'zero_quantity',
+                   'product_id', 'details')
+
+    def __init__(self, seed: int = 0, invalid_ratio: float = 0.05,
+                 products_per_kind: int = 20):
+        """
+        Initializes an OrderFileGenerator.
+        :param seed: an int, the random seed
+        :param invalid_ratio: a float, the share of invalid rows
+        :param products_per_kind: an int, the number of products of each
+                                  holiday and item type
+        """
+        self.seed = seed
+        self.invalid_ratio = invalid_ratio
+        rng = random.Random(seed)
+        self.products = [
+            self._create_product(rng, holiday, item, number, code)
+            for holiday in self.PREFIXES
+            for item in self.SUFFIXES
+            for number, code in enumerate(
+                rng.sample(range(10000), products_per_kind))]
+
+    def _create_product(self, rng: random.Random, holiday: str, item: str,
+                        number: int, code: int) -> dict:
+        """
+        Creates the valid details of a product.
+        :param rng: a random.Random
+        :param holiday: a str
+        :param item: a str, the value of an ItemType
+        :param number: an int, the number of the product in its kind
+        :param code: an int, the four digits of its product_id
+        :return: a dictionary that maps a column to its value
+        """
+        product_id = f'{self.PREFIXES[holiday]}{code:04d}' \
+                     f'{self.SUFFIXES[item]}'
+        details = {
+            'holiday': holiday,
+            'item': item,
+            'name': f'{holiday} {item} {number}',
+            'product_id': product_id,
+            'description': f'A synthetic {holiday.lower()} {item.lower()}',
+        }
+        if item == 'Toy':
+            details['min_age'] = rng.randint(0, 12)
+            details['has_batteries'] = 'N' if holiday == 'Christmas' else 'Y'
+            if holiday == 'Christmas':
+                details['dimensions'] = f'{rng.randint(10, 200)},' \
+                                        f'{rng.randint(10, 200)}'
+                details['num_rooms'] = rng.randint(1, 10)
+            elif holiday == 'Halloween':
+                details['speed'] = rng.randint(1, 20)
+                details['jump_height'] = rng.randint(1, 10)
+                details['has_glow'] = rng.choice('YN')
+                details['spider_type'] = rng.choice(('Tarantula',
+                                                     'Wolf Spider'))
+            else:
+                details['num_sound'] = rng.randint(1, 50)
+                details['colour'] = rng.choice(('Orange', 'Blue', 'Pink'))
+        elif item == 'StuffedAnimal':
+            details['size'] = rng.choice('SML')
+            if holiday == 'Christmas':
+                details.update(stuffing='Wool', fabric='Cotton',
+                               has_glow='Y')
+            elif holiday == 'Halloween':
+                details.update(stuffing='Polyester Fibrefill',
+                               fabric='Acrylic', has_glow='Y')
+            else:
+                details.update(stuffing='Polyester Fibrefill',
+                               fabric='Linen',
+                               colour=rng.choice(('White', 'Grey', 'Pink',
+                                                  'Blue')))
+        else:
+            if holiday == 'Christmas':
+                details.update(has_nuts='N', has_lactose='N',
+                               colour=rng.choice(('Red', 'Green')))
+            elif holiday == 'Halloween':
+                details.update(has_nuts='Y', has_lactose='Y',
+                               variety=rng.choice(('Sea Salt', 'Regular')))
+            else:
+                details.update(has_nuts='Y', has_lactose='Y',
+                               pack_size=rng.randint(1, 50))
+        return details
+
+    def _corrupt(self, rng: random.Random, row: dict) -> None:
+        """
+        Makes a row invalid in one random way.
+        :param rng: a random.Random
+        :param row: a dictionary that maps a column to its value
+        :return: None
+        """
+        corruption = rng.choice(self.CORRUPTIONS)
+        if corruption == 'holiday':
+            row['holiday'] = 'Diwali'
+        elif corruption == 'order_number':
+            del row['order_number']
+        elif corruption == 'quantity':
+            del row['quantity']
+        elif corruption == 'zero_quantity':
+            row['quantity'] = -rng.randint(0, 5)
+        elif corruption == 'product_id':
+            row['product_id'] = f'X{row["product_id"][1:]}'
+        else:
+            row['size' if row['item'] == 'StuffedAnimal'
+                else 'has_nuts' if row['item'] == 'Candy'
+                else 'min_age'] = 'unknown'
+
+    def generate_rows(self, count: int) -> Generator[tuple, None, None]:
+        """
+        Yields the rows of an order file, as tuples in the order of
+        COLUMNS with None for empty cells.
+        :param count: an int, the number of rows
+        :return: a generator that yields tuple
+        """
+        rng = random.Random(f'{self.seed}-rows')
+        for order_number in range(1, count + 1):
+            row = dict(rng.choice(self.products),
+                       order_number=order_number,
+                       quantity=rng.randint(1, 30))
+            if rng.random() < self.invalid_ratio:
+                self._corrupt(rng, row)
+            yield tuple(row.get(column) for column in COLUMNS)
+
+    def write_csv(self, path: str, count: int) -> None:
+        """
+        Writes an order file as csv, one row at a time.
+        :param path: a str
+        :param count: an int, the number of rows
+        :return: None
+        """
+        with open(path, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(self.generate_rows(count))
+
+    def write_xlsx(self, path: str, count: int) -> None:
+        """
+        Writes an order file as an xlsx workbook, streaming its rows with
+        openpyxl's write-only mode.
+        :param path: a str
+        :param count: an int, the number of rows
+        :return: None
+        """
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(COLUMNS)
+        for row in self.generate_rows(count):
+            sheet.append(row)
+        workbook.save(path)
+
+    def write(self, path: str, count: int) -> None:
+        """
+        Writes an order file in the format of its extension, csv or xlsx.
+        :param path: a str
+        :param count: an int, the number of rows
+        :return: None
+        """
+        if os.path.splitext(path)[1].lower() == '.csv':
+            self.write_csv(path, count)
+        else:
+            self.write_xlsx(path, count)
+
+
+def main():
+    """
+    Parses the command line arguments and writes an order file.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description='Writes a synthetic order file.')
+    parser.add_argument('path', help='a .csv or .xlsx file')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--invalid-ratio', type=float, default=0.05)
+    args = parser.parse_args()
+    OrderFileGenerator(args.seed, args.invalid_ratio).write(args.path,
+                                                            args.rows)
+
+
+if __name__ == '__main__':
+    main()
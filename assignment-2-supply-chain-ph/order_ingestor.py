@@ -0,0 +1,255 @@
+"""
+This module houses the OrderIngestor class that reads many order files
+at once and feeds their orders to a single Store, and FileReport, the
+timing and row counts of one file.
+"""
+import asyncio
+import contextlib
+import glob
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from queue import Empty
+from item_factory import ItemFactory
+from order_processor import Order, OrderProcessor
+from order_readers import READERS
+from store import Store
+
+ORDER_FILE_EXTENSIONS = ('.xls', *READERS)
+"""
+The extensions of the files found in a directory of orders.
+"""
+
+_queue = None
+"""
+The queue a parsing process sends its orders to.
+"""
+
+
+def _set_queue(queue) -> None:
+    """
+    Sets the queue of a parsing process.
+    :param queue: a queue of a multiprocessing.Manager
+    :return: None
+    """
+    global _queue
+    _queue = queue
+
+
+class FileReport:
+    """
+    The results of ingesting one order file. It has:
+    - the path to the file
+    - the number of rows read and of valid orders
+    - the seconds spent parsing the file, including waits on a full queue
+    - the error that stopped the file from being read, or None.
+    """
+
+    def __init__(self, path: str, rows: int = 0, orders: int = 0,
+                 seconds: float = 0, error: str = None):
+        """
+        Initializes a FileReport.
+        :param path: a str
+        :param rows: an int
+        :param orders: an int
+        :param seconds: a float
+        :param error: a str, or None
+        """
+        self.path = path
+        self.rows = rows
+        self.orders = orders
+        self.seconds = seconds
+        self.error = error
+
+    def __str__(self):
+        if self.error is not None:
+            return f'{self.path}: failed after {self.rows} rows, ' \
+                   f'{self.error}'
+        return f'{self.path}: {self.rows} rows, {self.orders} orders in ' \
+               f'{self.seconds:.2f}s'
+
+
+class OrderIngestor:
+    """
+    Reads the order files of a directory or glob pattern concurrently.
+    Files are found by an asyncio front end and parsed in a pool of
+    processes, which send their orders in chunks through a bounded
+    queue. The orders are processed by a single Store as they arrive;
+    when the store falls behind, the queue fills up and the parsing
+    processes wait.
+
+    If a parsing process dies, e.g. killed for running out of memory,
+    the files it was parsing and those still waiting are reported as
+    failed instead of being waited for forever.
+    """
+
+    POLL_INTERVAL = 0.5
+    """
+    The seconds between two checks of the parsing processes while no
+    chunk arrives.
+    """
+
+    def __init__(self, store: Store, processes: int = None,
+                 chunk_size: int = 1000, max_queue_size: int = 16):
+        """
+        Initializes an OrderIngestor.
+        :param store: a Store, the store processing the orders
+        :param processes: an int, the number of parsing processes,
+                          defaults to the number of CPUs
+        :param chunk_size: an int, the number of rows read at a time
+        :param max_queue_size: an int, the most chunks waiting for the
+                               store
+        """
+        self.store = store
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.max_queue_size = max_queue_size
+        self._factories = {}
+
+    @staticmethod
+    def find_files(pattern: str) -> list:
+        """
+        Returns the order files of a directory, or the files matching a
+        glob pattern, sorted by path.
+        :param pattern: a str, a directory or a glob pattern
+        :return: a list of str
+        """
+        if os.path.isdir(pattern):
+            return sorted(
+                os.path.join(pattern, name) for name in os.listdir(pattern)
+                if os.path.splitext(name)[1].lower() in ORDER_FILE_EXTENSIONS)
+        return sorted(path for path in glob.glob(pattern)
+                      if os.path.isfile(path))
+
+    @staticmethod
+    def parse_file(path: str, chunk_size: int) -> None:
+        """
+        Reads an order file in a parsing process and sends its orders to
+        the queue: a ('chunk', path, rows, orders, output) tuple per
+        chunk, where orders is a list of (factory class, fields) tuples
+        and output is what the OrderProcessor printed, then a ('done',
+        FileReport) tuple. Orders are sent as their fields, so that their
+        factories and prototype caches are not copied through the queue.
+        :param path: a str
+        :param chunk_size: an int
+        :return: None
+        """
+        report = FileReport(path)
+        start = time.perf_counter()
+        order_processor = OrderProcessor(path, chunk_size)
+        try:
+            for chunk in order_processor.read_chunks():
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    orders = [(type(order.factory), order.to_dict())
+                              for order in order_processor.process_chunk(
+                                  chunk)]
+                report.rows += len(chunk)
+                report.orders += len(orders)
+                _queue.put(('chunk', path, len(chunk), orders,
+                            output.getvalue()))
+        except Exception as e:
+            report.error = f'{type(e).__name__}: {e}'
+        report.seconds = time.perf_counter() - start
+        _queue.put(('done', report))
+
+    async def ingest(self, pattern: str) -> list:
+        """
+        Processes the orders of every file of a directory or glob
+        pattern. The messages printed while reading a file are prefixed
+        with its name.
+        :param pattern: a str, a directory or a glob pattern
+        :return: a list of FileReport, in the order of the files
+        """
+        loop = asyncio.get_running_loop()
+        paths = await loop.run_in_executor(None, self.find_files, pattern)
+        if not paths:
+            return []
+        reports = {}
+        progress = {path: FileReport(path) for path in paths}
+        # A queue kept by a manager process only holds whole messages,
+        # so a parsing process killed while sending cannot jam it
+        with multiprocessing.Manager() as manager:
+            queue = manager.Queue(self.max_queue_size)
+            with ProcessPoolExecutor(min(self.processes, len(paths)),
+                                     initializer=_set_queue,
+                                     initargs=(queue,)) as pool:
+                futures = {loop.run_in_executor(pool, OrderIngestor.parse_file,
+                                                path, self.chunk_size): path
+                           for path in paths}
+                while len(reports) < len(paths):
+                    settled = all(future.done() for future in futures)
+                    try:
+                        message = await loop.run_in_executor(
+                            None, queue.get, True, self.POLL_INTERVAL)
+                    except Empty:
+                        self._fail_unfinished(futures, reports, progress,
+                                              settled)
+                        continue
+                    if message[0] == 'done':
+                        reports[message[1].path] = message[1]
+                        continue
+                    _, path, rows, orders, output = message
+                    progress[path].rows += rows
+                    progress[path].orders += len(orders)
+                    name = os.path.basename(path)
+                    for line in output.splitlines():
+                        print(f'{name}: {line}')
+                    for factory_class, fields in orders:
+                        self.store.process_order(
+                            Order(factory=self._get_factory(factory_class),
+                                  **fields))
+                await asyncio.gather(*futures, return_exceptions=True)
+        return [reports[path] for path in paths]
+
+    def _get_factory(self, factory_class: type) -> ItemFactory:
+        """
+        Returns the factory of the orders of an ItemFactory class,
+        creating it for the first order of the class.
+        :param factory_class: an ItemFactory class
+        :return: an ItemFactory
+        """
+        factory = self._factories.get(factory_class)
+        if factory is None:
+            factory = self._factories[factory_class] = factory_class()
+        return factory
+
+    @staticmethod
+    def _fail_unfinished(futures: dict, reports: dict, progress: dict,
+                         settled: bool) -> None:
+        """
+        Reports the files that will never send a report as failed: those
+        whose parsing raised, e.g. because the pool broke, and, once
+        every parsing had already ended before the last wait, those whose
+        report never arrived.
+        :param futures: a dictionary that maps a parsing future to the
+                        path of its file
+        :param reports: a dictionary that maps a path to its FileReport
+        :param progress: a dictionary that maps a path to a FileReport of
+                         the rows and orders received so far
+        :param settled: a bool, whether every future was done before the
+                        last wait on the queue
+        :return: None
+        """
+        for future, path in futures.items():
+            if path in reports or not future.done():
+                continue
+            error = future.exception()
+            if error is not None:
+                progress[path].error = f'{type(error).__name__}: {error}'
+            elif settled:
+                progress[path].error = 'its report was lost'
+            else:
+                continue
+            reports[path] = progress[path]
+
+    def run(self, pattern: str) -> list:
+        """
+        Processes the orders of every file of a directory or glob
+        pattern, from synchronous code.
+        :param pattern: a str, a directory or a glob pattern
+        :return: a list of FileReport, in the order of the files
+        """
+        return asyncio.run(self.ingest(pattern))
@@ -1,14 +1,25 @@
 """
 This module houses the OrderProcessor and supporting classes that are
-responsible for processing orders in an excel file.
+responsible for processing orders in an excel, csv, JSON lines,
+Parquet or Arrow file.
 """
+import os
+import numpy
 import pandas
 from typing import Generator
 from items import ItemType
+from item_schema import ItemSchema
 from item_factory import ItemFactory
 from item_factory import ChristmasFactory
 from item_factory import HalloweenFactory
 from item_factory import EasterFactory
+from order_readers import READERS, DEFAULT_READER
+
+ORDER_COLUMNS = ('order_number', 'holiday', 'item', 'name', 'quantity',
+                 'product_id')
+"""
+The columns of an order file every order needs, whatever its item.
+"""
 
 
 class Order:
@@ -39,17 +50,37 @@ class Order:
             **kwargs,
         }
 
+    def to_dict(self) -> dict:
+        """
+        Returns the fields of this order: the arguments, other than the
+        factory, that create it again.
+        :return: a dictionary
+        """
+        return {
+            'order_number': self.order_number,
+            'item': self.item_type.value,
+            'quantity': self.quantity,
+            **self.product_details,
+        }
+
 
 class OrderProcessor:
     """
     An Order Utility class that is responsible for reading each row of
-    excel files and creating and yielding an Order object.
+    excel or csv files and creating and yielding an Order object.
+
+    Rows are read in chunks of a bounded size by the reader of the file
+    extension, see order_readers. Only the columns the orders and their
+    items need are read, and each order only gets the fields of its own
+    Item class. Each chunk is validated column-wise before any Order is
+    created, so memory stays flat however large the file is.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, chunk_size: int = 10000):
         """
         Initializes an OrderProcessor.
         :param file_path: a str, path to the file
+        :param chunk_size: an int, the number of rows read at a time
         """
         self.factory_map = {
             "Christmas": ChristmasFactory(),
@@ -57,25 +88,115 @@ class OrderProcessor:
             "Easter": EasterFactory(),
         }
         self.file_path = file_path
+        self.chunk_size = chunk_size
 
     def get_next_order(self) -> Generator[Order, None, None]:
         """
-        Loads orders from an excel sheet file, instantiates an Order
-        object and yields it.
+        Loads orders from an excel or csv file chunk by chunk,
+        instantiates an Order object for each valid row and yields it.
+        Invalid rows are reported with their line number and skipped.
         :return: a generator that yields Order
         """
-        df = pandas.read_excel(self.file_path)
-        for row in df.iterrows():
-            row_no = row[0] + 2
-            row_data = row[1]
+        for chunk in self.read_chunks():
+            yield from self.process_chunk(chunk)
 
-            try:
-                factory = self.factory_map[row_data['holiday']]
-            except KeyError as e:
-                print(f'Line {row_no}: Invalid holiday {e}')
-                continue
+    def read_chunks(self) -> Generator[pandas.DataFrame, None, None]:
+        """
+        Reads the file in chunks of at most `chunk_size` rows, with the
+        reader of its extension. The index of each chunk is the line
+        number of its rows in the file. Only the columns of an order and
+        the fields of the items the factories create are read.
+        :return: a generator that yields pandas.DataFrame
+        """
+        extension = os.path.splitext(self.file_path)[1].lower()
+        reader = READERS.get(extension, DEFAULT_READER)
+        yield from reader.read_chunks(self.file_path, self.chunk_size,
+                                      self.get_columns())
 
-            row_data.drop('holiday', inplace=True)
+    def get_columns(self) -> list:
+        """
+        Returns the columns an order file is read with: the columns of an
+        order, then the fields of every Item class of the factories.
+        :return: a list of str
+        """
+        columns = dict.fromkeys(ORDER_COLUMNS)
+        for factory in self.factory_map.values():
+            for item_class in factory.item_classes.values():
+                columns.update(dict.fromkeys(
+                    ItemSchema.get_fields(item_class)))
+        return list(columns)
+
+    def get_item_columns(self, holiday, item, columns) -> list:
+        """
+        Returns the columns an order for an item is created from: the
+        columns of an order and the fields of the Item class its factory
+        creates, out of the given ones. The holiday is left out. If
+        there is no such Item class, every column but the holiday is.
+        :param holiday: the holiday of the order
+        :param item: the item type of the order
+        :param columns: an iterable of str, the columns of the file
+        :return: a list of str
+        """
+        try:
+            item_class = self.factory_map[holiday].item_classes[
+                ItemType(item)]
+        except (KeyError, TypeError, ValueError):
+            return [column for column in columns if column != 'holiday']
+        needed = set(ORDER_COLUMNS) | set(ItemSchema.get_fields(item_class))
+        return [column for column in columns
+                if column in needed and column != 'holiday']
+
+    def get_records(self, chunk: pandas.DataFrame) -> list:
+        """
+        Returns the rows of a chunk as dictionaries, each with only the
+        columns its order needs. Rows are grouped by holiday and item
+        type, so each group is projected once.
+        :param chunk: a pandas.DataFrame
+        :return: a list of dictionaries, in the order of the rows
+        """
+        if 'item' not in chunk:
+            return chunk.drop(columns='holiday').to_dict('records')
+        records = [None] * len(chunk)
+        groups = chunk.groupby(['holiday', 'item'], dropna=False,
+                               sort=False).indices
+        for (holiday, item), positions in groups.items():
+            columns = self.get_item_columns(holiday, item, chunk.columns)
+            group = chunk.iloc[positions][columns].to_dict('records')
+            for position, record in zip(positions, group):
+                records[position] = record
+        return records
+
+    def process_chunk(self, chunk: pandas.DataFrame) \
+            -> Generator[Order, None, None]:
+        """
+        Validates a chunk column-wise, reports the rows with a missing
+        or invalid holiday, order number or quantity, and yields an Order
+        for each remaining row. Rows the Order constructor rejects are
+        reported as well.
+        :param chunk: a pandas.DataFrame indexed by line number
+        :return: a generator that yields Order
+        """
+        factories = chunk['holiday'].map(self.factory_map)
+        quantities = pandas.to_numeric(chunk['quantity'], errors='coerce')
+        invalid_holiday = factories.isna()
+        errors = numpy.select(
+            [chunk['order_number'].isna(), chunk['quantity'].isna(),
+             quantities <= 0],
+            ['order_number is missing', 'quantity is missing',
+             'quantity must be > 0'],
+            default='',
+        )
+
+        records = self.get_records(chunk)
+        for row_no, row_data, factory, holiday, error, bad_holiday in zip(
+                chunk.index, records, factories, chunk['holiday'], errors,
+                invalid_holiday):
+            if bad_holiday:
+                print(f'Line {row_no}: Invalid holiday {KeyError(holiday)}')
+                continue
+            if error:
+                print(f'Line {row_no}: {error}')
+                continue
 
             try:
                 order = Order(factory=factory, **row_data)
@@ -0,0 +1,253 @@
+"""
+This module houses the readers the OrderProcessor reads order files
+with, one per file format, and the READERS table that picks a reader by
+file extension.
+"""
+import json
+import numpy
+import openpyxl
+import pandas
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Generator
+
+try:
+    import pyarrow.feather
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class OrderReader(ABC):
+    """
+    An interface for a reader of order files. A reader yields the rows
+    of a file in chunks of at most `chunk_size` rows, indexed by their
+    line number in the file (or their row number, for formats without
+    lines), with missing values as NaN. Only the requested columns are
+    kept; the ones a file does not have are left out.
+    """
+
+    @abstractmethod
+    def read_chunks(self, path: str, chunk_size: int, columns: list = None) \
+            -> Generator[pandas.DataFrame, None, None]:
+        """
+        Reads a file in chunks.
+        :param path: a str, the path to the file
+        :param chunk_size: an int, the number of rows read at a time
+        :param columns: a list of str, the columns to keep, or None to
+                        keep them all
+        :return: a generator that yields pandas.DataFrame
+        """
+        pass
+
+    @staticmethod
+    def project(df: pandas.DataFrame, columns: list) -> pandas.DataFrame:
+        """
+        Keeps the requested columns of a chunk, with missing values as
+        NaN.
+        :param df: a pandas.DataFrame
+        :param columns: a list of str, or None to keep every column
+        :return: a pandas.DataFrame
+        """
+        if columns is not None:
+            df = df[[column for column in df.columns if column in columns]]
+        return df.where(df.notna(), numpy.nan)
+
+
+class CsvReader(OrderReader):
+    """
+    Reads csv files through pandas' chunked csv reader, parsing only the
+    requested columns. pandas skips blank lines, so the rows are
+    numbered by scanning the lines of the file alongside.
+    """
+
+    def read_chunks(self, path: str, chunk_size: int, columns: list = None) \
+            -> Generator[pandas.DataFrame, None, None]:
+        use_columns = None if columns is None \
+            else (lambda column: column in columns)
+        with open(path, 'rb') as file, \
+                pandas.read_csv(path, chunksize=chunk_size,
+                                usecols=use_columns) as reader:
+            line_numbers = (line_number for line_number, line
+                            in enumerate(file, start=1) if line.strip())
+            # The first line that is not blank is the header
+            next(line_numbers, None)
+            for chunk in reader:
+                chunk.index = list(islice(line_numbers, len(chunk)))
+                yield chunk
+
+
+class XlsxReader(OrderReader):
+    """
+    Reads the first sheet of xlsx workbooks, streaming their rows with
+    openpyxl's read-only mode. Blank rows are skipped.
+    """
+
+    def read_chunks(self, path: str, chunk_size: int, columns: list = None) \
+            -> Generator[pandas.DataFrame, None, None]:
+        workbook = openpyxl.load_workbook(path, read_only=True,
+                                          data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            line_numbers = []
+            values = []
+            for line_number, row in enumerate(rows, start=2):
+                if all(value is None for value in row):
+                    continue
+                line_numbers.append(line_number)
+                values.append(row)
+                if len(values) == chunk_size:
+                    yield self._to_frame(values, header, line_numbers,
+                                         columns)
+                    line_numbers = []
+                    values = []
+            if values:
+                yield self._to_frame(values, header, line_numbers, columns)
+        finally:
+            workbook.close()
+
+    def _to_frame(self, values: list, header: tuple, line_numbers: list,
+                  columns: list) -> pandas.DataFrame:
+        """
+        Builds a chunk from raw rows.
+        :param values: a list of tuples, the rows
+        :param header: a tuple, the column names
+        :param line_numbers: a list of int, the line numbers of the rows
+        :param columns: a list of str, or None
+        :return: a pandas.DataFrame
+        """
+        df = pandas.DataFrame(values, columns=header, index=line_numbers)
+        return self.project(df, columns)
+
+
+class ExcelReader(OrderReader):
+    """
+    Reads any Excel workbook pandas can read, e.g. xls, whole, and
+    yields it in chunks. It is the reader of unknown extensions.
+    """
+
+    def read_chunks(self, path: str, chunk_size: int, columns: list = None) \
+            -> Generator[pandas.DataFrame, None, None]:
+        use_columns = None if columns is None \
+            else (lambda column: column in columns)
+        df = pandas.read_excel(path, usecols=use_columns)
+        df.index += 2
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
+
+class JsonLinesReader(OrderReader):
+    """
+    Reads files with one JSON object per line, indexed by their line
+    number. Blank lines are skipped. Keys missing from an object and
+    null values are read as NaN.
+    """
+
+    def read_chunks(self, path: str, chunk_size: int, columns: list = None) \
+            -> Generator[pandas.DataFrame, None, None]:
+        with open(path) as file:
+            line_numbers = []
+            records = []
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f'Line {line_number}: {e}') from e
+                line_numbers.append(line_number)
+                records.append(record)
+                if len(records) == chunk_size:
+                    yield self._to_frame(records, line_numbers, columns)
+                    line_numbers = []
+                    records = []
+            if records:
+                yield self._to_frame(records, line_numbers, columns)
+
+    def _to_frame(self, records: list, line_numbers: list,
+                  columns: list) -> pandas.DataFrame:
+        """
+        Builds a chunk from decoded objects. With columns, every chunk
+        has all of them, since an object may leave any key out.
+        :param records: a list of dictionaries
+        :param line_numbers: a list of int, the line numbers of the
+                             objects
+        :param columns: a list of str, or None
+        :return: a pandas.DataFrame
+        """
+        df = pandas.DataFrame(records, index=line_numbers, columns=columns)
+        return self.project(df, None)
+
+
+class ParquetReader(OrderReader):
+    """
+    Reads Parquet files batch by batch, decoding only the requested
+    columns. Rows are numbered from 1. It requires pyarrow.
+    """
+
+    def read_chunks(self, path: str, chunk_size: int, columns: list = None) \
+            -> Generator[pandas.DataFrame, None, None]:
+        if pyarrow is None:
+            raise ImportError('pyarrow is required to read Parquet files')
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        if columns is not None:
+            columns = [name for name in parquet_file.schema_arrow.names
+                       if name in columns]
+        start = 1
+        for batch in parquet_file.iter_batches(batch_size=chunk_size,
+                                               columns=columns):
+            chunk = batch.to_pandas()
+            chunk.index += start
+            start += len(chunk)
+            yield self.project(chunk, None)
+
+
+class ArrowReader(OrderReader):
+    """
+    Reads Arrow IPC files, also known as Feather files, of either
+    Feather version. The file is memory-mapped and converted to pandas
+    one batch at a time. Rows are numbered from 1. It requires pyarrow.
+    """
+
+    def read_chunks(self, path: str, chunk_size: int, columns: list = None) \
+            -> Generator[pandas.DataFrame, None, None]:
+        if pyarrow is None:
+            raise ImportError('pyarrow is required to read Arrow files')
+        table = pyarrow.feather.read_table(path, memory_map=True)
+        if columns is not None:
+            table = table.select([name for name in table.column_names
+                                  if name in columns])
+        start = 1
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            chunk = batch.to_pandas()
+            chunk.index += start
+            start += len(chunk)
+            yield self.project(chunk, None)
+
+
+READERS = {
+    '.csv': CsvReader(),
+    '.xlsx': XlsxReader(),
+    '.xlsm': XlsxReader(),
+    '.jsonl': JsonLinesReader(),
+}
+"""
+A dictionary that maps a file extension to its OrderReader. Readers of
+other formats are added to it. The Parquet and Arrow readers are only
+added when pyarrow is installed.
+"""
+
+if pyarrow is not None:
+    READERS.update({
+        '.parquet': ParquetReader(),
+        '.arrow': ArrowReader(),
+        '.feather': ArrowReader(),
+    })
+
+DEFAULT_READER = ExcelReader()
+"""
+The reader of the extensions missing from READERS.
+"""
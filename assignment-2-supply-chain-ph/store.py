@@ -2,10 +2,30 @@
 This module houses the Store class that handles orders, getting items
 from the factory and generating daily transaction reports.
 """
+import contextlib
+import copy
+import io
+import itertools
+import math
+import multiprocessing
+import zlib
 from datetime import datetime
+from event_log import EventLog, StockEvent, OrderEvent, FailureEvent
+from inventory_snapshot import InventorySnapshot
 from order_processor import Order
 from items import ItemType, Item
 
+STOCK_STATUSES = ('IN STOCK', 'LOW', 'VERY LOW', 'OUT OF STOCK')
+"""
+The stock statuses returned by Store.get_quantity_status.
+"""
+
+_partition_factories = {}
+"""
+The factories of a partition process, one per ItemFactory class. They
+live as long as the process, so their prototype caches outlast a batch.
+"""
+
 
 class Store:
     """
@@ -16,18 +36,38 @@ class Store:
     - Creating the Daily Transaction Report.
 
     - Attributes:
-        - _inventory: dict[str(product_id): list(Item)]
+        - _inventory: dict[str(product_id): int(quantity)]
         - _sample_products: dict[str(product_id): Item]
-        - _orders_history: list(str)
+        - _status_buckets: dict[str(status): dict[str(product_id): None]]
+        - event_log: EventLog
+        - snapshot: InventorySnapshot, or None
+
+    Units in stock are counted rather than stored: the sample product
+    of each product_id is the only Item kept, and items are copied from
+    it when get_items is called. Products are also kept in a bucket per
+    stock status, moved as their quantity changes, so listing the
+    products with a status takes time in the number of products listed.
     """
 
-    def __init__(self):
+    def __init__(self, event_log: EventLog = None,
+                 restock_quantity: int = 100,
+                 snapshot: InventorySnapshot = None):
         """
         Initializes a Store.
+        :param event_log: an EventLog, the log of stock, orders and
+                          failures, defaults to a log kept in memory
+        :param restock_quantity: an int, the number of units in a batch
+                                 from the factory
+        :param snapshot: an InventorySnapshot the inventory is saved to
+                         periodically, or None
         """
+        self.restock_quantity = restock_quantity
+        self.snapshot = snapshot
+        self._unsaved_orders = 0
         self._inventory = {}
         self._sample_products = {}
-        self._orders_history = []
+        self._status_buckets = {status: {} for status in STOCK_STATUSES}
+        self.event_log = event_log if event_log is not None else EventLog()
 
     def process_order(self, order: Order) -> None:
         """
@@ -37,47 +77,259 @@ class Store:
         """
         try:
             # Restock if needed
-            products = self._inventory.get(order.product_id, [])
-            current_quantity = len(products)
-            while current_quantity < order.quantity:
-                current_quantity = self.stock_inventory(order, 100)
+            restock_quantity = self.get_restock_quantity(order.product_id,
+                                                         order.quantity)
+            if restock_quantity > 0:
+                self.stock_inventory(order, restock_quantity)
         except Exception as e:
             print(f'Order {order.order_number}: {e}')
-            self._orders_history.append(f'Order {order.order_number}, '
-                                        f'Could not process order data was '
-                                        f'corrupted, InvalidDataError - {e}')
+            self.event_log.append(FailureEvent(order.order_number, str(e)))
         else:
             # Process the products
-            products = self._inventory[order.product_id]
-            new_quantity = len(products) - order.quantity
-            self._inventory[order.product_id] = products[:new_quantity]
-            self._orders_history.append(f'Order {order.order_number}, '
-                                        f'Item {order.item_type.value}, '
-                                        f'Product ID {order.product_id}, '
-                                        f'Name "{order.name}", '
-                                        f'Quantity {order.quantity}')
+            self._set_quantity(order.product_id,
+                               self._inventory[order.product_id]
+                               - order.quantity)
+            self.event_log.append(OrderEvent(
+                order.order_number, order.item_type.value, order.product_id,
+                order.name, order.quantity))
+        self._count_processed()
+
+    def process_orders(self, orders, processes: int = None,
+                       batch_size: int = 10000) -> None:
+        """
+        Processes many orders in a pool of processes. Orders are
+        partitioned by product_id, so each process owns the inventory of
+        its products and processes their orders in sequence. The events,
+        the inventory and the printed messages are then merged back in
+        the order of the orders, exactly as if they had been processed
+        one at a time.
+        :param orders: an iterable of Order
+        :param processes: an int, the number of processes, defaults to
+                          the number of CPUs
+        :param batch_size: an int, the number of orders partitioned at a
+                           time
+        :return: None
+        """
+        processes = processes or multiprocessing.cpu_count()
+        if processes == 1:
+            for order in orders:
+                self.process_order(order)
+            return
+        orders = iter(orders)
+        with multiprocessing.Pool(processes) as pool:
+            while True:
+                batch = list(itertools.islice(orders, batch_size))
+                if not batch:
+                    break
+                partitions = self._partition(batch, processes)
+                results = pool.starmap(
+                    Store.process_partition,
+                    [(*partition, self.restock_quantity)
+                     for partition in partitions])
+                self._merge(results)
+
+    def _partition(self, orders: list, processes: int) -> list:
+        """
+        Splits numbered orders by product_id, along with the inventory
+        of their products. Orders are sent as the fields they were
+        created from and the class of their factory, so their factories
+        and prototype caches are not copied to the partition processes.
+        :param orders: a list of Order
+        :param processes: an int, the number of partitions
+        :return: a list of (list, dict, dict) tuples, the numbered order
+                 fields, inventory and sample products of each partition
+        """
+        partitions = [([], {}, {}) for _ in range(processes)]
+        for number, order in enumerate(orders):
+            key = str(order.product_id).encode()
+            numbered, inventory, samples = \
+                partitions[zlib.crc32(key) % processes]
+            numbered.append((number, type(order.factory), order.to_dict()))
+            if order.product_id in self._inventory:
+                inventory[order.product_id] = \
+                    self._inventory[order.product_id]
+                samples[order.product_id] = \
+                    self._sample_products[order.product_id]
+        return [partition for partition in partitions if partition[0]]
+
+    @staticmethod
+    def process_partition(orders: list, inventory: dict, samples: dict,
+                          restock_quantity: int = 100) -> tuple:
+        """
+        Processes the orders of one partition in a Store of its own and
+        returns what the orders did. Each order is created again from
+        its fields, with this process's factory of its factory class.
+        :param orders: a list of (int, ItemFactory class, dict) tuples,
+                       the number, factory class and fields of each order
+        :param inventory: a dictionary, the inventory of the partition
+        :param samples: a dictionary, the sample products of the
+                        partition
+        :param restock_quantity: an int, the number of units in a batch
+                                 from the factory
+        :return: a tuple of:
+                 - the inventory and the sample products of the partition
+                 - a list of (int, list, str) tuples, the number of each
+                 order, its events and its printed messages
+                 - a dictionary that maps a new product_id to the number
+                 of the order that first stocked it
+        """
+        store = Store(restock_quantity=restock_quantity)
+        store._set_inventory(inventory, samples)
+        output = io.StringIO()
+        entries = []
+        first_stocked = {}
+        with contextlib.redirect_stdout(output):
+            for number, factory_class, fields in orders:
+                factory = _partition_factories.get(factory_class)
+                if factory is None:
+                    factory = _partition_factories[factory_class] = \
+                        factory_class()
+                order = Order(factory=factory, **fields)
+                is_new = order.product_id not in store._inventory
+                store.process_order(order)
+                if is_new and order.product_id in store._inventory:
+                    first_stocked[order.product_id] = number
+                entries.append((number, store.event_log.drain(),
+                                output.getvalue()))
+                output.seek(0)
+                output.truncate()
+        return store._inventory, store._sample_products, entries, \
+            first_stocked
+
+    def _merge(self, results: list) -> None:
+        """
+        Merges the results of every partition into this store, in the
+        order of the orders.
+        :param results: a list of tuples returned by process_partition
+        :return: None
+        """
+        entries = []
+        first_stocked = {}
+        for inventory, samples, partition_entries, new_products in results:
+            self._sample_products.update(samples)
+            for product_id, quantity in inventory.items():
+                if product_id in self._inventory:
+                    self._set_quantity(product_id, quantity)
+            entries.extend(partition_entries)
+            first_stocked.update(
+                (product_id, (number, inventory[product_id]))
+                for product_id, number in new_products.items())
+        for product_id, (_, quantity) in sorted(
+                first_stocked.items(), key=lambda item: item[1][0]):
+            self._set_quantity(product_id, quantity)
+        entries.sort(key=lambda entry: entry[0])
+        for _, events, output in entries:
+            for event in events:
+                self.event_log.append(event)
+            print(output, end='')
+        self._count_processed(len(entries))
+
+    def _count_processed(self, count: int = 1) -> None:
+        """
+        Counts processed orders and saves a snapshot of the inventory
+        every `snapshot.interval` orders.
+        :param count: an int, the number of orders processed
+        :return: None
+        """
+        if self.snapshot is None:
+            return
+        self._unsaved_orders += count
+        if self._unsaved_orders >= self.snapshot.interval:
+            self.save_snapshot()
+
+    def save_snapshot(self) -> None:
+        """
+        Saves the inventory to the snapshot, if the store has one. The
+        event log is flushed first, so a restored inventory never has
+        orders missing from the log.
+        :return: None
+        """
+        if self.snapshot is None:
+            return
+        self.event_log.flush()
+        self.snapshot.save(self._inventory, self._sample_products)
+        self._unsaved_orders = 0
+
+    def restore_snapshot(self) -> bool:
+        """
+        Replaces the inventory with the one saved in the snapshot.
+        :return: a bool, True if a saved inventory was restored
+        """
+        if self.snapshot is None:
+            return False
+        inventory, sample_products = self.snapshot.load()
+        if not inventory:
+            return False
+        self._set_inventory(inventory, sample_products)
+        self._unsaved_orders = 0
+        return True
+
+    def _set_inventory(self, inventory: dict, sample_products: dict) -> None:
+        """
+        Replaces the inventory and sorts its products into buckets.
+        :param inventory: a dictionary that maps a product_id to its
+                          number of units
+        :param sample_products: a dictionary that maps a product_id to
+                                its sample Item
+        :return: None
+        """
+        self._inventory = {}
+        self._sample_products = sample_products
+        self._status_buckets = {status: {} for status in STOCK_STATUSES}
+        for product_id, quantity in inventory.items():
+            self._set_quantity(product_id, quantity)
+
+    def _set_quantity(self, product_id: str, quantity: int) -> None:
+        """
+        Sets the number of units of a product in stock and moves it to
+        the bucket of its new status if it changed.
+        :param product_id: a str
+        :param quantity: an int
+        :return: None
+        """
+        status = self.get_quantity_status(quantity)
+        if product_id in self._inventory:
+            old_status = self.get_quantity_status(self._inventory[product_id])
+            if old_status != status:
+                del self._status_buckets[old_status][product_id]
+                self._status_buckets[status][product_id] = None
+        else:
+            self._status_buckets[status][product_id] = None
+        self._inventory[product_id] = quantity
+
+    def get_restock_quantity(self, product_id: str, demand: int) -> int:
+        """
+        Returns the number of units to stock so that a product has at
+        least `demand` units: the smallest number of whole batches from
+        the factory that covers the shortfall.
+        :param product_id: a str
+        :param demand: an int, the number of units needed
+        :return: an int, 0 if there is enough stock
+        """
+        shortfall = demand - self.get_quantity(product_id)
+        if shortfall <= 0:
+            return 0
+        return math.ceil(shortfall / self.restock_quantity) \
+            * self.restock_quantity
 
     def stock_inventory(self, order: Order, restock_quantity: int) -> int:
         """
         Stocks up the inventory and returns the current quantity after
-        restock. It also creates a sample item and stores it in
-        `sample_products`.
+        restock. The order's product details are validated once by
+        creating an item, which is kept in `sample_products` if it is the
+        first of its product.
         :param order: an Order
         :param restock_quantity: an int, the quantity to stock
         :return: an int, the current quantity after restock
         """
-        if order.product_id not in self._sample_products:
-            self._sample_products[order.product_id] = self.create_item(order)
+        item = self.create_item(order)
+        self._sample_products.setdefault(order.product_id, item)
 
-        products = self._inventory.get(order.product_id, [])
-        new_products = [self.create_item(order)
-                        for _ in range(restock_quantity)]
-        products.extend(new_products)
-        self._inventory[order.product_id] = products
-        self._orders_history.append(f'Stock, Product ID {order.product_id}, '
-                                    f'Name "{order.name}", '
-                                    f'Quantity {restock_quantity}')
-        return len(products)
+        quantity = self._inventory.get(order.product_id, 0) + restock_quantity
+        self._set_quantity(order.product_id, quantity)
+        self.event_log.append(StockEvent(order.product_id, order.name,
+                                         restock_quantity))
+        return quantity
 
     def create_item(self, order: Order) -> Item:
         """
@@ -91,14 +343,62 @@ class Store:
             return order.factory.create_stuffed_animal(order.product_details)
         return order.factory.create_candy(order.product_details)
 
-    def check_inventory(self) -> None:
+    def get_quantity(self, product_id: str) -> int:
+        """
+        Returns the number of units of a product in stock.
+        :param product_id: a str
+        :return: an int
+        """
+        return self._inventory.get(product_id, 0)
+
+    def get_items(self, product_id: str, quantity: int = None) -> list:
+        """
+        Returns items of a product in stock, copied from its sample
+        product. The inventory is left unchanged.
+        :param product_id: a str
+        :param quantity: an int, the number of items, defaults to all the
+                         units in stock
+        :return: a list of Item
+        """
+        in_stock = self.get_quantity(product_id)
+        if quantity is None or quantity > in_stock:
+            quantity = in_stock
+        if quantity <= 0:
+            return []
+        item = self._sample_products[product_id]
+        return [copy.copy(item) for _ in range(quantity)]
+
+    def get_products_by_status(self, status: str) -> list:
+        """
+        Returns the products with a stock status.
+        :param status: a str, one of STOCK_STATUSES
+        :return: a list of str, the product ids
+        """
+        return list(self._status_buckets[status])
+
+    def check_inventory(self, statuses: tuple = None, page: int = 0,
+                        page_size: int = None) -> None:
         """
         Checks and prints the inventory for stock levels.
+        :param statuses: a tuple of str, the statuses of the products to
+                         print, grouped in that order, or None to print
+                         every product in the order it was first stocked
+        :param page: an int, the page number starting from 0
+        :param page_size: an int, the number of products per page, or
+                          None to print them all
         :return: None.
         """
-        for product_id, products in self._inventory.items():
-            quantity = len(products)
+        if statuses is None:
+            product_ids = iter(self._inventory)
+        else:
+            product_ids = itertools.chain.from_iterable(
+                self._status_buckets[status] for status in statuses)
+        if page_size is not None:
+            product_ids = itertools.islice(product_ids, page * page_size,
+                                           (page + 1) * page_size)
+        for product_id in product_ids:
             item = self._sample_products[product_id]
+            quantity = self._inventory[product_id]
             print(f'Product ID {item.product_id}, Name "{item.name}", '
                   f'Status: {self.get_quantity_status(quantity)}')
 
@@ -118,12 +418,12 @@ class Store:
 
     def generate_daily_report(self) -> None:
         """
-        Generates a daily transaction report.
+        Generates a daily transaction report, rendered one event at a
+        time from the event log.
         :return: None.
         """
         file_name = datetime.today().strftime("DTR_%d%m%y_%H%M.txt")
         with open(file_name, mode='w') as file:
             file.write('HOLIDAY STORE - DAILY TRANSACTION REPORT (DRT)\n')
             file.write(f'{datetime.today().strftime("%m-%d-%y %H:%M")}\n\n')
-            for log in self._orders_history:
-                file.write(f'{log}\n')
+            self.event_log.render(file)
@@ -0,0 +1,139 @@
+"""
+Round-trip checks of the order readers: an order file converted to each
+format must give the same orders and the same messages as its csv
+version. Run it with `python -m unittest test_order_readers`. The
+Parquet and Arrow checks are skipped when pyarrow is not installed.
+"""
+import contextlib
+import io
+import os
+import re
+import tempfile
+import unittest
+import pandas
+from order_generator import OrderFileGenerator
+from order_processor import OrderProcessor
+from order_readers import READERS, pyarrow
+
+
+def read_orders(path: str, chunk_size: int = 100) -> tuple:
+    """
+    Reads every order of a file.
+    :param path: a str
+    :param chunk_size: an int
+    :return: a tuple of a list of tuples, the fields of each order, and
+             a list of str, the messages printed
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        orders = [(order.order_number, order.item_type, order.quantity,
+                   type(order.factory),
+                   sorted((name, None if pandas.isna(value) else value)
+                          for name, value in order.product_details.items()))
+                  for order in OrderProcessor(path,
+                                              chunk_size).get_next_order()]
+    return orders, output.getvalue().splitlines()
+
+
+def shift_lines(messages: list, offset: int) -> list:
+    """
+    Shifts the line numbers of messages.
+    :param messages: a list of str, 'Line N: ...' messages
+    :param offset: an int, added to every line number
+    :return: a list of str
+    """
+    return [re.sub(r'^Line (\d+)',
+                   lambda match: f'Line {int(match.group(1)) + offset}',
+                   message)
+            for message in messages]
+
+
+class OrderReaderTest(unittest.TestCase):
+    """
+    Converts a synthetic csv order file, with invalid rows, to the other
+    formats and reads it back.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv_path = self.get_path('.csv')
+        OrderFileGenerator(seed=1, invalid_ratio=0.2).write(self.csv_path,
+                                                            500)
+        self.frame = pandas.read_csv(self.csv_path)
+        # Read in one chunk, so its columns have the types of the frame
+        # the other formats are written from
+        self.expected = read_orders(self.csv_path, 1000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_path(self, extension: str) -> str:
+        return os.path.join(self.directory.name, f'orders{extension}')
+
+    def assert_same_orders(self, path: str, offset: int) -> None:
+        """
+        Checks that a file gives the orders and messages of the csv
+        file, with line numbers shifted by an offset.
+        :param path: a str
+        :param offset: an int, the line number of a row in the file
+                       minus its line number in the csv file
+        :return: None
+        """
+        orders, messages = read_orders(path)
+        expected_orders, expected_messages = self.expected
+        self.assertEqual(orders, expected_orders)
+        self.assertEqual(messages, shift_lines(expected_messages, offset))
+
+    def test_jsonl(self):
+        path = self.get_path('.jsonl')
+        self.frame.to_json(path, orient='records', lines=True)
+        self.assert_same_orders(path, -1)
+
+    def test_jsonl_blank_lines(self):
+        path = self.get_path('.jsonl')
+        with open(path, mode='w') as file:
+            file.write('{"order_number": 1, "holiday": "Diwali"}\n\n\n'
+                       '{"order_number": 2, "holiday": "Diwali"}\n')
+        orders, messages = read_orders(path)
+        self.assertEqual(orders, [])
+        self.assertEqual(messages, ["Line 1: Invalid holiday 'Diwali'",
+                                    "Line 4: Invalid holiday 'Diwali'"])
+
+    def test_csv_blank_lines(self):
+        path = self.get_path('.csv')
+        with open(path, mode='w') as file:
+            file.write('\norder_number,holiday,item,name,quantity,'
+                       'product_id\n1,Diwali,,,,\n\n  \n2,Diwali,,,,\n,,,,,\n')
+        orders, messages = read_orders(path, 1)
+        self.assertEqual(orders, [])
+        self.assertEqual(messages[:2], ["Line 3: Invalid holiday 'Diwali'",
+                                        "Line 6: Invalid holiday 'Diwali'"])
+        self.assertEqual(len(messages), 3)
+        self.assertTrue(messages[2].startswith('Line 7: '))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        path = self.get_path('.parquet')
+        self.frame.to_parquet(path)
+        self.assert_same_orders(path, -1)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow(self):
+        path = self.get_path('.arrow')
+        pyarrow.feather.write_feather(self.frame, path, version=2)
+        self.assert_same_orders(path, -1)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_feather_v1(self):
+        path = self.get_path('.feather')
+        pyarrow.feather.write_feather(self.frame, path, version=1)
+        self.assert_same_orders(path, -1)
+
+    @unittest.skipIf(pyarrow is not None, 'pyarrow is installed')
+    def test_without_pyarrow(self):
+        for extension in ('.parquet', '.arrow', '.feather'):
+            self.assertNotIn(extension, READERS)
+
+
+if __name__ == '__main__':
+    unittest.main()
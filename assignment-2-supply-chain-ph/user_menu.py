@@ -3,6 +3,10 @@ The program's entry point and drives the program.
 The program manages a storefront and the supply chain.
 """
 import xlrd
+from event_log import EventLog
+from inventory_snapshot import InventorySnapshot
+from order_coalescer import OrderCoalescer
+from order_ingestor import OrderIngestor
 from store import Store
 from order_processor import OrderProcessor
 
@@ -12,16 +16,33 @@ class UserMenu:
     The main class that drives the program.
     """
 
-    def __init__(self):
+    def __init__(self, processes: int = 1, log_directory: str = 'logs',
+                 coalesce: bool = False,
+                 snapshot_path: str = 'inventory.sqlite3'):
         """
         Initializes a UserMenu.
+        :param processes: an int, the number of processes web orders are
+                          processed in, or None for the number of CPUs
+        :param log_directory: a str, the directory of the store's event
+                              log
+        :param coalesce: a bool, whether web orders restock once per
+                         product for each batch, in a single process
+        :param snapshot_path: a str, the path to the inventory snapshot
+                              restored at startup
         """
-        self.store = Store()
+        self.store = Store(EventLog(log_directory),
+                           snapshot=InventorySnapshot(snapshot_path))
+        if self.store.restore_snapshot():
+            print("Inventory restored")
+        self.coalesce = coalesce
+        self.processes = processes
         self.menu_prompt = {
             # menu option: (method, StringRepresentation)
             1: (self.process_web_orders, "Process Web Orders"),
-            2: (self.check_inventory, "Check Inventory"),
-            3: (self.exit, "Exit")
+            2: (self.process_order_files, "Process Order Files"),
+            3: (self.check_inventory, "Check Inventory"),
+            4: (self.check_low_stock, "Check Low Stock"),
+            5: (self.exit, "Exit")
         }
 
     def show_main_menu(self) -> None:
@@ -30,7 +51,7 @@ class UserMenu:
         :return: None
         """
         user_choice = -1
-        while user_choice != 3:
+        while user_choice != 5:
             print("Welcome to ToySuppliesAreUs!")
             for key, value in self.menu_prompt.items():
                 print(f"{key}: {value[1]}")
@@ -55,8 +76,11 @@ class UserMenu:
         file_path = "sample_orders.xlsx"
         order_processor = OrderProcessor(file_path)
         try:
-            for order in order_processor.get_next_order():
-                self.store.process_order(order)
+            orders = order_processor.get_next_order()
+            if self.coalesce:
+                OrderCoalescer(self.store).process_orders(orders)
+            else:
+                self.store.process_orders(orders, self.processes)
         except FileNotFoundError:
             print("File not found")
         except xlrd.biffh.XLRDError:
@@ -65,6 +89,27 @@ class UserMenu:
             print(e)
         else:
             print("Orders processed")
+        finally:
+            self.store.save_snapshot()
+
+    def process_order_files(self) -> None:
+        """
+        Processes the order files of a directory or glob pattern
+        concurrently, then reports the rows read from each file.
+        :return: None
+        """
+        pattern = input('Enter a directory or pattern of order files: ')
+        try:
+            reports = OrderIngestor(self.store, self.processes).run(pattern)
+        except Exception as e:
+            print(e)
+        else:
+            if not reports:
+                print("No order files found")
+            for report in reports:
+                print(report)
+        finally:
+            self.store.save_snapshot()
 
     def check_inventory(self) -> None:
         """
@@ -73,12 +118,21 @@ class UserMenu:
         """
         self.store.check_inventory()
 
+    def check_low_stock(self) -> None:
+        """
+        Checks the products that are out of stock or running low.
+        :return: None
+        """
+        self.store.check_inventory(('OUT OF STOCK', 'VERY LOW', 'LOW'))
+
     def exit(self) -> None:
         """
         Generates a daily transaction report before exiting the program.
         :return: None
         """
         self.store.generate_daily_report()
+        self.store.save_snapshot()
+        self.store.event_log.close()
         quit()
 
 